@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.dependencies import get_store
+from vectorstore.qdrant_store import QdrantStore
 
 router = APIRouter()
 
@@ -6,3 +10,18 @@ router = APIRouter()
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness_check(store: QdrantStore = Depends(get_store)):
+    if not store.is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "qdrant": False}
+        )
+
+    return {
+        "status": "ready",
+        "qdrant": True,
+        "collection": store.collection_ready
+    }
@@ -1,70 +1,234 @@
-import os
-from fastapi import APIRouter
-
-from ingestion.pdf_loader import load_pdf
-from ingestion.cleaner import clean_text
-from ingestion.chunker import chunk_text
+import json
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from ingestion.pdf_loader import iter_pdf_pages
+from ingestion.cleaner import TextNormalizer
+from ingestion.chunker import boundary_chunk_spans
+from ingestion.manifest import (
+    file_entry,
+    iter_documents,
+    load_manifest,
+    save_manifest,
+    scan_directory
+)
 
 from embeddings.ollama_embedder import embed
-from vectorstore.qdrant_store import QdrantStore
-
-from app.config import CHUNK_SIZE, CHUNK_OVERLAP
-from utils.chunk_exporter import export_chunks_to_csv
+from vectorstore.qdrant_store import QdrantStore, BufferedVectorWriter
+
+from app.dependencies import get_store
+from app.config import (
+    NORMALIZE_DEHYPHENATE,
+    NORMALIZE_STRIP_HEADERS,
+    NORMALIZE_CASEFOLD,
+    NORMALIZE_NFKC,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    CHUNK_EXPORT_FORMAT,
+    CHUNK_EXPORT_DIR,
+    RAW_DOCS_PATH,
+    INGEST_MANIFEST_PATH
+)
+from utils.chunk_exporter import create_chunk_exporter
 
 router = APIRouter()
 
+normalizer = TextNormalizer(
+    dehyphenate=NORMALIZE_DEHYPHENATE,
+    strip_headers=NORMALIZE_STRIP_HEADERS,
+    casefold=NORMALIZE_CASEFOLD,
+    nfkc=NORMALIZE_NFKC
+)
 
-@router.post("/ingest")
-def ingest_documents():
-
-    all_vectors = []
-    all_texts = []
-
-    raw_docs_path = "data/raw_docs"
-
-    for file_name in os.listdir(raw_docs_path):
-        if not file_name.lower().endswith(".pdf"):
-            continue
-
-        file_path = os.path.join(raw_docs_path, file_name)
-
-        # 1. Load PDF
-        raw_text = load_pdf(file_path)
 
-        # 2. Clean text
-        cleaned_text = clean_text(raw_text)
-
-        # 3. Chunk text
-        chunks = chunk_text(cleaned_text, CHUNK_SIZE, CHUNK_OVERLAP)
-
-        # 4. Export chunks to CSV (NEW REQUIREMENT)
-        export_chunks_to_csv(chunks, source_file=file_name)
+@router.post("/ingest")
+def ingest_documents(store: QdrantStore = Depends(get_store)):
+    """
+    Re-ingests every PDF. Each file's previous points are deleted first
+    and the manifest is updated, so this route and /ingest/incremental
+    can be mixed without duplicating points.
+    """
+
+    writer = None
+    manifest = load_manifest(INGEST_MANIFEST_PATH)
+    ingested = {}
+    exporter = create_chunk_exporter(CHUNK_EXPORT_FORMAT, CHUNK_EXPORT_DIR)
+
+    try:
+        for source, file_path in iter_documents(RAW_DOCS_PATH):
+            entry = file_entry(file_path)
+
+            # 1-2. Load PDF pages and normalize them as they stream in
+            cleaned_text = normalizer.normalize(iter_pdf_pages(file_path))
+
+            # Replace whatever an earlier ingest stored for this file
+            if store.collection_ready or store.refresh_collection_status():
+                store.delete_by_source(source)
+
+            # 3-4. Chunk on sentence/word boundaries as the spans stream
+            # in, embed each chunk and queue it for batched storage.
+            # Chunk strings are only kept when they are exported
+            chunk_count = 0
+            dimension = None
+            spans, chunks, vectors = [], [], []
+
+            for start, end in boundary_chunk_spans(cleaned_text, CHUNK_SIZE, CHUNK_OVERLAP):
+                chunk = cleaned_text[start:end]
+                vector = embed(chunk)
+                chunk_count += 1
+                dimension = len(vector)
+
+                if writer is None:
+                    store.ensure_collection(len(vector))
+                    writer = BufferedVectorWriter(store)
+
+                writer.add(
+                    vector=vector,
+                    text=chunk,
+                    metadata={
+                        "type": "document",
+                        "source": source
+                    }
+                )
+
+                if exporter:
+                    spans.append((start, end))
+                    chunks.append(chunk)
+                    vectors.append(vector)
+
+            ingested[source] = {
+                **entry,
+                "chunks": chunk_count,
+                "dimension": dimension
+            }
 
-        # 5. Generate embeddings
-        for chunk in chunks:
-            vector = embed(chunk)
-            all_vectors.append(vector)
-            all_texts.append((chunk, file_name))
+            # 5. Export chunks for inspection (background thread)
+            if exporter:
+                exporter.add(
+                    source,
+                    chunks,
+                    spans=spans,
+                    embeddings=vectors
+                )
+    finally:
+        if exporter:
+            exporter.close()
 
     # Safety check
-    if not all_vectors:
+    if writer is None:
         return {"message": "No documents found to ingest."}
 
-    # 6. Store in Qdrant
-    store = QdrantStore(vector_size=len(all_vectors[0]))
+    # 6. Store remaining vectors in Qdrant, then record what was stored
+    writer.flush()
 
-    for vector, (chunk, source) in zip(all_vectors, all_texts):
-        store.add_vector(
-            vector=vector,
-            text=chunk,
-            metadata={
-                "type": "document",
-                "source": source
-            }
-        )
+    manifest.update(ingested)
+    save_manifest(manifest, INGEST_MANIFEST_PATH)
 
     return {
         "message": "Documents ingested successfully",
-        "total_documents": len(set(source for _, source in all_texts)),
-        "total_chunks": len(all_texts)
+        "total_documents": sum(1 for e in ingested.values() if e["chunks"]),
+        "total_chunks": writer.total_written
     }
+
+
+def _incremental_ingest(store: QdrantStore):
+    manifest = load_manifest(INGEST_MANIFEST_PATH)
+    changed, removed = scan_directory(RAW_DOCS_PATH, manifest)
+
+    # Unchanged-but-touched files only had their stat fields refreshed
+    save_manifest(manifest, INGEST_MANIFEST_PATH)
+
+    exporter = create_chunk_exporter(CHUNK_EXPORT_FORMAT, CHUNK_EXPORT_DIR) if changed else None
+
+    try:
+        for source, file_path, entry in changed:
+            try:
+                cleaned_text = normalizer.normalize(iter_pdf_pages(file_path))
+
+                # Old points are only replaced once every chunk embedded,
+                # so the whole file is held until the write
+                spans, chunks, vectors = [], [], []
+                for start, end in boundary_chunk_spans(cleaned_text, CHUNK_SIZE, CHUNK_OVERLAP):
+                    chunk = cleaned_text[start:end]
+                    spans.append((start, end))
+                    chunks.append(chunk)
+                    vectors.append(embed(chunk))
+
+                if exporter:
+                    exporter.add(
+                        source,
+                        chunks,
+                        spans=spans,
+                        embeddings=vectors
+                    )
+
+                # Replace whatever an older version of this file stored.
+                # Not only for files in the manifest: a failed /ingest may
+                # have flushed points for files it never recorded
+                if store.collection_ready or store.refresh_collection_status():
+                    store.delete_by_source(source)
+
+                if vectors:
+                    store.ensure_collection(len(vectors[0]))
+                    store.add_vectors(
+                        vectors,
+                        chunks,
+                        [{"type": "document", "source": source}] * len(chunks)
+                    )
+
+                status = "updated" if source in manifest else "added"
+                manifest[source] = {
+                    **entry,
+                    "chunks": len(chunks),
+                    "dimension": len(vectors[0]) if vectors else None
+                }
+                save_manifest(manifest, INGEST_MANIFEST_PATH)
+
+                result = {"file": source, "status": status, "chunks": len(chunks)}
+
+            except Exception as e:
+                result = {"file": source, "status": "error", "error": str(e)}
+
+            yield json.dumps(result) + "\n"
+    finally:
+        # Also runs when the client disconnects and the stream is closed
+        if exporter:
+            exporter.close()
+
+    for source in removed:
+        dimension = manifest[source].get("dimension")
+
+        try:
+            if dimension:
+                store.delete_by_source(source)
+
+            del manifest[source]
+            save_manifest(manifest, INGEST_MANIFEST_PATH)
+
+            result = {"file": source, "status": "removed"}
+
+        except Exception as e:
+            result = {"file": source, "status": "error", "error": str(e)}
+
+        yield json.dumps(result) + "\n"
+
+    yield json.dumps({
+        "message": "Incremental ingest complete",
+        "processed": len(changed),
+        "removed": len(removed),
+        "tracked_documents": len(manifest)
+    }) + "\n"
+
+
+@router.post("/ingest/incremental")
+def ingest_documents_incremental(store: QdrantStore = Depends(get_store)):
+    """
+    Ingests only new or changed PDFs from the raw docs folder and
+    drops vectors for deleted ones. One JSON line is streamed per
+    file as it completes.
+    """
+
+    return StreamingResponse(
+        _incremental_ingest(store),
+        media_type="application/x-ndjson"
+    )
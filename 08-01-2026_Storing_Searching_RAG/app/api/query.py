@@ -1,29 +1,45 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from embeddings.ollama_embedder import embed
 from vectorstore.qdrant_store import QdrantStore
-from app.config import TOP_K
+from app.dependencies import get_store
+from app.config import TOP_K, TEXT_PREVIEW_CHARS, VECTOR_PREVIEW_DIMS
 
 router = APIRouter()
 
 
 @router.post("/query")
-def semantic_query(query: str):
+def semantic_query(
+    query: str,
+    debug: bool = False,
+    store: QdrantStore = Depends(get_store)
+):
+    """
+    Hit vectors are only fetched from Qdrant when `debug` is set;
+    otherwise each result carries just the score, source and a
+    server-side text preview.
+    """
+
     query_vector = embed(query)
-    store = QdrantStore(vector_size=len(query_vector))
 
-    results = store.search(query_vector, TOP_K)
+    # Same as the ingest routes: a fresh deployment has no collection
+    # yet. Only the first call goes to Qdrant.
+    store.ensure_collection(len(query_vector))
+
+    results = store.search(query_vector, TOP_K, with_vectors=debug)
 
     response = []
     for hit in results:
-        response.append({
+        item = {
             "score": hit.score,
             "source": hit.payload.get("source"),
-            "text": hit.payload.get("text")[:300],
-            "vector_preview": hit.vector[:10]
-        })
+            "text": hit.payload.get("text", "")[:TEXT_PREVIEW_CHARS]
+        }
+        if debug:
+            item["vector_preview"] = hit.vector[:VECTOR_PREVIEW_DIMS]
+        response.append(item)
 
     return {
-        "query_vector_preview": query_vector[:10],
+        "query_vector_preview": query_vector[:VECTOR_PREVIEW_DIMS],
         "dimension": len(query_vector),
         "results": response
     }
@@ -1,9 +1,31 @@
 EMBEDDING_MODEL = "nomic-embed-text"
 
+# Text normalization (see ingestion.cleaner.TextNormalizer)
+NORMALIZE_DEHYPHENATE = True
+NORMALIZE_STRIP_HEADERS = True
+NORMALIZE_CASEFOLD = False
+NORMALIZE_NFKC = True
+
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 
+# "parquet", "arrow", "csv" or None to turn chunk exports off
+CHUNK_EXPORT_FORMAT = "parquet"
+CHUNK_EXPORT_DIR = "data/chunks"
+
 QDRANT_URL = "http://localhost:6333"
+QDRANT_POOL_SIZE = 16
 COLLECTION_NAME = "vector_store"
 
+VECTOR_BATCH_SIZE = 1024
+
 TOP_K = 5
+TEXT_PREVIEW_CHARS = 300
+VECTOR_PREVIEW_DIMS = 10
+
+RAW_DOCS_PATH = "data/raw_docs"
+INGEST_MANIFEST_PATH = "data/ingest_manifest.json"
+
+QUERY_LOG_PATH = "data/query_log.jsonl"
+QUERY_LOG_SAMPLE_RATE = 1.0
+QUERY_LOG_INCLUDE_VECTORS = True
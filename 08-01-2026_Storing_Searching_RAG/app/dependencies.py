@@ -0,0 +1,41 @@
+from vectorstore.qdrant_store import QdrantStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_store = None
+
+
+def init_store() -> QdrantStore:
+    """
+    Builds the shared QdrantStore and checks the collection once.
+    Called from the application lifespan.
+    """
+
+    global _store
+
+    if _store is None:
+        _store = QdrantStore()
+
+    try:
+        _store.refresh_collection_status()
+    except Exception as e:
+        # Qdrant may still be starting; /ready reports it and the
+        # collection is created on the first ingest instead.
+        logger.warning(f"Qdrant not reachable at startup: {e}")
+
+    return _store
+
+
+def close_store():
+    global _store
+
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def get_store() -> QdrantStore:
+    if _store is None:
+        return init_store()
+    return _store
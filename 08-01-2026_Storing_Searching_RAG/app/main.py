@@ -1,9 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.ingest import router as ingest_router
 from app.api.query import router as query_router
 from app.api.health import router as health_router
+from app.dependencies import init_store, close_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_store()
+    yield
+    close_store()
+
 
-app = FastAPI(title="Vector Embedding & Retrieval API")
+app = FastAPI(title="Vector Embedding & Retrieval API", lifespan=lifespan)
 
 app.include_router(health_router)
 app.include_router(ingest_router)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# benchmark_harness (result files, baseline comparison, micro-benchmark
+# measurements) is shared with the other projects at the repository root
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
@@ -0,0 +1,83 @@
+"""
+Micro-benchmarks for text cleaning and chunking on documents from
+1 KB to 5 MB, checked against benchmarks/baseline.json.
+
+Reports ns per character (best of several runs), tracemalloc peak
+bytes and the number of memory blocks still held by the result.
+Measurement, tolerances and the command line are in the shared
+benchmark_harness module.
+
+    python -m benchmarks.text_processing
+    python -m benchmarks.text_processing --update-baseline
+"""
+import os
+import random
+
+from app.config import CHUNK_SIZE, CHUNK_OVERLAP
+from ingestion.cleaner import clean_text, TextNormalizer
+from ingestion.chunker import chunk_text, boundary_chunk_spans
+from benchmark_harness import measure, micro_main
+
+SIZES = {
+    "1KB": 1_000,
+    "10KB": 10_000,
+    "100KB": 100_000,
+    "1MB": 1_000_000,
+    "5MB": 5_000_000,
+}
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+WORDS = (
+    "battery electrode lithium thermal module housing controller sensor "
+    "voltage current circuit substrate layer signal vehicle motor "
+    "assembly coating surface method system apparatus wherein comprising"
+).split()
+
+
+def make_document(chars: int, seed: int = 42) -> str:
+    """
+    PDF-like text: sentences, hard line breaks, hyphenated line ends
+    and runs of whitespace for the cleaners to deal with.
+    """
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+
+    while size < chars:
+        sentence = " ".join(rng.choices(WORDS, k=rng.randint(6, 18))).capitalize() + "."
+        ending = rng.choice([" ", " ", "\n", "  \n", "-\n"])
+        parts.append(sentence + ending)
+        size += len(sentence) + len(ending)
+
+    return "".join(parts)[:chars]
+
+
+def targets(text: str):
+    normalizer = TextNormalizer()
+    return {
+        "clean_text": lambda: clean_text(text),
+        "normalize": lambda: normalizer.normalize([text]),
+        "chunk_text": lambda: chunk_text(text, CHUNK_SIZE, CHUNK_OVERLAP),
+        "boundary_chunk_spans": lambda: list(boundary_chunk_spans(text, CHUNK_SIZE, CHUNK_OVERLAP)),
+    }
+
+
+def run(sizes, seed: int = 42):
+    results = {}
+
+    for label in sizes:
+        text = make_document(SIZES[label], seed=seed)
+
+        for name, fn in targets(text).items():
+            results[f"{name}[{label}]"] = measure(fn, len(text))
+
+    return results
+
+
+def main(argv=None):
+    micro_main("Text processing micro-benchmarks", run, SIZES, BASELINE_PATH, argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,20 @@
+import re
+
+_WORD_START = re.compile(r"(?<!\S)\S")
+_CLOSERS = "\"')]"
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*(?=\s|$)")
+
+
+def _validate(size: int, overlap: int):
+    if size <= 0:
+        raise ValueError("size must be greater than 0")
+    if overlap < 0 or overlap >= size:
+        raise ValueError("overlap must be between 0 and size - 1")
+
+
 def chunk_text(text: str, size: int, overlap: int):
+    _validate(size, overlap)
+
     chunks = []
     start = 0
 
@@ -8,3 +24,103 @@ def chunk_text(text: str, size: int, overlap: int):
         start = end - overlap
 
     return chunks
+
+
+def _text_end(text: str) -> int:
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def _next_word_start(text: str, position: int):
+    match = _WORD_START.search(text, position)
+    return match.start() if match else None
+
+
+def _last_sentence_end(text: str, low: int, high: int):
+    # Walk back over sentence punctuation from `high`; match ends only
+    # grow with their start, so the first fit is the last sentence end.
+    # A match may start before `low` if its closing quotes/brackets run
+    # into the window, and matching up to `high + 1` lets the lookahead
+    # see the character after a candidate end
+    stop = low
+    while stop and text[stop - 1] in _CLOSERS:
+        stop -= 1
+    stop = max(stop - 1, 0)
+    position = high
+
+    while position > stop:
+        position = max(
+            text.rfind(".", stop, position),
+            text.rfind("!", stop, position),
+            text.rfind("?", stop, position)
+        )
+        if position < 0:
+            return None
+
+        match = _SENTENCE_END.match(text, position, high + 1)
+        if match is None or match.end() > high:
+            continue
+        return match.end() if match.end() >= low else None
+
+    return None
+
+
+def _last_word_end(text: str, low: int, high: int):
+    position = high
+    while position >= low and position > 0:
+        if not text[position - 1].isspace() and (position == len(text) or text[position].isspace()):
+            return position
+        position -= 1
+    return None
+
+
+def boundary_chunk_spans(text: str, size: int, overlap: int):
+    """
+    Yields (start, end) offsets of windows of at most `size` characters
+    that end on a sentence boundary where possible, otherwise on a word
+    boundary, and only cut inside a word when a single word is longer
+    than the window. Each window starts on a word roughly `overlap`
+    characters before the previous end.
+
+    Boundaries are looked up inside each window as it is produced, so
+    nothing is indexed up front and a consumer that stops early only
+    pays for the windows it read. Offsets are yielded instead of
+    substrings so callers only materialise the text they actually need.
+    """
+
+    _validate(size, overlap)
+
+    last_end = _text_end(text)
+    start = _next_word_start(text, 0)
+
+    while start is not None and start < last_end:
+        hard_end = start + size
+
+        if hard_end >= last_end:
+            yield start, last_end
+            return
+
+        # Never snap back so far that the next window would not advance
+        low = start + max(size // 2, overlap + 1)
+
+        end = _last_sentence_end(text, low, hard_end)
+        if end is None:
+            end = _last_word_end(text, low, hard_end)
+
+        if end is None:
+            # A single word longer than the window: hard cut
+            yield start, hard_end
+            start = hard_end - overlap
+            continue
+
+        yield start, end
+        start = _next_word_start(text, end - overlap)
+
+
+def boundary_chunk_text(text: str, size: int, overlap: int):
+    return [
+        text[start:end]
+        for start, end in boundary_chunk_spans(text, size, overlap)
+    ]
@@ -1,7 +1,146 @@
 import re
+import unicodedata
+from collections import Counter
 
 
 def clean_text(text: str) -> str:
     text = text.lower()
     text = re.sub(r"\s+", " ", text)
     return text.strip()
+
+
+# One alternation so de-hyphenation, soft-hyphen removal and whitespace
+# collapsing all happen in a single regex pass.
+_NORMALIZE = re.compile(r"(?<=\w)-[ \t]*\r?\n\s*(?=\w)|\u00ad|\s+")
+_TRAILING_HYPHEN = re.compile(r"(?<=\w)-\s*$")
+_DIGITS = re.compile(r"\d+")
+
+
+def _edge_key(line: str):
+    if not line:
+        return None
+    return _DIGITS.sub("#", " ".join(line.split())).lower()
+
+
+def _first_line(page: str) -> str:
+    page = page.lstrip()
+    end = page.find("\n")
+    return page if end == -1 else page[:end]
+
+
+def _last_line(page: str) -> str:
+    page = page.rstrip()
+    return page[page.rfind("\n") + 1:]
+
+
+class TextNormalizer:
+    """
+    Streaming text normalization for PDF pages.
+
+    Each page goes through Unicode NFKC, header/footer stripping,
+    de-hyphenation of words broken across lines (and pages) and
+    whitespace collapsing, with optional case folding. Pages are
+    processed one at a time with a single page of lookahead, which is
+    what header/footer detection needs: a first or last line is dropped
+    when the same line (with digits ignored, so page numbers match)
+    shows up at the same position on another page.
+
+    Case folding is off by default so identifiers such as CPC codes
+    and chemical formulas keep their case.
+    """
+
+    def __init__(
+        self,
+        dehyphenate: bool = True,
+        strip_headers: bool = True,
+        casefold: bool = False,
+        nfkc: bool = True
+    ):
+        self.dehyphenate = dehyphenate
+        self.strip_headers = strip_headers
+        self.casefold = casefold
+        self.nfkc = nfkc
+
+    def _replace(self, match):
+        token = match.group(0)
+        if token[0] == "-":
+            return "" if self.dehyphenate else "- "
+        if token == "\u00ad":
+            return ""
+        return " "
+
+    def _strip_edges(self, page, head_counts, tail_counts):
+        head = _first_line(page)
+        if head and head_counts[_edge_key(head)] > 1:
+            page = page.lstrip()[len(head):]
+
+        tail = _last_line(page)
+        if tail and tail_counts[_edge_key(tail)] > 1:
+            page = page.rstrip()[:-len(tail)]
+
+        return page
+
+    def _normalize_page(self, page: str) -> str:
+        if self.nfkc:
+            page = unicodedata.normalize("NFKC", page)
+
+        page = _NORMALIZE.sub(self._replace, page).strip()
+
+        if self.casefold:
+            page = page.casefold()
+
+        return page
+
+    def normalize_pages(self, pages):
+        """
+        Yields normalized text pieces for an iterable of page strings.
+        "".join() of the pieces is the normalized document.
+        """
+
+        head_counts = Counter()
+        tail_counts = Counter()
+        pending = None
+        joined_hyphen = False
+        emitted = False
+
+        def emit(page):
+            nonlocal joined_hyphen, emitted
+
+            if self.strip_headers:
+                page = self._strip_edges(page, head_counts, tail_counts)
+
+            text = self._normalize_page(page)
+            if not text:
+                return None
+
+            separator = "" if joined_hyphen or not emitted else " "
+
+            joined_hyphen = False
+            if self.dehyphenate and _TRAILING_HYPHEN.search(text):
+                text = text[:-1]
+                joined_hyphen = True
+
+            emitted = True
+            return separator + text
+
+        for page in pages:
+            if self.strip_headers:
+                head_counts[_edge_key(_first_line(page))] += 1
+                tail_counts[_edge_key(_last_line(page))] += 1
+
+            if pending is not None:
+                piece = emit(pending)
+                if piece:
+                    yield piece
+
+            pending = page
+
+        if pending is not None:
+            piece = emit(pending)
+            if piece:
+                yield piece
+
+    def normalize(self, pages) -> str:
+        if isinstance(pages, str):
+            pages = [pages]
+        return "".join(self.normalize_pages(pages))
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict, path: str):
+    """
+    Writes the manifest atomically so an interrupted ingest
+    never leaves a half-written file behind.
+    """
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def iter_documents(directory: str, extension: str = ".pdf"):
+    """
+    Yields (key, file_path) for every matching file under `directory`,
+    in a stable order. The key is the path relative to `directory`
+    (with "/" separators); it identifies the file in the manifest and
+    is stored as the `source` of its points, so files with the same
+    name in different folders never collide.
+    """
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(extension):
+                continue
+
+            file_path = os.path.join(root, file_name)
+            key = os.path.relpath(file_path, directory).replace(os.sep, "/")
+            yield key, file_path
+
+
+def file_entry(file_path: str) -> dict:
+    stat = os.stat(file_path)
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "hash": file_hash(file_path)
+    }
+
+
+def _relativize_keys(manifest: dict, directory: str):
+    """
+    Older manifests were keyed by the joined path ("data/raw_docs/a.pdf");
+    rename those keys to the relative form used now.
+    """
+
+    prefix = os.path.join(directory, "")
+    for key in list(manifest):
+        if key.startswith(prefix):
+            relative = key[len(prefix):].replace(os.sep, "/")
+            manifest.setdefault(relative, manifest[key])
+            del manifest[key]
+
+
+def scan_directory(directory: str, manifest: dict, extension: str = ".pdf"):
+    """
+    Compares the files under `directory` against the manifest.
+
+    Size and mtime are checked first; the content hash is only
+    computed when they differ, so an unchanged folder costs one
+    stat() per file.
+
+    Returns (changed, removed) where `changed` is a list of
+    (key, file_path, entry) for new or modified files and `removed`
+    is a list of manifest keys whose files no longer exist. Keys are
+    paths relative to `directory` (see `iter_documents`).
+    """
+
+    _relativize_keys(manifest, directory)
+
+    changed = []
+    seen = set()
+
+    for key, file_path in iter_documents(directory, extension):
+        stat = os.stat(file_path)
+        seen.add(key)
+
+        previous = manifest.get(key)
+        if (
+            previous
+            and previous["size"] == stat.st_size
+            and previous["mtime"] == stat.st_mtime
+        ):
+            continue
+
+        entry = file_entry(file_path)
+
+        if previous and previous["hash"] == entry["hash"]:
+            # Touched but not modified: refresh the stat fields only
+            manifest[key] = {**previous, **entry}
+            continue
+
+        changed.append((key, file_path, entry))
+
+    removed = [key for key in manifest if key not in seen]
+
+    return changed, removed
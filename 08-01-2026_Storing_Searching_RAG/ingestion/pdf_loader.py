@@ -1,10 +1,17 @@
 from pypdf import PdfReader
 
 
-def load_pdf(path: str) -> str:
+def iter_pdf_pages(path: str):
+    """
+    Yields the extracted text of each page, one page at a time.
+    """
+
     reader = PdfReader(path)
-    text = ""
     for page in reader.pages:
-        if page.extract_text():
-            text += page.extract_text()
-    return text
+        text = page.extract_text()
+        if text:
+            yield text
+
+
+def load_pdf(path: str) -> str:
+    return "".join(iter_pdf_pages(path))
@@ -0,0 +1,96 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+from app.config import (
+    QUERY_LOG_PATH,
+    QUERY_LOG_SAMPLE_RATE,
+    QUERY_LOG_INCLUDE_VECTORS
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueryLog:
+    """
+    Append-only JSON-lines log of search queries, kept out of the
+    document collection. Entries are sampled at `sample_rate` and
+    written by a background thread, so logging never blocks a search.
+    """
+
+    def __init__(
+        self,
+        path: str = QUERY_LOG_PATH,
+        sample_rate: float = QUERY_LOG_SAMPLE_RATE,
+        include_vectors: bool = QUERY_LOG_INCLUDE_VECTORS,
+        max_pending: int = 10000
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.path = path
+        self.sample_rate = sample_rate
+        self.include_vectors = include_vectors
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(
+            target=self._run,
+            name="query-log-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def log(self, query: str, query_vector=None):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
+        entry = {"ts": time.time(), "query": query}
+        if self.include_vectors and query_vector is not None:
+            entry["vector"] = query_vector
+
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+
+                try:
+                    f.write(json.dumps(entry) + "\n")
+                except Exception as e:
+                    logger.warning(f"Could not write query log entry: {e}")
+
+                # Flush once the burst has been drained
+                if self._queue.empty():
+                    f.flush()
+
+
+_default_log = None
+
+
+def get_query_log() -> QueryLog:
+    global _default_log
+
+    if _default_log is None:
+        _default_log = QueryLog()
+        atexit.register(_default_log.close)
+
+    return _default_log
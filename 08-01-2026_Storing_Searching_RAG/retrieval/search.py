@@ -1,15 +1,12 @@
 from embeddings.ollama_embedder import embed
+from retrieval.query_log import QueryLog, get_query_log
 
 
-def semantic_search(query: str, store, top_k: int):
+def semantic_search(query: str, store, top_k: int, query_log: QueryLog = None):
     query_vector = embed(query)
 
-    # Store query vector
-    store.add_vector(
-        vector=query_vector,
-        text=query,
-        metadata={"type": "query"}
-    )
+    # Queries are logged off the request path, not stored as points
+    (query_log or get_query_log()).log(query, query_vector)
 
     results = store.search(query_vector, top_k)
     return query_vector, results
@@ -1,8 +1,71 @@
+from unittest.mock import MagicMock
+
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api import ingest as ingest_module
+from app.api import query as query_module
+from app.dependencies import get_store
 
 client = TestClient(app)
 
 def test_health_endpoint():
     response = client.get("/health")
     assert response.status_code == 200
+
+
+def test_ready_endpoint_reports_qdrant_state():
+    store = MagicMock(collection_ready=True)
+    app.dependency_overrides[get_store] = lambda: store
+
+    try:
+        store.is_ready.return_value = True
+        assert client.get("/ready").json()["collection"] is True
+
+        store.is_ready.return_value = False
+        assert client.get("/ready").status_code == 503
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_query_fetches_vectors_only_in_debug(monkeypatch):
+    hit = MagicMock(score=0.9, payload={"source": "a.pdf", "text": "x" * 500}, vector=[0.5] * 768)
+    store = MagicMock()
+    store.search.return_value = [hit]
+
+    monkeypatch.setattr(query_module, "embed", lambda text: [0.1] * 768)
+    app.dependency_overrides[get_store] = lambda: store
+
+    try:
+        result = client.post("/query", params={"query": "test"}).json()["results"][0]
+        store.ensure_collection.assert_called_with(768)
+        assert store.search.call_args.kwargs["with_vectors"] is False
+        assert "vector_preview" not in result
+        assert len(result["text"]) == 300
+
+        result = client.post("/query", params={"query": "test", "debug": True}).json()["results"][0]
+        assert store.search.call_args.kwargs["with_vectors"] is True
+        assert len(result["vector_preview"]) == 10
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_incremental_ingest_replaces_unrecorded_points(monkeypatch, tmp_path):
+    # A file /ingest flushed before failing has points but no manifest entry
+    store = MagicMock(collection_ready=True)
+    entry = {"size": 1, "mtime": 1.0}
+
+    monkeypatch.setattr(ingest_module, "INGEST_MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(ingest_module, "scan_directory", lambda path, manifest: ([("a.pdf", "a.pdf", entry)], []))
+    monkeypatch.setattr(ingest_module, "iter_pdf_pages", lambda path: ["Some text."])
+    monkeypatch.setattr(ingest_module, "embed", lambda text: [0.1] * 4)
+    monkeypatch.setattr(ingest_module, "CHUNK_EXPORT_FORMAT", None)
+    app.dependency_overrides[get_store] = lambda: store
+
+    try:
+        lines = client.post("/ingest/incremental").text.splitlines()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert '"added"' in lines[0]
+    store.delete_by_source.assert_called_once_with("a.pdf")
+    store.add_vectors.assert_called_once()
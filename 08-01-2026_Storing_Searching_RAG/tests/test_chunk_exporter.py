@@ -0,0 +1,42 @@
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pytest
+
+from utils.chunk_exporter import BackgroundChunkExporter, create_chunk_exporter
+
+
+def test_parquet_export_appends_all_sources_to_one_file(tmp_path):
+    exporter = create_chunk_exporter("parquet", str(tmp_path))
+
+    exporter.add("a.pdf", ["one", "two"], spans=[(0, 3), (3, 6)], embeddings=[[0.1, 0.2], [0.3, 0.4]])
+    exporter.add("b.pdf", ["three"], spans=[(0, 5)], embeddings=[[0.5, 0.6]])
+    output_file = exporter.close()
+
+    table = pq.read_table(output_file)
+    assert table.num_rows == 3
+    assert table.column("source_file").to_pylist() == ["a.pdf", "a.pdf", "b.pdf"]
+    assert table.column("end_offset").to_pylist() == [3, 6, 5]
+    assert len(table.column("embedding").to_pylist()[2]) == 2
+
+
+def test_arrow_export(tmp_path):
+    exporter = create_chunk_exporter("arrow", str(tmp_path))
+
+    exporter.add("a.pdf", ["one"], spans=[(0, 3)], embeddings=[[0.1]])
+    output_file = exporter.close()
+
+    table = ipc.open_file(output_file).read_all()
+    assert table.column("chunk_text").to_pylist() == ["one"]
+
+
+def test_export_can_be_turned_off():
+    assert create_chunk_exporter(None) is None
+    assert create_chunk_exporter("none") is None
+
+
+def test_exporter_subclass_must_implement_write(tmp_path):
+    class Incomplete(BackgroundChunkExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(str(tmp_path))
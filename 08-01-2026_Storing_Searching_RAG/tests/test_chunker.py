@@ -1,4 +1,10 @@
-from ingestion.chunker import chunk_text
+import pytest
+
+from ingestion.chunker import (
+    chunk_text,
+    boundary_chunk_spans,
+    boundary_chunk_text
+)
 
 def test_chunking_basic():
     text = "This is a simple test text " * 50
@@ -6,3 +12,66 @@ def test_chunking_basic():
 
     assert len(chunks) > 1
     assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+@pytest.mark.parametrize("size, overlap", [(0, 0), (100, 100), (100, 150), (100, -1)])
+def test_chunking_rejects_invalid_size_and_overlap(size, overlap):
+    with pytest.raises(ValueError):
+        chunk_text("some text", size, overlap)
+
+    with pytest.raises(ValueError):
+        list(boundary_chunk_spans("some text", size, overlap))
+
+
+def test_boundary_chunks_do_not_split_words():
+    text = "This is a simple test text " * 50
+    words = set(text.split())
+
+    chunks = boundary_chunk_text(text, size=100, overlap=20)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk) <= 100
+        assert set(chunk.split()) <= words
+
+
+def test_boundary_chunks_prefer_sentence_ends():
+    text = "First sentence is here. " * 20
+
+    chunks = boundary_chunk_text(text, size=100, overlap=20)
+
+    assert len(chunks) > 1
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_boundary_chunks_cover_text_with_overlap():
+    text = " ".join(f"word{i}" for i in range(500))
+
+    spans = list(boundary_chunk_spans(text, size=120, overlap=30))
+
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(text)
+    for (_, prev_end), (start, _) in zip(spans, spans[1:]):
+        assert start < prev_end
+
+
+def test_boundary_chunks_hard_cut_long_words():
+    text = "x" * 250
+
+    spans = list(boundary_chunk_spans(text, size=100, overlap=10))
+
+    assert spans[0] == (0, 100)
+    assert spans[-1][1] == 250
+
+
+def test_boundary_chunks_empty_text():
+    assert boundary_chunk_text("   ", size=100, overlap=10) == []
+
+
+def test_boundary_chunks_keep_closing_quotes():
+    text = 'He said "stop." Then he left the room quietly. ' * 10
+
+    chunks = boundary_chunk_text(text, size=60, overlap=10)
+
+    assert len(chunks) > 1
+    assert all(chunk.endswith(('.', '."')) for chunk in chunks)
@@ -0,0 +1,47 @@
+from ingestion.cleaner import TextNormalizer, clean_text
+
+
+PAGES = [
+    "ACME Patent Journal\nThe inter-\nnational filing cites CPC G06N3/08.\nPage 1",
+    "ACME Patent Journal\nLithium cells with\nLiFePO4 cath-\nPage 2",
+    "ACME Patent Journal\nodes are described.\nPage 3",
+]
+
+
+def test_clean_text_basic():
+    assert clean_text("  Hello \n  World ") == "hello world"
+
+
+def test_normalizer_strips_headers_footers_and_dehyphenates():
+    text = TextNormalizer().normalize(PAGES)
+
+    assert "ACME" not in text
+    assert "Page" not in text
+    assert "international" in text
+    assert "cathodes" in text
+
+
+def test_normalizer_keeps_case_by_default():
+    text = TextNormalizer().normalize(PAGES)
+
+    assert "G06N3/08" in text
+    assert "LiFePO4" in text
+
+
+def test_normalizer_optional_casefold():
+    text = TextNormalizer(casefold=True, strip_headers=False).normalize(PAGES)
+
+    assert "g06n3/08" in text
+    assert text == text.casefold()
+
+
+def test_normalizer_applies_nfkc_and_collapses_whitespace():
+    text = TextNormalizer().normalize("the \ufb01rst   claim\n\n\tof a soft\u00adhyphen")
+
+    assert text == "the first claim of a softhyphen"
+
+
+def test_normalizer_streams_pages():
+    pieces = list(TextNormalizer().normalize_pages(iter(PAGES)))
+
+    assert len(pieces) == 3
@@ -0,0 +1,84 @@
+import os
+
+from ingestion.manifest import load_manifest, save_manifest, scan_directory
+
+
+def test_scan_detects_new_unchanged_and_removed(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.pdf").write_bytes(b"first document")
+    (docs / "notes.txt").write_text("ignored")
+
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = load_manifest(manifest_path)
+
+    changed, removed = scan_directory(str(docs), manifest)
+    assert [key for key, _, _ in changed] == ["a.pdf"]
+    assert removed == []
+
+    for key, _, entry in changed:
+        manifest[key] = entry
+    save_manifest(manifest, manifest_path)
+
+    manifest = load_manifest(manifest_path)
+    changed, removed = scan_directory(str(docs), manifest)
+    assert changed == []
+
+    os.remove(docs / "a.pdf")
+    changed, removed = scan_directory(str(docs), manifest)
+    assert removed == ["a.pdf"]
+
+
+def test_scan_ignores_touched_but_identical_file(tmp_path):
+    doc = tmp_path / "a.pdf"
+    doc.write_bytes(b"same content")
+
+    manifest = {}
+    changed, _ = scan_directory(str(tmp_path), manifest)
+    manifest.update((key, entry) for key, _, entry in changed)
+
+    os.utime(doc, (0, 0))
+    changed, _ = scan_directory(str(tmp_path), manifest)
+
+    assert changed == []
+    assert manifest["a.pdf"]["mtime"] == 0
+
+
+def test_scan_detects_modified_content(tmp_path):
+    doc = tmp_path / "a.pdf"
+    doc.write_bytes(b"version one")
+
+    manifest = {}
+    changed, _ = scan_directory(str(tmp_path), manifest)
+    manifest.update((key, entry) for key, _, entry in changed)
+
+    doc.write_bytes(b"version two, longer")
+    changed, _ = scan_directory(str(tmp_path), manifest)
+
+    assert len(changed) == 1
+    assert changed[0][2]["hash"] != manifest["a.pdf"]["hash"]
+
+
+def test_same_name_in_different_folders_gets_separate_keys(tmp_path):
+    (tmp_path / "2024").mkdir()
+    (tmp_path / "2025").mkdir()
+    (tmp_path / "2024" / "report.pdf").write_bytes(b"old report")
+    (tmp_path / "2025" / "report.pdf").write_bytes(b"new report")
+
+    changed, _ = scan_directory(str(tmp_path), {})
+
+    assert [key for key, _, _ in changed] == ["2024/report.pdf", "2025/report.pdf"]
+
+
+def test_legacy_joined_path_keys_are_renamed(tmp_path):
+    doc = tmp_path / "a.pdf"
+    doc.write_bytes(b"content")
+
+    manifest = {}
+    changed, _ = scan_directory(str(tmp_path), manifest)
+    manifest = {os.path.join(str(tmp_path), key): entry for key, _, entry in changed}
+
+    changed, removed = scan_directory(str(tmp_path), manifest)
+
+    assert changed == [] and removed == []
+    assert list(manifest) == ["a.pdf"]
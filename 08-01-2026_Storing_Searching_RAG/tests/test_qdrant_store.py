@@ -0,0 +1,49 @@
+from unittest.mock import MagicMock, patch
+
+from vectorstore.qdrant_store import QdrantStore, BufferedVectorWriter
+
+
+def make_store():
+    with patch("vectorstore.qdrant_store.QdrantClient") as client_cls:
+        client_cls.return_value.get_collections.return_value = MagicMock(collections=[])
+        return QdrantStore(vector_size=4)
+
+
+def test_add_vectors_batches_upserts():
+    store = make_store()
+
+    written = store.add_vectors(
+        [[0.1] * 4] * 5,
+        [f"chunk {i}" for i in range(5)],
+        [{"type": "document", "source": "a.pdf"}] * 5,
+        batch_size=2
+    )
+
+    assert written == 5
+    assert store.client.upsert.call_count == 3
+    first_batch = store.client.upsert.call_args_list[0].kwargs["points"]
+    assert first_batch[0].payload == {"text": "chunk 0", "type": "document", "source": "a.pdf"}
+
+
+def test_buffered_writer_flushes_by_size_and_on_exit():
+    store = make_store()
+
+    with BufferedVectorWriter(store, batch_size=3) as writer:
+        for i in range(4):
+            writer.add([0.1] * 4, f"chunk {i}", {"source": "a.pdf"})
+
+        assert store.client.upsert.call_count == 1
+
+    assert store.client.upsert.call_count == 2
+    assert writer.total_written == 4
+
+
+def test_ensure_collection_checks_only_once():
+    store = QdrantStore(client=MagicMock())
+    store.client.get_collections.return_value = MagicMock(collections=[])
+
+    store.ensure_collection(4)
+    store.ensure_collection(4)
+
+    assert store.client.get_collections.call_count == 1
+    store.client.create_collection.assert_called_once()
@@ -0,0 +1,40 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from retrieval.query_log import QueryLog
+from retrieval.search import semantic_search
+
+
+def test_query_log_writes_entries(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    log = QueryLog(path=str(path), sample_rate=1.0, include_vectors=False)
+
+    log.log("first query", [0.1, 0.2])
+    log.log("second query")
+    log.close()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["query"] for e in entries] == ["first query", "second query"]
+    assert "vector" not in entries[0]
+
+
+def test_query_log_sampling_can_skip_everything(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    log = QueryLog(path=str(path), sample_rate=0.0)
+
+    log.log("never written")
+    log.close()
+
+    assert path.read_text() == ""
+
+
+def test_semantic_search_does_not_write_to_store():
+    store = MagicMock()
+    query_log = MagicMock()
+
+    with patch("retrieval.search.embed", return_value=[0.1] * 4):
+        semantic_search("query", store, top_k=3, query_log=query_log)
+
+    store.add_vector.assert_not_called()
+    query_log.log.assert_called_once_with("query", [0.1] * 4)
+    store.search.assert_called_once_with([0.1] * 4, 3)
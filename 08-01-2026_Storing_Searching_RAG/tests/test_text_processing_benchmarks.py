@@ -0,0 +1,47 @@
+from benchmarks.text_processing import make_document, run
+from benchmark_harness import compare, tolerance_for, MIN_DELTA
+
+
+def test_document_has_requested_size():
+    text = make_document(10_000)
+
+    assert len(text) == 10_000
+    assert "-\n" in text
+
+
+def test_run_reports_each_target():
+    results = run(["1KB"])
+
+    assert set(results) == {
+        "clean_text[1KB]",
+        "normalize[1KB]",
+        "chunk_text[1KB]",
+        "boundary_chunk_spans[1KB]",
+    }
+    for metrics in results.values():
+        assert metrics["ns_per_char"] > 0
+        assert metrics["peak_bytes"] > 0
+
+
+def check(current, baseline):
+    return compare(
+        {"scenarios": current},
+        {"scenarios": baseline},
+        tolerance_for=tolerance_for,
+        min_delta=MIN_DELTA
+    )
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"chunk_text[1MB]": {"ns_per_char": 1.0, "retained_allocations": 10}}
+
+    assert check({"chunk_text[1MB]": {"ns_per_char": 2.5, "retained_allocations": 20}}, baseline) == [
+        "chunk_text[1MB].ns_per_char: 2.5 vs baseline 1 (+150.0%, tolerance 100%)"
+    ]
+    assert check({"chunk_text[1MB]": {"ns_per_char": 1.2, "retained_allocations": 10}}, baseline) == []
+
+
+def test_compare_ignores_improvements_and_unknown_metrics():
+    baseline = {"clean_text[1MB]": {"ns_per_char": 4.0, "peak_bytes": 10_000_000, "chunks": 10}}
+
+    assert check({"clean_text[1MB]": {"ns_per_char": 1.0, "peak_bytes": 1_000_000, "chunks": 50}}, baseline) == []
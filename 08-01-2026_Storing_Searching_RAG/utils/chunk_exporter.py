@@ -1,7 +1,15 @@
 import csv
 import os
+import queue
+import threading
+from abc import ABC, abstractmethod
 from datetime import datetime
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
 def export_chunks_to_csv(chunks, source_file, output_dir="data/chunks"):
     """
     Exports text chunks to a CSV file for manual inspection.
@@ -10,9 +18,11 @@ def export_chunks_to_csv(chunks, source_file, output_dir="data/chunks"):
     os.makedirs(output_dir, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Sources are relative paths ("sub/a.pdf"); keep the CSV flat
+    file_label = source_file.replace("/", "__")
     output_file = os.path.join(
         output_dir,
-        f"chunks_{source_file}_{timestamp}.csv"
+        f"chunks_{file_label}_{timestamp}.csv"
     )
 
     with open(output_file, mode="w", newline="", encoding="utf-8") as f:
@@ -23,3 +33,156 @@ def export_chunks_to_csv(chunks, source_file, output_dir="data/chunks"):
             writer.writerow([idx + 1, source_file, idx, chunk])
 
     return output_file
+
+
+class BackgroundChunkExporter(ABC):
+    """
+    Base class for exporters that write on a background thread so
+    ingest never waits on disk. Subclasses implement `_write` and
+    optionally `_close`.
+    """
+
+    def __init__(self, output_dir: str, output_file: str = None, max_pending: int = 64):
+        self.output_dir = output_dir
+        self.output_file = output_file
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(
+            target=self._run,
+            name="chunk-exporter",
+            daemon=True
+        )
+        self._thread.start()
+
+    def add(self, source_file, chunks, spans=None, embeddings=None):
+        self._queue.put((source_file, chunks, spans, embeddings))
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        return self.output_file
+
+    def _run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+
+            try:
+                self._write(*batch)
+            except Exception as e:
+                logger.warning(f"Chunk export failed for {batch[0]}: {e}")
+
+        try:
+            self._close()
+        except Exception as e:
+            logger.warning(f"Could not finalize chunk export: {e}")
+
+    @abstractmethod
+    def _write(self, source_file, chunks, spans, embeddings):
+        ...
+
+    def _close(self):
+        pass
+
+
+class CsvChunkExporter(BackgroundChunkExporter):
+    """
+    Keeps the original one-CSV-per-source layout, off the ingest path.
+    """
+
+    def _write(self, source_file, chunks, spans, embeddings):
+        self.output_file = export_chunks_to_csv(
+            chunks,
+            source_file=source_file,
+            output_dir=self.output_dir
+        )
+
+
+class ColumnarChunkExporter(BackgroundChunkExporter):
+    """
+    Appends every chunk of an ingest run, with offsets and embeddings,
+    to a single Parquet or Arrow IPC file (one row group / record
+    batch per source file). Requires `pyarrow`.
+    """
+
+    def __init__(self, output_dir: str, fmt: str = "parquet", max_pending: int = 64):
+        import pyarrow as pa
+
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+
+        self.pa = pa
+        self.fmt = fmt
+        self.schema = pa.schema([
+            ("source_file", pa.string()),
+            ("chunk_index", pa.int32()),
+            ("start_offset", pa.int64()),
+            ("end_offset", pa.int64()),
+            ("chunk_text", pa.string()),
+            ("embedding", pa.list_(pa.float32()))
+        ])
+        self._writer = None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        super().__init__(
+            output_dir,
+            output_file=os.path.join(output_dir, f"chunks_{timestamp}.{fmt}"),
+            max_pending=max_pending
+        )
+
+    def _open_writer(self):
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.output_file, self.schema)
+
+        import pyarrow.ipc as ipc
+        return ipc.new_file(self.output_file, self.schema)
+
+    def _write(self, source_file, chunks, spans, embeddings):
+        if not chunks:
+            return
+
+        spans = spans or [(None, None)] * len(chunks)
+        embeddings = embeddings or [None] * len(chunks)
+
+        batch = self.pa.record_batch([
+            self.pa.array([source_file] * len(chunks), self.pa.string()),
+            self.pa.array(range(len(chunks)), self.pa.int32()),
+            self.pa.array([s[0] for s in spans], self.pa.int64()),
+            self.pa.array([s[1] for s in spans], self.pa.int64()),
+            self.pa.array(chunks, self.pa.string()),
+            self.pa.array(embeddings, self.pa.list_(self.pa.float32()))
+        ], schema=self.schema)
+
+        if self._writer is None:
+            self._writer = self._open_writer()
+
+        if self.fmt == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            self.output_file = None
+
+
+def create_chunk_exporter(fmt, output_dir="data/chunks"):
+    """
+    Returns an exporter for `fmt` ("parquet", "arrow" or "csv"), or
+    None when exporting is turned off (`fmt` is None or "none").
+    """
+
+    if not fmt or fmt == "none":
+        return None
+
+    if fmt == "csv":
+        return CsvChunkExporter(output_dir)
+
+    return ColumnarChunkExporter(output_dir, fmt=fmt)
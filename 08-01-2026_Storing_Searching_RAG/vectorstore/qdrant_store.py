@@ -6,14 +6,40 @@ from qdrant_client.models import (
     Distance,
     Filter,
     FieldCondition,
+    FilterSelector,
     MatchValue
 )
-from app.config import QDRANT_URL, COLLECTION_NAME
+from app.config import (
+    QDRANT_URL,
+    COLLECTION_NAME,
+    QDRANT_POOL_SIZE,
+    VECTOR_BATCH_SIZE
+)
 
 
 class QdrantStore:
-    def __init__(self, vector_size: int):
-        self.client = QdrantClient(url=QDRANT_URL)
+    def __init__(self, vector_size: int = None, client: QdrantClient = None):
+        self.client = client or QdrantClient(
+            url=QDRANT_URL,
+            pool_size=QDRANT_POOL_SIZE
+        )
+        self.collection_ready = False
+
+        if vector_size is not None:
+            self.ensure_collection(vector_size)
+
+    def refresh_collection_status(self):
+        self.collection_ready = self.client.collection_exists(COLLECTION_NAME)
+        return self.collection_ready
+
+    def ensure_collection(self, vector_size: int):
+        """
+        Creates the collection if needed. The check only goes over the
+        network until the collection is known to exist.
+        """
+
+        if self.collection_ready:
+            return
 
         collections = self.client.get_collections().collections
         if COLLECTION_NAME not in [c.name for c in collections]:
@@ -25,8 +51,21 @@ class QdrantStore:
                 )
             )
 
-    def add_vector(self, vector, text, metadata):
-        point = PointStruct(
+        self.collection_ready = True
+
+    def is_ready(self) -> bool:
+        try:
+            self.client.get_collections()
+        except Exception:
+            return False
+        return True
+
+    def close(self):
+        self.client.close()
+
+    @staticmethod
+    def _point(vector, text, metadata):
+        return PointStruct(
             id=str(uuid.uuid4()),
             vector=vector,
             payload={
@@ -34,18 +73,57 @@ class QdrantStore:
                 **metadata
             }
         )
+
+    def add_vector(self, vector, text, metadata):
         self.client.upsert(
             collection_name=COLLECTION_NAME,
-            points=[point]
+            points=[self._point(vector, text, metadata)]
+        )
+
+    def add_vectors(self, vectors, texts, metadatas, batch_size=VECTOR_BATCH_SIZE):
+        """
+        Upserts many points with one request per `batch_size` points
+        instead of one request per point.
+        """
+
+        points = [
+            self._point(vector, text, metadata)
+            for vector, text, metadata in zip(vectors, texts, metadatas)
+        ]
+
+        for start in range(0, len(points), batch_size):
+            self.client.upsert(
+                collection_name=COLLECTION_NAME,
+                points=points[start:start + batch_size]
+            )
+
+        return len(points)
+
+    def _delete_where(self, key: str, value):
+        self.client.delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=FilterSelector(
+                filter=Filter(
+                    must=[
+                        FieldCondition(
+                            key=key,
+                            match=MatchValue(value=value)
+                        )
+                    ]
+                )
+            )
         )
 
-    def search(self, query_vector, top_k: int):
+    def delete_by_source(self, source: str):
+        self._delete_where("source", source)
+
+    def search(self, query_vector, top_k: int, with_vectors: bool = False):
         result = self.client.query_points(
             collection_name=COLLECTION_NAME,
             query=query_vector,
             limit=top_k,
             with_payload=True,
-            with_vectors=True,
+            with_vectors=with_vectors,
             query_filter=Filter(
                 must=[
                     FieldCondition(
@@ -56,3 +134,55 @@ class QdrantStore:
             )
         )
         return result.points
+
+
+class BufferedVectorWriter:
+    """
+    Collects points and writes them through `QdrantStore.add_vectors`
+    once `batch_size` points are buffered. Flushing is by size only:
+    nothing is written in the background, so a slow producer keeps its
+    last partial batch buffered until `flush()` is called (or the
+    context manager exits).
+    """
+
+    def __init__(
+        self,
+        store: QdrantStore,
+        batch_size: int = VECTOR_BATCH_SIZE
+    ):
+        self.store = store
+        self.batch_size = batch_size
+
+        self.vectors = []
+        self.texts = []
+        self.metadatas = []
+        self.total_written = 0
+
+    def add(self, vector, text, metadata):
+        self.vectors.append(vector)
+        self.texts.append(text)
+        self.metadatas.append(metadata)
+
+        if len(self.vectors) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.vectors:
+            return
+
+        self.total_written += self.store.add_vectors(
+            self.vectors,
+            self.texts,
+            self.metadatas,
+            batch_size=self.batch_size
+        )
+
+        self.vectors = []
+        self.texts = []
+        self.metadatas = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
@@ -0,0 +1,63 @@
+# app/api/v1/routes/admin.py
+
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler
+
+router = APIRouter()
+
+# One profile at a time per worker
+_profile_lock = asyncio.Lock()
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    # Fail closed: without a configured token nobody gets in
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints need ADMIN_TOKEN to be set")
+
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get(
+    "/admin/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)]
+)
+async def profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1.0),
+    path: Optional[str] = Query(None, pattern="^(search|ingest)$")
+):
+    """
+    Sample every thread of this worker for `seconds` and return the
+    stacks in collapsed format (flamegraph.pl / speedscope input).
+    `path` keeps only stacks that pass through the search or ingest code.
+    """
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be <= {settings.profiling_max_seconds}"
+        )
+
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval_ms / 1000.0, path=path).start()
+        try:
+            # Sleep on the event loop so requests keep being served
+            # (and sampled) while the profile runs
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"X-Profile-Samples": str(profiler.samples)}
+    )
@@ -1,23 +1,22 @@
-from fastapi import APIRouter
-from app.services.ingest_service import ingest_service
+from fastapi import APIRouter, Depends
+from app.services.ingest_service import IngestService
+from app.core.container import get_ingest_service
 import json
 from pydantic import BaseModel
 
 router = APIRouter()
 
 
-
-
-
-from pydantic import BaseModel
-
 class IngestTextRequest(BaseModel):
     text: str
     metadata: str
     topic: str = None
 
 @router.post("/ingest/from-text")
-def ingest_from_text(request: IngestTextRequest):
+def ingest_from_text(
+    request: IngestTextRequest,
+    ingest_service: IngestService = Depends(get_ingest_service)
+):
     try:
         metadata_dict = json.loads(request.metadata)
         result = ingest_service.ingest_from_text(request.text, metadata_dict, request.topic)
@@ -1,20 +1,18 @@
 # app/api/v1/routes/search.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.models.schemas.search import SearchRequest
 from app.services.search_service import SearchService
-from app.retrieval.qdrant_store import QdrantStore
-from app.ml.embeddings import embedding_model  # ✅ import singleton
+from app.core.container import get_async_search_service  # ✅ shared instance
 
 router = APIRouter()
 
-vector_store = QdrantStore()
-
-search_service = SearchService(
-    vector_store=vector_store,
-    embedder=embedding_model  # ✅ same instance everywhere
-)
 
 @router.post("/search")
-def search_patents(request: SearchRequest):
-    return search_service.search(request)
+async def search_patents(
+    request: SearchRequest,
+    search_service: SearchService = Depends(get_async_search_service)
+):
+    # Runs on the event loop: no threadpool worker is held while
+    # waiting on the embedder or Qdrant
+    return await search_service.asearch(request)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,10 +11,59 @@ class Settings(BaseSettings):
     # Qdrant
     qdrant_host: str
     qdrant_port: int
+    bootstrap_timeout_s: float = 30.0
+    qdrant_async_pool_size: int = 256  # connections for the async search path
+    collection_name: str = "patent_chunks"
+    collection_per_model: bool = False  # e.g. patent_chunks__nomic_embed_text
+    topic_partitioning: str = "none"  # none | tenant | shard_key (app/retrieval/partitioning.py)
+    default_topic: str = "unassigned"  # partition for points ingested without a topic
 
     # Ollama (Embeddings)
     ollama_url: str = "http://localhost:11434"
     ollama_model: str = "nomic-embed-text"
+    ollama_max_connections: int = 256  # async client pool
+
+    # Embedding backend: "ollama" (HTTP) or "onnx" (local, in-process)
+    embedding_backend: str = "ollama"
+    onnx_model_path: Optional[str] = None
+    onnx_tokenizer_path: Optional[str] = None
+    onnx_max_length: int = 512
+    onnx_batch_size: int = 32
+    onnx_intra_op_threads: int = 0  # 0 = let ONNX Runtime decide
+
+    # Micro-batching of concurrent query embeddings
+    query_batching_enabled: bool = True
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 3.0
+    query_batch_timeout_s: float = 60.0  # how long a caller waits for its vector
+
+    # Vector post-processing (see app/ml/vector_postprocess.py)
+    vector_normalize: bool = True
+    vector_storage_dtype: str = "float32"  # float32 | float16 | uint8
+
+    # Tracing (see app/core/tracing.py)
+    trace_exporter: str = "none"  # none | file | memory
+    trace_sample_rate: float = 1.0  # fraction of new traces recorded
+    trace_file_path: str = "data/traces.jsonl"
+
+    # Admin endpoints (app/api/v1/routes/admin.py); off unless enabled
+    profiling_enabled: bool = False
+    profiling_max_seconds: float = 60.0
+    admin_token: Optional[str] = None  # X-Admin-Token; admin endpoints stay closed without it
+
+    # Two-stage retrieval: low-dim first stage, full-vector rescoring
+    two_stage_enabled: bool = False
+    reduction_method: str = "truncate"  # truncate (Matryoshka) | pca
+    reduced_dim: int = 256
+    projection_path: str = "data/projection.npz"
+    rescore_oversample: int = 4
+
+    # Exact search over a snapshot file (see app/retrieval/exact_search.py)
+    search_backend: str = "qdrant"  # qdrant | snapshot (offline, no Qdrant)
+    exact_search_enabled: bool = False  # small filtered searches skip HNSW
+    exact_search_max_candidates: int = 20000
+    exact_search_freshness_s: float = 30.0  # how often the snapshot is checked against Qdrant
+    snapshot_path: str = "data/patent_chunks.snap"
 
     class Config:
         env_file = ".env"
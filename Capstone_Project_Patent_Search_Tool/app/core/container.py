@@ -0,0 +1,249 @@
+# app/core/container.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Container:
+    """
+    Holds the app's shared clients and services.
+
+    Everything is built lazily on first access and shared across
+    routers, so importing the app opens no connections and each worker
+    has exactly one QdrantClient. `bootstrap()` runs from the FastAPI
+    lifespan to probe the embedding model and create/validate the
+    collection once.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._vector_store = None
+        self._async_vector_store = None
+        self._query_embedder = None
+        self._search_service = None
+        self._async_search_service = None
+        self._ingest_service = None
+        self._exact_engine = None
+        self._exact_engine_loaded = False
+        self._reducer = None
+        self._reducer_loaded = False
+        self.model_info = None
+
+    @property
+    def offline(self) -> bool:
+        # Searches served from the snapshot file alone, no Qdrant
+        return settings.search_backend == "snapshot"
+
+    @property
+    def exact_engine(self):
+        # None unless EXACT_SEARCH_ENABLED (or snapshot mode) and the
+        # snapshot file exists
+        if not self._exact_engine_loaded:
+            with self._lock:
+                if not self._exact_engine_loaded:
+                    from app.retrieval.exact_search import load_exact_engine_from_settings
+                    self._exact_engine = load_exact_engine_from_settings()
+                    self._exact_engine_loaded = True
+        return self._exact_engine
+
+    @property
+    def offline_engine(self):
+        # The engine that serves every search when SEARCH_BACKEND=snapshot
+        if self.exact_engine is None:
+            raise RuntimeError(
+                f"SEARCH_BACKEND=snapshot needs a snapshot at {settings.snapshot_path}"
+            )
+        return self.exact_engine
+
+    @property
+    def reducer(self):
+        # None unless two-stage retrieval is enabled
+        if not self._reducer_loaded:
+            with self._lock:
+                if not self._reducer_loaded:
+                    from app.ml.dim_reduction import load_reducer_from_settings
+                    self._reducer = load_reducer_from_settings()
+                    self._reducer_loaded = True
+        return self._reducer
+
+    @property
+    def embedder(self):
+        from app.ml.embeddings import embedding_model
+        return embedding_model
+
+    @property
+    def vector_store(self):
+        if self._vector_store is None:
+            with self._lock:
+                if self._vector_store is None:
+                    from app.retrieval.qdrant_store import QdrantStore
+                    self._vector_store = QdrantStore(
+                        reducer=self.reducer,
+                        exact_engine=self.exact_engine
+                    )
+        return self._vector_store
+
+    @property
+    def async_vector_store(self):
+        if self._async_vector_store is None:
+            with self._lock:
+                if self._async_vector_store is None:
+                    from app.retrieval.qdrant_store import AsyncQdrantStore
+                    self._async_vector_store = AsyncQdrantStore(
+                        reducer=self.reducer,
+                        exact_engine=self.exact_engine
+                    )
+        return self._async_vector_store
+
+    @property
+    def query_embedder(self):
+        if self._query_embedder is None:
+            with self._lock:
+                if self._query_embedder is None:
+                    from app.ml.batching import MicroBatchingEmbedder
+
+                    # Concurrent search requests share embedding calls
+                    self._query_embedder = (
+                        MicroBatchingEmbedder(self.embedder)
+                        if settings.query_batching_enabled
+                        else self.embedder
+                    )
+        return self._query_embedder
+
+    @property
+    def search_service(self):
+        if self._search_service is None:
+            with self._lock:
+                if self._search_service is None:
+                    from app.services.search_service import SearchService
+                    from app.ml.vector_postprocess import vector_postprocessor
+
+                    self._search_service = SearchService(
+                        vector_store=self.offline_engine if self.offline else self.vector_store,
+                        embedder=self.query_embedder,
+                        postprocessor=vector_postprocessor
+                    )
+        return self._search_service
+
+    @property
+    def async_search_service(self):
+        if self._async_search_service is None:
+            with self._lock:
+                if self._async_search_service is None:
+                    from app.services.search_service import SearchService
+                    from app.ml.vector_postprocess import vector_postprocessor
+                    from app.retrieval.exact_search import AsyncExactSearchEngine
+
+                    self._async_search_service = SearchService(
+                        vector_store=(
+                            AsyncExactSearchEngine(self.offline_engine) if self.offline
+                            else self.async_vector_store
+                        ),
+                        embedder=self.query_embedder,
+                        postprocessor=vector_postprocessor
+                    )
+        return self._async_search_service
+
+    @property
+    def ingest_service(self):
+        if self._ingest_service is None:
+            with self._lock:
+                if self._ingest_service is None:
+                    from app.services.ingest_service import IngestService
+
+                    self._ingest_service = IngestService(
+                        vector_store=self.vector_store,
+                        embedder=self.embedder
+                    )
+        return self._ingest_service
+
+    def _bootstrap_collection(self):
+        from app.ml.model_info import probe_embedding_model
+
+        # Size/validate the collection from the model itself; a dimension
+        # mismatch stops startup instead of failing on the first upsert
+        self.model_info = probe_embedding_model(self.embedder)
+
+        if self.offline:
+            if self.offline_engine.dim != self.model_info.dimension:
+                from app.core.exceptions import CollectionConfigError
+                raise CollectionConfigError(
+                    f"Snapshot {settings.snapshot_path} stores {self.exact_engine.dim}-dim vectors "
+                    f"but model '{self.model_info.name}' produces {self.model_info.dimension} dims"
+                )
+            return
+
+        self.vector_store.create_collection(self.model_info)
+
+    def bootstrap(self, timeout: float = None):
+        """
+        Probe the embedding model and create/validate the collection,
+        giving up after `timeout` seconds.
+        """
+        timeout = timeout if timeout is not None else settings.bootstrap_timeout_s
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bootstrap")
+        try:
+            executor.submit(self._bootstrap_collection).result(timeout=timeout)
+        except FutureTimeoutError:
+            raise RuntimeError(
+                f"Collection bootstrap did not finish within {timeout}s "
+                f"(is Qdrant/Ollama reachable?)"
+            )
+        finally:
+            executor.shutdown(wait=False)
+
+        if self.offline:
+            logger.info(f"Serving searches from snapshot {settings.snapshot_path}")
+        else:
+            logger.info(f"Collection '{self.vector_store.collection_name}' ready")
+
+    async def aclose(self):
+        """
+        Close the async clients, then the sync ones.
+        """
+        if self._async_vector_store is not None:
+            await self._async_vector_store.close()
+        await self.embedder.aclose()
+
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._vector_store is not None:
+                self._vector_store.close()
+
+            self._vector_store = None
+            self._async_vector_store = None
+            self._query_embedder = None
+            self._search_service = None
+            self._async_search_service = None
+            self._ingest_service = None
+            self._exact_engine = None
+            self._exact_engine_loaded = False
+            self._reducer = None
+            self._reducer_loaded = False
+
+
+# ✅ SINGLE global instance
+container = Container()
+
+
+# FastAPI dependencies
+
+def get_search_service():
+    return container.search_service
+
+
+async def get_async_search_service():
+    # async so FastAPI resolves it on the event loop, not the threadpool
+    return container.async_search_service
+
+
+def get_ingest_service():
+    return container.ingest_service
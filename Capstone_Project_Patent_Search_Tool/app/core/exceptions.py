@@ -4,3 +4,7 @@ class IngestionError(Exception):
 
 class SearchError(Exception):
     pass
+
+
+class CollectionConfigError(Exception):
+    pass
@@ -0,0 +1,109 @@
+# app/core/profiling.py
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+# Code paths the profile can be narrowed to: a stack is kept if any of
+# its frames comes from one of these files
+PATH_FILTERS = {
+    "search": (
+        "app/api/v1/routes/search.py",
+        "app/services/search_service.py",
+        "app/retrieval/qdrant_store.py",
+        "app/retrieval/exact_search.py",
+    ),
+    "ingest": (
+        "app/api/v1/routes/ingest.py",
+        "app/services/ingest_service.py",
+        "app/ml/chunking.py",
+    ),
+}
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_APP_ROOT):
+        return os.path.relpath(filename, _APP_ROOT).replace(os.sep, "/")
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every thread in the process.
+
+    A background thread reads `sys._current_frames()` every `interval`
+    seconds and counts each stack, so the profiled code runs untouched
+    (no tracing hooks). Idle threads waiting in the event loop or a queue
+    show up too; narrow with `path` or read the flamegraph from the top.
+
+    Output is the collapsed-stack format used by flamegraph.pl and
+    speedscope: `root;caller;callee <count>` per line.
+    """
+
+    def __init__(self, interval: float = 0.005, path: Optional[str] = None):
+        if path is not None and path not in PATH_FILTERS:
+            raise ValueError(f"path must be one of {sorted(PATH_FILTERS)}, got {path}")
+
+        self.interval = interval
+        self.markers = PATH_FILTERS.get(path)
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._labels: Dict[object, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)})"
+            self._labels[code] = label
+        return label
+
+    def _keep(self, files: Iterable[str]) -> bool:
+        if self.markers is None:
+            return True
+        return any(f.endswith(self.markers) for f in files)
+
+    def _sample(self):
+        own_id = threading.get_ident()
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+
+            if not self._keep(code.co_filename.replace(os.sep, "/") for code in codes):
+                continue
+
+            self.stacks[";".join(self._label(code) for code in reversed(codes))] += 1
+
+        self.samples += 1
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample()
+            next_tick += self.interval
+            self._stop.wait(max(0.0, next_tick - time.perf_counter()))
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
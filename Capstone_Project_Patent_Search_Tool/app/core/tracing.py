@@ -0,0 +1,244 @@
+# app/core/tracing.py
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+
+@dataclass
+class Span:
+    """
+    One timed operation, OpenTelemetry-shaped: ids are W3C trace
+    context hex strings and times are epoch nanoseconds.
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    sampled: bool = True
+    start_ns: int = 0
+    end_ns: int = 0
+    status: str = "ok"
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["duration_ms"] = self.duration_ms
+        return data
+
+    def traceparent(self) -> str:
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+
+# The active span for this request; contextvars follow both threads
+# (via copy_context) and asyncio tasks
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: Optional[str]):
+    """
+    Returns (trace_id, parent_span_id, sampled) or None if the header
+    is missing or malformed.
+    """
+    if not header:
+        return None
+
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class NoopExporter:
+    def export(self, span: Span):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class InMemoryExporter:
+    """
+    Keeps finished spans in a list; used by tests and ad-hoc debugging.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def get_trace(self, trace_id: str) -> List[Span]:
+        with self._lock:
+            return [s for s in self.spans if s.trace_id == trace_id]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def shutdown(self):
+        pass
+
+
+class FileExporter:
+    """
+    Appends one JSON object per finished span to a local file, so a
+    trace can be pulled out with `grep <trace_id>`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def create_exporter(kind: str, path: str = None):
+    if kind == "none":
+        return NoopExporter()
+
+    if kind == "memory":
+        return InMemoryExporter()
+
+    if kind == "file":
+        return FileExporter(path or settings.trace_file_path)
+
+    raise ValueError(f"Unknown trace exporter: {kind}")
+
+
+class Tracer:
+    """
+    Minimal request-scoped tracer.
+
+    The sampling decision is made once per trace (at the root span, or
+    taken from an incoming `traceparent`) and inherited by every child,
+    so a trace is either complete or absent. Unsampled spans still carry
+    ids, so the trace context keeps propagating to Ollama.
+    """
+
+    def __init__(self, exporter=None, sample_rate: float = 1.0):
+        self.exporter = exporter or NoopExporter()
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        return cls(
+            exporter=create_exporter(settings.trace_exporter),
+            sample_rate=settings.trace_sample_rate
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.exporter, NoopExporter) and self.sample_rate > 0
+
+    def _should_sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    @contextmanager
+    def start_span(self, name: str, traceparent: str = None, **attributes):
+        parent = _current_span.get()
+
+        incoming = parse_traceparent(traceparent) if parent is None else None
+
+        if parent is not None:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+        elif incoming:
+            trace_id, parent_id, sampled = incoming
+            sampled = sampled and self.enabled
+        else:
+            trace_id, parent_id, sampled = os.urandom(16).hex(), None, self._should_sample()
+
+        span = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent_id,
+            sampled=sampled,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes) if sampled else {}
+        )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set_attribute("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+
+            if span.sampled:
+                try:
+                    self.exporter.export(span)
+                except Exception as e:
+                    logger.warning(f"Failed to export span {name}: {e}")
+
+    def shutdown(self):
+        self.exporter.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def trace_headers() -> dict:
+    """
+    W3C trace context headers for outgoing calls (e.g. to Ollama).
+    """
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {TRACEPARENT_HEADER: span.traceparent()}
+
+
+# ✅ SINGLE global instance
+tracer = Tracer.from_settings()
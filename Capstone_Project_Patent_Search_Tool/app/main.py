@@ -1,16 +1,51 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.api.v1.routes import ingest, search, health
-from app.retrieval.qdrant_store import QdrantStore
+from app.core.container import container
+from app.core.tracing import tracer, TRACEPARENT_HEADER
+from app.api.v1.routes import ingest, search, health, metrics, admin
 
 setup_logging()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are built lazily; the collection is checked once here
+    container.bootstrap()
+    yield
+    await container.aclose()
+    tracer.shutdown()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
-app = FastAPI(title=settings.app_name)
 
-qdrant = QdrantStore()
-qdrant.create_collection()
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    # Root span per request; continues the caller's trace if it sent one
+    with tracer.start_span(
+        f"{request.method} {request.url.path}",
+        traceparent=request.headers.get(TRACEPARENT_HEADER)
+    ) as span:
+        response = await call_next(request)
+        span.set_attribute("http.status_code", response.status_code)
+
+    response.headers["X-Trace-Id"] = span.trace_id
+    return response
+
 
 app.include_router(ingest.router, prefix="/api/v1")
 app.include_router(search.router, prefix="/api/v1")
 app.include_router(health.router, prefix="/api/v1")
+
+if settings.profiling_enabled and settings.admin_token:
+    app.include_router(admin.router, prefix="/api/v1")
+elif settings.profiling_enabled:
+    logger.warning("PROFILING_ENABLED is set but ADMIN_TOKEN is not; admin endpoints not mounted")
+
+# Prometheus scrapes /metrics at the root by default
+app.include_router(metrics.router)
@@ -0,0 +1,223 @@
+# app/ml/batching.py
+
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+from app.core.config import settings
+from app.ml.embeddings import Embedder
+from app.core.tracing import tracer, current_span
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchingEmbedder(Embedder):
+    """
+    Wraps an embedder so that concurrent `embed_query` calls are
+    gathered for up to `max_wait_ms` (or until `max_batch_size` queries
+    are waiting) and sent as one `embed_batch` call. Each caller blocks
+    only until its own vector is ready.
+
+    `aembed_query` has its own asyncio-native path: callers are queued
+    on an `asyncio.Queue` on the running loop and each gathered batch is
+    sent with `aembed_batch` as its own task, so several batches can be
+    in flight and no worker thread is involved. Document embedding is
+    passed straight through.
+
+    A caller gives up after `timeout_s`; a batch that comes back with
+    the wrong number of vectors fails every caller in it.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
+        timeout_s: float = None
+    ):
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size or settings.query_batch_max_size
+        if max_wait_ms is None:
+            max_wait_ms = settings.query_batch_max_wait_ms
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout_s or settings.query_batch_timeout_s
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+        # Async path, bound to the loop that first used it
+        self._loop = None
+        self._aqueue = None
+        self._aworker = None
+        self._inflight = set()
+
+    @property
+    def model_name(self) -> str:
+        return self.embedder.model_name
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="query-embedding-batcher",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _batch_span(self, batch):
+        # A batch serves many requests, so it gets its own trace. The
+        # tracer has no span links; the callers' traceparents are kept
+        # as an attribute so a batch can be matched to its requests.
+        callers = [span.traceparent() for _, _, span in batch if span and span.sampled]
+        return tracer.start_span(
+            "MicroBatchingEmbedder.batch",
+            batch_size=len(batch),
+            caller_traceparents=callers
+        )
+
+    @staticmethod
+    def _deliver(batch, vectors=None, error=None):
+        """
+        Resolves every caller's future, skipping ones that were already
+        cancelled or timed out.
+        """
+        if error is None and len(vectors) != len(batch):
+            error = RuntimeError(
+                f"Embedding backend returned {len(vectors)} vectors for {len(batch)} queries"
+            )
+
+        if error is not None:
+            logger.warning(f"Batched query embedding failed ({len(batch)} queries): {error}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _, _ in batch]
+
+            try:
+                with self._batch_span(batch):
+                    vectors = self.embedder.embed_batch(texts)
+            except Exception as e:
+                self._deliver(batch, error=e)
+                continue
+
+            self._deliver(batch, vectors)
+
+    def _ensure_async_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and not self._aworker.done():
+            return
+
+        self._loop = loop
+        self._aqueue = asyncio.Queue()
+        self._inflight = set()
+        # Fresh context: batches must not inherit the first caller's span
+        self._aworker = loop.create_task(self._arun(), context=contextvars.Context())
+
+    async def _acollect_batch(self):
+        batch = [await self._aqueue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._aqueue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+
+            getter = asyncio.ensure_future(self._aqueue.get())
+            done, _ = await asyncio.wait({getter}, timeout=remaining)
+            if getter not in done:
+                # The item, if any arrives later, stays on the queue
+                getter.cancel()
+                break
+            batch.append(getter.result())
+
+        return batch
+
+    async def _arun(self):
+        while True:
+            batch = await self._acollect_batch()
+
+            # Don't wait for this batch before gathering the next one
+            task = asyncio.create_task(self._aembed(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _aembed(self, batch):
+        texts = [text for text, _, _ in batch]
+
+        try:
+            with self._batch_span(batch):
+                vectors = await self.embedder.aembed_batch(texts)
+        except Exception as e:
+            self._deliver(batch, error=e)
+            return
+
+        self._deliver(batch, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        self._ensure_worker()
+
+        future = Future()
+        self._queue.put((text, future, current_span()))
+        return future.result(timeout=self.timeout)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        self._ensure_async_worker()
+
+        future = self._loop.create_future()
+        self._aqueue.put_nowait((text, future, current_span()))
+        return await asyncio.wait_for(future, self.timeout)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_documents(texts)
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_batch(texts)
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        return await self.embedder.aembed_batch(texts)
+
+    async def aclose(self):
+        if self._aworker is not None and self._loop is asyncio.get_running_loop():
+            self._aworker.cancel()
+            self._aworker = None
+        await self.embedder.aclose()
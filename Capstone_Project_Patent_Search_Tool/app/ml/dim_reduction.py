@@ -0,0 +1,129 @@
+# app/ml/dim_reduction.py
+
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.vector_postprocess import l2_normalize, to_matrix
+
+logger = logging.getLogger(__name__)
+
+# Named vectors used by the two-stage collection layout
+FULL_VECTOR = "full"
+SMALL_VECTOR = "small"
+
+
+class DimensionReducer:
+    """
+    Maps full embeddings to a low-dimensional vector for first-stage
+    ANN search.
+
+    - Matryoshka truncation keeps the first `dim` components (for
+      models trained so that prefixes stay meaningful).
+    - PCA projects onto the top `dim` principal components fitted
+      offline from a corpus sample (see scripts/fit_projection.py).
+
+    Reduced vectors are L2-normalized so they can be searched with
+    dot-product distance.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None
+    ):
+        self.dim = dim
+        self.mean = mean
+        self.components = components
+
+    @property
+    def method(self) -> str:
+        return "pca" if self.components is not None else "truncate"
+
+    @classmethod
+    def truncation(cls, dim: int) -> "DimensionReducer":
+        return cls(dim)
+
+    @classmethod
+    def fit_pca(cls, sample, dim: int) -> "DimensionReducer":
+        matrix = to_matrix(sample).astype(np.float64)
+
+        if matrix.shape[0] < 2:
+            raise ValueError("PCA needs at least two sample vectors")
+        if dim > matrix.shape[1]:
+            raise ValueError(f"Cannot reduce {matrix.shape[1]} dims to {dim}")
+
+        mean = matrix.mean(axis=0)
+        centered = matrix - mean
+
+        # Eigen-decomposition of the d x d covariance is cheaper than an
+        # SVD of the n x d sample when n >> d
+        covariance = centered.T @ centered / (matrix.shape[0] - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:dim]
+
+        explained = eigenvalues[order].sum() / max(eigenvalues.sum(), 1e-12)
+        logger.info(f"PCA to {dim} dims keeps {explained:.1%} of the variance")
+
+        return cls(
+            dim,
+            mean=mean.astype(np.float32),
+            components=eigenvectors[:, order].T.astype(np.float32)
+        )
+
+    def transform(self, vectors) -> np.ndarray:
+        matrix = to_matrix(vectors)
+
+        if self.components is None:
+            reduced = matrix[..., :self.dim]
+        else:
+            reduced = (matrix - self.mean) @ self.components.T
+
+        return l2_normalize(reduced)
+
+    def save(self, path: str):
+        if self.components is None:
+            np.savez(path, dim=self.dim)
+        else:
+            np.savez(path, dim=self.dim, mean=self.mean, components=self.components)
+
+    @classmethod
+    def load(cls, path: str) -> "DimensionReducer":
+        data = np.load(path)
+        if "components" not in data:
+            return cls(int(data["dim"]))
+        return cls(int(data["dim"]), mean=data["mean"], components=data["components"])
+
+
+def load_reducer_from_settings() -> Optional[DimensionReducer]:
+    """
+    The reducer selected by settings, or None when two-stage retrieval
+    is off. Called by the container on first use, not at import, so
+    tools like scripts/fit_projection.py work before a projection exists.
+    """
+    if not settings.two_stage_enabled:
+        return None
+
+    if settings.reduction_method == "truncate":
+        return DimensionReducer.truncation(settings.reduced_dim)
+
+    if settings.reduction_method == "pca":
+        if not os.path.exists(settings.projection_path):
+            raise FileNotFoundError(
+                f"No PCA projection at {settings.projection_path}; "
+                f"fit one with `python -m scripts.fit_projection`"
+            )
+
+        reducer = DimensionReducer.load(settings.projection_path)
+        if reducer.dim != settings.reduced_dim:
+            raise ValueError(
+                f"Projection at {settings.projection_path} has {reducer.dim} dims, "
+                f"expected {settings.reduced_dim}"
+            )
+        return reducer
+
+    raise ValueError(f"Unknown reduction method: {settings.reduction_method}")
@@ -1,40 +1,257 @@
 # app/ml/embeddings.py
 
+import asyncio
 import requests
+import httpx
 import logging
+import threading
+import time
+from abc import ABC, abstractmethod
 from typing import List
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
 from app.core.config import settings
+from app.core.metrics import BACKEND_ERRORS, BACKEND_RETRIES
+from app.core.tracing import tracer, trace_headers
 
 logger = logging.getLogger(__name__)
 
+# Retries when Ollama cannot be reached at all (connection refused or
+# reset). Timeouts are never retried: with a 60s timeout a retry would
+# hold the caller for minutes and add load to an already slow server
+MAX_RETRIES = 2
+RETRY_BACKOFF_S = 0.1
 
-class EmbeddingModel:
-    def __init__(self):
-        self.base_url = settings.ollama_url
+
+class Embedder(ABC):
+    """
+    Common interface for embedding backends.
+    """
+
+    @property
+    def model_name(self) -> str:
+        return type(self).__name__
+
+    @abstractmethod
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+    @abstractmethod
+    def embed_query(self, text: str) -> List[float]:
+        ...
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts with as few backend calls as possible.
+        """
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Async `embed_query`. Backends without native async support
+        (e.g. in-process ONNX) run the sync call in a worker thread.
+        """
+        return await asyncio.to_thread(self.embed_query, text)
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async `embed_batch`, with the same worker-thread fallback.
+        """
+        return await asyncio.to_thread(self.embed_batch, texts)
+
+    async def aclose(self):
+        pass
+
+
+class EmbeddingModel(Embedder):
+    def __init__(self, max_retries: int = MAX_RETRIES, base_url: str = None):
+        self.base_url = base_url or settings.ollama_url
         self.model = settings.ollama_model
+        self.max_retries = max_retries
+        self._async_client = None
 
         logger.info(
             f"Using Ollama embedding model '{self.model}' at {self.base_url}"
         )
 
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    def _post(self, path: str, payload: dict, operation: str) -> dict:
+        with tracer.start_span(f"ollama.{operation}", model=self.model) as span:
+            for attempt in range(self.max_retries + 1):
+                span.set_attribute("attempts", attempt + 1)
+                try:
+                    response = requests.post(
+                        f"{self.base_url}{path}",
+                        json=payload,
+                        headers=trace_headers(),
+                        timeout=60
+                    )
+                    response.raise_for_status()
+                    return response.json()
+                except Timeout:
+                    # Also covers ConnectTimeout, a ConnectionError subclass
+                    BACKEND_ERRORS.inc(backend="ollama", operation=operation)
+                    raise
+                except RequestsConnectionError as e:
+                    if attempt == self.max_retries:
+                        BACKEND_ERRORS.inc(backend="ollama", operation=operation)
+                        raise
+                    BACKEND_RETRIES.inc(backend="ollama", operation=operation)
+                    logger.warning(f"Ollama {operation} failed ({e}), retrying")
+                    time.sleep(RETRY_BACKOFF_S * (attempt + 1))
+                except Exception:
+                    BACKEND_ERRORS.inc(backend="ollama", operation=operation)
+                    raise
+
     def _embed_single(self, text: str) -> List[float]:
-        response = requests.post(
-            f"{self.base_url}/api/embeddings",
-            json={
+        return self._post(
+            "/api/embeddings",
+            {
                 "model": self.model,
                 "prompt": text
             },
-            timeout=60
-        )
-        response.raise_for_status()
-        return response.json()["embedding"]
+            operation="embed"
+        )["embedding"]
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         return [self._embed_single(t) for t in texts]
 
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        # /api/embed takes a list of inputs in one request
+        return self._post(
+            "/api/embed",
+            {
+                "model": self.model,
+                "input": texts
+            },
+            operation="embed_batch"
+        )["embeddings"]
+
     def embed_query(self, text: str) -> List[float]:
         return self._embed_single(text)
 
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the running event loop
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=60,
+                limits=httpx.Limits(
+                    max_connections=settings.ollama_max_connections
+                )
+            )
+        return self._async_client
+
+    async def _apost(self, path: str, payload: dict, operation: str) -> dict:
+        with tracer.start_span(f"ollama.{operation}", model=self.model) as span:
+            for attempt in range(self.max_retries + 1):
+                span.set_attribute("attempts", attempt + 1)
+                try:
+                    response = await self.async_client.post(
+                        path,
+                        json=payload,
+                        headers=trace_headers()
+                    )
+                    response.raise_for_status()
+                    return response.json()
+                except httpx.ConnectError as e:
+                    if attempt == self.max_retries:
+                        BACKEND_ERRORS.inc(backend="ollama", operation=operation)
+                        raise
+                    BACKEND_RETRIES.inc(backend="ollama", operation=operation)
+                    logger.warning(f"Ollama {operation} failed ({e}), retrying")
+                    await asyncio.sleep(RETRY_BACKOFF_S * (attempt + 1))
+                except Exception:
+                    BACKEND_ERRORS.inc(backend="ollama", operation=operation)
+                    raise
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self._apost(
+            "/api/embeddings",
+            {
+                "model": self.model,
+                "prompt": text
+            },
+            operation="embed"
+        ))["embedding"]
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        return (await self._apost(
+            "/api/embed",
+            {
+                "model": self.model,
+                "input": texts
+            },
+            operation="embed_batch"
+        ))["embeddings"]
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+def create_embedding_model() -> Embedder:
+    """
+    Build the embedder selected by `settings.embedding_backend`.
+    """
+    backend = settings.embedding_backend
+
+    if backend == "ollama":
+        return EmbeddingModel()
+
+    if backend == "onnx":
+        from app.ml.onnx_embeddings import OnnxEmbeddingModel
+        return OnnxEmbeddingModel()
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+class LazyEmbedder(Embedder):
+    """
+    Defers building the real embedder until it is first used, so
+    importing the app does not load models or open connections.
+    """
+
+    def __init__(self, factory=create_embedding_model):
+        self._factory = factory
+        self._embedder = None
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self) -> Embedder:
+        if self._embedder is None:
+            with self._lock:
+                if self._embedder is None:
+                    self._embedder = self._factory()
+        return self._embedder
+
+    @property
+    def model_name(self) -> str:
+        return self.embedder.model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedder.embed_query(text)
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return self.embedder.embed_batch(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embedder.aembed_query(text)
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        return await self.embedder.aembed_batch(texts)
+
+    async def aclose(self):
+        if self._embedder is not None:
+            await self._embedder.aclose()
+
 
-# ✅ SINGLE global instance
-embedding_model = EmbeddingModel()
+# ✅ SINGLE global instance (built on first use)
+embedding_model = LazyEmbedder()
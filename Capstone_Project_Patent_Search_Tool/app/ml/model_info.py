@@ -0,0 +1,77 @@
+# app/ml/model_info.py
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROBE_TEXT = "patent embedding model probe"
+
+# Probed models, keyed by model name (one probe per process)
+_model_info_cache = {}
+
+
+@dataclass
+class ModelInfo:
+    name: str
+    dimension: int
+    norm: float
+
+    @property
+    def normalized(self) -> bool:
+        """Whether the model already returns unit-length vectors"""
+        return abs(self.norm - 1.0) < 1e-3
+
+
+def probe_embedding_model(embedder) -> ModelInfo:
+    """
+    Embed a probe string once and cache the model's output dimension
+    and vector norm.
+    """
+    name = embedder.model_name
+
+    if name not in _model_info_cache:
+        vector = np.asarray(embedder.embed_query(PROBE_TEXT), dtype=np.float32)
+
+        if vector.ndim != 1 or vector.size == 0:
+            raise ValueError(f"Embedding model '{name}' returned an invalid probe vector")
+
+        info = ModelInfo(
+            name=name,
+            dimension=int(vector.size),
+            norm=float(np.linalg.norm(vector))
+        )
+        logger.info(
+            f"Embedding model '{name}': dimension={info.dimension}, "
+            f"norm={info.norm:.4f}"
+        )
+        _model_info_cache[name] = info
+
+    return _model_info_cache[name]
+
+
+def configured_model_name() -> str:
+    """Name of the embedding model selected in settings"""
+    if settings.embedding_backend == "onnx" and settings.onnx_model_path:
+        return os.path.splitext(os.path.basename(settings.onnx_model_path))[0]
+    return settings.ollama_model
+
+
+def collection_name_for(model_name: str = None) -> str:
+    """
+    Collection for the configured model. With `collection_per_model`
+    each model gets its own collection (e.g. patent_chunks__nomic_embed_text)
+    so models can be deployed side by side.
+    """
+    if not settings.collection_per_model:
+        return settings.collection_name
+
+    model_name = model_name or configured_model_name()
+    slug = re.sub(r"[^a-z0-9]+", "_", model_name.lower()).strip("_")
+    return f"{settings.collection_name}__{slug}"
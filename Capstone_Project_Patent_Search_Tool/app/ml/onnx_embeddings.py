@@ -0,0 +1,139 @@
+# app/ml/onnx_embeddings.py
+
+import logging
+import os
+from typing import List
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.embeddings import Embedder
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxEmbeddingModel(Embedder):
+    """
+    In-process embedder running a nomic-embed-text compatible ONNX
+    export on CPU with ONNX Runtime.
+
+    Texts are sorted by length and encoded in batches of `batch_size`,
+    each padded only to its own longest text, so short queries do not
+    pay for long documents. Token embeddings are mean-pooled over the
+    attention mask and L2-normalized.
+
+    Requires the optional `onnxruntime` and `tokenizers` packages.
+    """
+
+    def __init__(
+        self,
+        model_path: str = None,
+        tokenizer_path: str = None,
+        batch_size: int = None,
+        max_length: int = None,
+        intra_op_threads: int = None,
+        session=None,
+        tokenizer=None
+    ):
+        self.model_path = model_path or settings.onnx_model_path
+        self.tokenizer_path = tokenizer_path or settings.onnx_tokenizer_path
+        self.batch_size = batch_size or settings.onnx_batch_size
+        self.max_length = max_length or settings.onnx_max_length
+
+        if intra_op_threads is None:
+            intra_op_threads = settings.onnx_intra_op_threads
+
+        self.session = session or self._load_session(intra_op_threads)
+        self.tokenizer = tokenizer or self._load_tokenizer()
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        logger.info(
+            f"Using local ONNX embedding model at {self.model_path}"
+        )
+
+    @property
+    def model_name(self) -> str:
+        return os.path.splitext(os.path.basename(self.model_path))[0]
+
+    def _load_session(self, intra_op_threads: int):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' embedding backend requires onnxruntime: "
+                "pip install onnxruntime tokenizers"
+            ) from e
+
+        if not self.model_path:
+            raise ValueError("ONNX_MODEL_PATH must be set for the 'onnx' backend")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        return ort.InferenceSession(
+            self.model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+    def _load_tokenizer(self):
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' embedding backend requires tokenizers: "
+                "pip install onnxruntime tokenizers"
+            ) from e
+
+        if not self.tokenizer_path:
+            raise ValueError("ONNX_TOKENIZER_PATH must be set for the 'onnx' backend")
+
+        tokenizer = Tokenizer.from_file(self.tokenizer_path)
+        tokenizer.enable_truncation(max_length=self.max_length)
+        tokenizer.enable_padding()  # pad to the longest text in each batch
+        return tokenizer
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array(
+            [e.attention_mask for e in encodings],
+            dtype=np.int64
+        )
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        # Mean pooling over real tokens, then L2 normalization
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled = summed / counts
+
+        norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        # Length-sorted batches keep padding per batch small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            batch_ids = order[start:start + self.batch_size]
+            vectors = self._encode_batch([texts[i] for i in batch_ids])
+
+            for i, vector in zip(batch_ids, vectors):
+                results[i] = vector.tolist()
+
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode_batch([text])[0].tolist()
@@ -0,0 +1,109 @@
+# app/ml/vector_postprocess.py
+
+from typing import List, Optional
+
+import numpy as np
+from qdrant_client.models import (
+    Datatype,
+    Distance,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams
+)
+
+from app.core.config import settings
+
+STORAGE_DTYPES = ("float32", "float16", "uint8")
+
+
+def to_matrix(embeddings) -> np.ndarray:
+    """
+    Convert a list of vectors into one contiguous float32 matrix.
+    """
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return matrix / norms
+
+
+class VectorPostprocessor:
+    """
+    Post-processing between the embedder and Qdrant.
+
+    Embeddings are turned into a float32 matrix and, when `normalize`
+    is on, L2-normalized in one vectorized pass so the collection can
+    use dot-product distance instead of cosine.
+
+    `storage_dtype` controls how the collection stores vectors:
+    - "float32": unchanged precision
+    - "float16": half-precision vectors in the collection
+    - "uint8": float16 vectors plus int8 scalar quantization, so the
+      in-memory index uses one byte per dimension
+
+    Vectors are always sent as float32: the REST client serializes them
+    as JSON floats, so a smaller dtype before upsert saves nothing and
+    only loses precision. Qdrant converts on write.
+    """
+
+    def __init__(self, normalize: bool = True, storage_dtype: str = "float32"):
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                f"storage_dtype must be one of {STORAGE_DTYPES}, got {storage_dtype}"
+            )
+
+        self.normalize = normalize
+        self.storage_dtype = storage_dtype
+
+    @classmethod
+    def from_settings(cls) -> "VectorPostprocessor":
+        return cls(
+            normalize=settings.vector_normalize,
+            storage_dtype=settings.vector_storage_dtype
+        )
+
+    @property
+    def distance(self) -> Distance:
+        return Distance.DOT if self.normalize else Distance.COSINE
+
+    def process(self, embeddings) -> np.ndarray:
+        matrix = to_matrix(embeddings)
+
+        if matrix.size == 0:
+            return matrix
+
+        if self.normalize:
+            matrix = l2_normalize(matrix)
+
+        return matrix
+
+    def process_query(self, vector) -> List[float]:
+        query = to_matrix(vector)
+        if self.normalize:
+            query = l2_normalize(query)
+        return query.tolist()
+
+    def vector_params(self, size: int, distance: Distance = None) -> VectorParams:
+        return VectorParams(
+            size=size,
+            distance=distance or self.distance,
+            datatype=Datatype.FLOAT16 if self.storage_dtype != "float32" else Datatype.FLOAT32
+        )
+
+    def quantization_config(self) -> Optional[ScalarQuantization]:
+        if self.storage_dtype != "uint8":
+            return None
+
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                always_ram=True
+            )
+        )
+
+
+# ✅ SINGLE global instance
+vector_postprocessor = VectorPostprocessor.from_settings()
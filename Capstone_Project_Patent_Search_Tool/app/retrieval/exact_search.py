@@ -0,0 +1,415 @@
+# app/retrieval/exact_search.py
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from qdrant_client.http.models import QueryResponse, ScoredPoint
+
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.retrieval.snapshot import INT_MISSING, Snapshot
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matmul; bounds the temporary score array
+BLOCK_ROWS = 65536
+
+SUPPORTED_DISTANCES = ("Cosine", "Dot")
+
+
+class ExactSearchEngine:
+    """
+    Brute-force search over a snapshot file (see app/retrieval/snapshot.py).
+
+    Filters are evaluated as NumPy masks over the payload columns, the
+    surviving rows are scored with one matrix-vector product per block
+    and the top-k is taken with `argpartition`. For a small filtered
+    subset this beats a filtered HNSW traversal; without Qdrant it is
+    the whole search backend.
+
+    Results come back as a qdrant `QueryResponse`, so the engine is a
+    drop-in for `QdrantStore.search`.
+
+    The snapshot is a point-in-time export. Next to Qdrant, the store
+    only uses the engine while it is `fresh`: at most every
+    `check_interval` seconds the store reports the collection's point
+    count (`record_count`), and a mismatch means points were added or
+    deleted since the export. A write through this process's store
+    (`invalidate`) marks it stale outright, since a re-ingest can keep
+    the count unchanged. Either way searches go to Qdrant until the
+    snapshot file is re-exported, which is picked up on the next check.
+    """
+
+    def __init__(self, snapshot: Snapshot, max_candidates: int = None, check_interval: float = None):
+        _check_distance(snapshot)
+        _warm_stats(snapshot)
+
+        self.snapshot = snapshot
+        self.max_candidates = (
+            max_candidates if max_candidates is not None
+            else settings.exact_search_max_candidates
+        )
+        self.check_interval = (
+            check_interval if check_interval is not None
+            else settings.exact_search_freshness_s
+        )
+
+        self._lock = threading.Lock()
+        self._mtime = _mtime(snapshot.path)
+        self._checked_at = None
+        self._fresh = False  # unknown until the first check
+        self._written = False
+
+    @classmethod
+    def open(cls, path: str, max_candidates: int = None) -> "ExactSearchEngine":
+        return cls(Snapshot(path), max_candidates=max_candidates)
+
+    @property
+    def dim(self) -> int:
+        return self.snapshot.dim
+
+    @property
+    def point_count(self) -> int:
+        return self.snapshot.count
+
+    def close(self):
+        pass
+
+    # ---------- Freshness ----------
+
+    @property
+    def fresh(self) -> bool:
+        return self._fresh
+
+    def claim_check(self) -> bool:
+        """
+        True for the one caller that should check freshness now; others
+        keep using the last result until `check_interval` has passed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            return True
+
+    def record_count(self, collection_count: Optional[int]) -> bool:
+        """
+        Compare the collection's point count (None if it could not be
+        read) with the snapshot's, reopening the file first if it was
+        re-exported.
+        """
+        self._reload_if_changed()
+
+        with self._lock:
+            fresh = not self._written and collection_count == self.point_count
+            if self._fresh and not fresh:
+                logger.warning(
+                    f"Snapshot {self.snapshot.path} is stale ({self.point_count} points, "
+                    f"collection has {collection_count}); searching Qdrant until it is re-exported"
+                )
+            self._fresh = fresh
+
+        return fresh
+
+    def invalidate(self):
+        """
+        The collection was written to: stop using the snapshot until the
+        file is re-exported.
+        """
+        with self._lock:
+            self._written = True
+            self._fresh = False
+
+    def _reload_if_changed(self):
+        mtime = _mtime(self.snapshot.path)
+        if mtime is None or mtime == self._mtime:
+            return
+
+        try:
+            snapshot = Snapshot(self.snapshot.path)
+            _check_distance(snapshot)
+            _warm_stats(snapshot)
+        except Exception as e:
+            logger.warning(f"Could not reopen re-exported snapshot {self.snapshot.path}: {e}")
+            return
+
+        with self._lock:
+            self.snapshot = snapshot
+            self._mtime = mtime
+            self._written = False
+        logger.info(f"Reopened re-exported snapshot {snapshot.path} ({snapshot.count} points)")
+
+    # ---------- Filters ----------
+
+    # Helpers take the snapshot explicitly: a re-export swaps
+    # self.snapshot, and one search must not mix two files
+
+    @staticmethod
+    def _match_any(snapshot: Snapshot, name: str, values) -> np.ndarray:
+        column = snapshot.columns[name]
+        wanted = _codes(snapshot, name, values)
+
+        if column["kind"] == "category":
+            return np.isin(snapshot.section(f"{name}.codes"), wanted)
+
+        # category_list: a row matches if any of its values does. Count
+        # matching codes per row from a prefix sum over the CSR offsets.
+        hits = np.isin(snapshot.section(f"{name}.codes"), wanted)
+        prefix = np.concatenate(([0], np.cumsum(hits)))
+        offsets = snapshot.section(f"{name}.offsets")
+        return prefix[offsets[1:]] > prefix[offsets[:-1]]
+
+    @staticmethod
+    def _year_range(snapshot: Snapshot, year_from, year_to) -> np.ndarray:
+        years = snapshot.section("filing_year.values")
+        mask = years != INT_MISSING
+        if year_from:
+            mask &= years >= year_from
+        if year_to:
+            mask &= years <= year_to
+        return mask
+
+    def filter_mask(self, filters, snapshot: Snapshot = None) -> Optional[np.ndarray]:
+        """
+        Boolean row mask for `SearchFilters`, matching `build_filter`
+        (None when nothing is filtered).
+        """
+        if not filters:
+            return None
+
+        snapshot = self.snapshot if snapshot is None else snapshot
+
+        masks = []
+
+        if filters.jurisdiction:
+            masks.append(self._match_any(snapshot, "jurisdiction", filters.jurisdiction))
+
+        if filters.assignee:
+            masks.append(self._match_any(snapshot, "assignee", filters.assignee))
+
+        if filters.patent_class:
+            masks.append(self._match_any(snapshot, "patent_class", filters.patent_class))
+
+        if filters.filing_year_from or filters.filing_year_to:
+            masks.append(self._year_range(snapshot, filters.filing_year_from, filters.filing_year_to))
+
+        if filters.topic:
+            masks.append(self._match_any(snapshot, "topic", [filters.topic]))
+
+        if not masks:
+            return None
+
+        return np.logical_and.reduce(masks)
+
+    def estimate(self, filters, snapshot: Snapshot = None) -> int:
+        """
+        Upper bound on the rows matching `filters`, from per-value counts
+        precomputed when the snapshot was opened: a conjunction keeps at
+        most as many rows as its narrowest condition.
+        """
+        snapshot = self.snapshot if snapshot is None else snapshot
+        bounds = [snapshot.count]
+
+        for name in ("jurisdiction", "assignee", "patent_class"):
+            values = getattr(filters, name)
+            if values:
+                bounds.append(_value_count(snapshot, name, values))
+
+        if filters.filing_year_from or filters.filing_year_to:
+            years, counts = snapshot.int_counts("filing_year")
+            low = np.searchsorted(years, filters.filing_year_from, "left") if filters.filing_year_from else 0
+            high = np.searchsorted(years, filters.filing_year_to, "right") if filters.filing_year_to else len(years)
+            bounds.append(int(counts[low:high].sum()))
+
+        if filters.topic:
+            bounds.append(_value_count(snapshot, "topic", [filters.topic]))
+
+        return min(bounds)
+
+    def select(self, filters, snapshot: Snapshot = None) -> Optional[np.ndarray]:
+        """
+        Row indices matching `filters` if there are at most
+        `max_candidates` of them, else None (let the ANN index handle it).
+        The O(rows) mask is only built when `estimate` says the filter
+        can be that selective.
+        """
+        snapshot = self.snapshot if snapshot is None else snapshot
+        if not filters or self.estimate(filters, snapshot) > self.max_candidates:
+            return None
+
+        mask = self.filter_mask(filters, snapshot)
+        if mask is None:
+            return None
+
+        rows = np.flatnonzero(mask)
+        if len(rows) > self.max_candidates:
+            return None
+        return rows
+
+    # ---------- Search ----------
+
+    def search_selective(self, query_vector, top_k: int, filters) -> Optional[QueryResponse]:
+        """
+        Exact top-k if `filters` is selective enough for a scan (see
+        `select`), else None. A selective filter's mask and scan are
+        O(rows), so async callers run this whole call in a worker thread.
+        """
+        snapshot = self.snapshot
+        rows = self.select(filters, snapshot)
+        if rows is None:
+            return None
+        return self.search_rows(query_vector, top_k, rows, snapshot)
+
+    @staticmethod
+    def _query(snapshot: Snapshot, query_vector) -> np.ndarray:
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (snapshot.dim,):
+            raise ValueError(f"Expected a {snapshot.dim}-dim query vector, got shape {query.shape}")
+
+        if snapshot.distance == "Cosine":
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+        return query
+
+    def search_rows(self, query_vector, top_k: int, rows: Optional[np.ndarray] = None, snapshot: Snapshot = None) -> QueryResponse:
+        """
+        Exact top-k over `rows` (all rows when None).
+        """
+        snapshot = self.snapshot if snapshot is None else snapshot
+        query = self._query(snapshot, query_vector)
+        vectors = snapshot.vectors
+        total = len(vectors) if rows is None else len(rows)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        with tracer.start_span("exact.search", candidates=total, top_k=top_k):
+            for start in range(0, total, BLOCK_ROWS):
+                if rows is None:
+                    block_rows = np.arange(start, min(start + BLOCK_ROWS, total))
+                    block = vectors[start:start + BLOCK_ROWS]
+                else:
+                    block_rows = rows[start:start + BLOCK_ROWS]
+                    block = vectors[block_rows]
+
+                scores = block @ query
+
+                # Same cut-off as the Qdrant path (score_threshold=0.0)
+                keep = scores > 0
+                block_rows, scores = block_rows[keep], scores[keep]
+
+                if len(scores) > top_k:
+                    top = np.argpartition(-scores, top_k - 1)[:top_k]
+                    block_rows, scores = block_rows[top], scores[top]
+
+                best_rows = np.concatenate((best_rows, block_rows))
+                best_scores = np.concatenate((best_scores, scores))
+
+                if len(best_scores) > top_k:
+                    top = np.argpartition(-best_scores, top_k - 1)[:top_k]
+                    best_rows, best_scores = best_rows[top], best_scores[top]
+
+            order = np.argsort(-best_scores, kind="stable")
+
+            return QueryResponse(points=[
+                ScoredPoint(
+                    id=snapshot.point_id(int(row)),
+                    version=0,
+                    score=float(score),
+                    payload=snapshot.payload(int(row))
+                )
+                for row, score in zip(best_rows[order], best_scores[order])
+            ])
+
+    def search(self, query_vector, top_k, filters=None, search_params=None, oversample=None):
+        """
+        Same signature as `QdrantStore.search`; `search_params` and
+        `oversample` tune ANN search and have no effect on an exact scan.
+        """
+        snapshot = self.snapshot
+        mask = self.filter_mask(filters, snapshot)
+        rows = None if mask is None else np.flatnonzero(mask)
+        return self.search_rows(query_vector, top_k, rows, snapshot)
+
+
+def _check_distance(snapshot: Snapshot):
+    if snapshot.distance not in SUPPORTED_DISTANCES:
+        raise ValueError(
+            f"Exact search supports {SUPPORTED_DISTANCES} collections, "
+            f"snapshot uses {snapshot.distance}"
+        )
+
+
+def _warm_stats(snapshot: Snapshot):
+    # Per-value counts for every filterable column, so no search pays
+    # for the first pass
+    for name, kind in (
+        ("jurisdiction", "codes"), ("assignee", "codes"), ("patent_class", "codes"),
+        ("topic", "codes"), ("filing_year", "int")
+    ):
+        if name not in snapshot.columns:
+            continue
+        if kind == "int":
+            snapshot.int_counts(name)
+        else:
+            snapshot.category_codes(name)
+            snapshot.code_counts(name)
+
+
+def _codes(snapshot: Snapshot, name: str, values) -> list:
+    lookup = snapshot.category_codes(name)
+    return [lookup[v] for v in values if v in lookup]
+
+
+def _value_count(snapshot: Snapshot, name: str, values) -> int:
+    codes = _codes(snapshot, name, values)
+    return int(snapshot.code_counts(name)[codes].sum()) if codes else 0
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class AsyncExactSearchEngine:
+    """
+    `ExactSearchEngine` for the async search path; scans run in a
+    worker thread (NumPy releases the GIL in the matmul).
+    """
+
+    def __init__(self, engine: ExactSearchEngine):
+        self.engine = engine
+
+    async def close(self):
+        self.engine.close()
+
+    async def search(self, query_vector, top_k, filters=None, search_params=None, oversample=None):
+        return await asyncio.to_thread(self.engine.search, query_vector, top_k, filters)
+
+
+def load_exact_engine_from_settings() -> Optional[ExactSearchEngine]:
+    """
+    The engine selected by settings, or None when exact search is off
+    or no snapshot has been exported. Built by the container on first
+    use, not at import.
+    """
+    if not settings.exact_search_enabled and settings.search_backend != "snapshot":
+        return None
+
+    if not os.path.exists(settings.snapshot_path):
+        logger.warning(
+            f"Exact search is enabled but {settings.snapshot_path} does not exist; "
+            f"run `python -m scripts.snapshot export`"
+        )
+        return None
+
+    return ExactSearchEngine.open(settings.snapshot_path)
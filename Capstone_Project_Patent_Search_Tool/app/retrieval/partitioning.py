@@ -0,0 +1,85 @@
+# app/retrieval/partitioning.py
+
+import logging
+from typing import Optional
+
+from qdrant_client.models import HnswConfigDiff, ShardingMethod
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("none", "tenant", "shard_key")
+
+# Per-topic graph degree in tenant mode (Qdrant's default `m`)
+TENANT_PAYLOAD_M = 16
+
+
+class TopicPartitioning:
+    """
+    How the collection is split by `topic`.
+
+    - none: one shared HNSW graph; `topic` is an ordinary filter.
+    - tenant: payload-partitioned layout. The global graph is disabled
+      (m=0) and Qdrant builds one graph per topic value (payload_m) on
+      the is_tenant `topic` index, so a topic-scoped search only walks
+      that topic's graph. Searches without a topic fall back to a scan.
+    - shard_key: custom sharding with one shard key per topic. Writes
+      and topic-scoped searches are routed to that topic's shard;
+      searches without a topic fan out to every shard.
+
+    In both partitioned modes every point gets a topic: ingests without
+    one land in `default_topic`.
+    """
+
+    def __init__(self, mode: str = "none", default_topic: str = "unassigned"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown topic partitioning mode: {mode} (expected one of {MODES})")
+
+        self.mode = mode
+        self.default_topic = default_topic
+
+    @classmethod
+    def from_settings(cls) -> "TopicPartitioning":
+        return cls(settings.topic_partitioning, settings.default_topic)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "none"
+
+    @property
+    def uses_shard_keys(self) -> bool:
+        return self.mode == "shard_key"
+
+    def hnsw_config(self) -> Optional[HnswConfigDiff]:
+        if self.mode == "tenant":
+            return HnswConfigDiff(m=0, payload_m=TENANT_PAYLOAD_M)
+        return None
+
+    def sharding_method(self) -> Optional[ShardingMethod]:
+        if self.uses_shard_keys:
+            return ShardingMethod.CUSTOM
+        return None
+
+    def topic_for(self, payload: dict) -> Optional[str]:
+        """
+        Topic a point is stored under (None when not partitioned and the
+        point has no topic).
+        """
+        topic = payload.get("topic")
+        if topic is None and self.enabled:
+            return self.default_topic
+        return topic
+
+    def search_kwargs(self, filters) -> dict:
+        """
+        Extra `query_points` arguments that restrict a search to the
+        topic's shard.
+        """
+        if self.uses_shard_keys and filters and filters.topic:
+            return {"shard_key_selector": filters.topic}
+        return {}
+
+
+# ✅ SINGLE global instance
+topic_partitioning = TopicPartitioning.from_settings()
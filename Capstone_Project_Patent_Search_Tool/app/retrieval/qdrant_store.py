@@ -1,77 +1,332 @@
-from qdrant_client import QdrantClient
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException
 from qdrant_client.models import (
-    VectorParams,
-    Distance,
-    PayloadSchemaType
+    IntegerIndexParams, IntegerIndexType, KeywordIndexParams, KeywordIndexType,
+    PointStruct, Prefetch, VectorParams, Distance
 )
+from qdrant_client.http.models import QueryResponse
 from app.core.config import settings
+from app.ml.vector_postprocess import vector_postprocessor
+from app.ml.dim_reduction import FULL_VECTOR, SMALL_VECTOR
+from app.ml.model_info import collection_name_for
+from app.core.exceptions import CollectionConfigError
+from app.core.metrics import BACKEND_ERRORS, BACKEND_RETRIES, SEARCH_ENGINE
+from app.core.tracing import tracer
+from app.retrieval.partitioning import topic_partitioning
 from uuid import uuid4
 from qdrant_client.models import Filter, FieldCondition, MatchAny, MatchValue, Range
 
+logger = logging.getLogger(__name__)
+
+# nomic-embed-text; only used when the model has not been probed
+DEFAULT_VECTOR_SIZE = 768
+
+# Retries for transport failures (connection reset, timeouts); point
+# ids are fixed before the first attempt, so a retried upsert is idempotent
+MAX_RETRIES = 2
+RETRY_BACKOFF_S = 0.1
+
+# A topic missing from the cached shard keys may have been ingested by
+# another process since; re-read them at most this often
+SHARD_KEY_REFRESH_S = 5.0
+
+# Payload indexes (VERY IMPORTANT). New collections get all of them;
+# scripts/migrate_indexes.py brings existing collections up to date.
+PAYLOAD_INDEXES = {
+    "jurisdiction": KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+    "assignee": KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+    # Filters only ever use gte/lte, so a range index without the
+    # exact-match lookup table; most filtered searches include a year range
+    "filing_year": IntegerIndexParams(
+        type=IntegerIndexType.INTEGER,
+        lookup=False,
+        range=True,
+        is_principal=True
+    ),
+    "patent_class": KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+    "chunk_type": KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+    # Most searches are scoped to one topic; is_tenant keeps each topic's
+    # points together on disk
+    "topic": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    "patent_id": KeywordIndexParams(type=KeywordIndexType.KEYWORD),
+}
+
+
 class QdrantStore:
-    def __init__(self):
-        self.client = QdrantClient(
+    def __init__(self, reducer=None, client=None, exact_engine=None, partitioning=None):
+        # `client` lets callers pass e.g. QdrantClient(location=":memory:")
+        self.client = client or QdrantClient(
             host=settings.qdrant_host,
             port=settings.qdrant_port
         )
-        self.collection_name = "patent_chunks"
+        self.collection_name = collection_name_for()
+
+        # Two-stage retrieval when a dimension reducer is passed in
+        # (the container passes the configured one)
+        self.reducer = reducer or None
+
+        # Brute-force scan for filters matching few points
+        self.exact_engine = exact_engine
+
+        # Topic tenants / shard keys (see app/retrieval/partitioning.py)
+        self.partitioning = partitioning or topic_partitioning
+        self._shard_keys = None
+        self._shard_keys_at = None
+        self._shard_keys_lock = threading.Lock()
+
+    def close(self):
+        self.client.close()
+
+    def shard_keys(self, refresh: bool = False) -> set:
+        """
+        Topics that have a shard key in the collection (shard_key mode).
+        """
+        if self._shard_keys is None or refresh:
+            self._shard_keys_at = time.monotonic()
+            info = self.client.collection_cluster_info(self.collection_name)
+            self._shard_keys = _shard_keys_from(info)
+        return self._shard_keys
+
+    def has_shard_key(self, topic: str) -> bool:
+        """
+        Whether `topic` has a shard key. A miss re-reads the cluster info
+        at most every SHARD_KEY_REFRESH_S before answering no.
+        """
+        if topic in self.shard_keys():
+            return True
+        if not _shard_keys_expired(self._shard_keys_at):
+            return False
+        return topic in self.shard_keys(refresh=True)
+
+    def ensure_shard_key(self, topic: str):
+        if topic in self.shard_keys():
+            return
+
+        with self._shard_keys_lock:
+            # Another worker/process may have created it meanwhile
+            if topic not in self.shard_keys(refresh=True):
+                self.client.create_shard_key(self.collection_name, shard_key=topic)
+                self._shard_keys.add(topic)
+                logger.info(f"Created shard key '{topic}' on '{self.collection_name}'")
+
+    @staticmethod
+    def _distance_for(model_info) -> Distance:
+        # Unit-length model output can use dot product directly
+        if model_info and model_info.normalized:
+            return Distance.DOT
+        return vector_postprocessor.distance
+
+    def _exact_ready(self) -> bool:
+        """
+        Whether the exact engine's snapshot still matches the collection;
+        the point count is re-read at most every `check_interval`.
+        """
+        engine = self.exact_engine
+        if engine.claim_check():
+            try:
+                count = self.client.count(self.collection_name, exact=True).count
+            except Exception as e:
+                logger.warning(f"Could not count '{self.collection_name}' for the snapshot check: {e}")
+                count = None
+            engine.record_count(count)
+        return engine.fresh
+
+    def validate_collection(self, model_info):
+        """
+        Fail fast when an existing collection cannot serve the current
+        model and settings: a different embedding dimension, a vector
+        layout that does not match TWO_STAGE_ENABLED, or a distance that
+        would rank the vectors we write differently.
+        """
+        info = self.client.get_collection(self.collection_name)
+        vectors = self._validate_layout(info.config.params.vectors)
+
+        if vectors.size != model_info.dimension:
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' stores {vectors.size}-dim vectors "
+                f"but model '{model_info.name}' produces {model_info.dimension} dims. "
+                f"Use a per-model collection (COLLECTION_PER_MODEL=true) or re-ingest."
+            )
+
+        # On unit-length vectors COSINE and DOT rank identically, so a
+        # collection created as COSINE keeps working after normalization
+        # is turned on; DOT only works if the vectors are unit-length
+        unit_length = model_info.normalized or vector_postprocessor.normalize
+        if vectors.distance == Distance.DOT and not unit_length:
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' uses {vectors.distance} distance "
+                f"but model '{model_info.name}' vectors are not unit-length with "
+                f"VECTOR_NORMALIZE={vector_postprocessor.normalize}. Turn normalization "
+                f"on, or recreate the collection and re-ingest."
+            )
+        if vectors.distance not in (Distance.DOT, Distance.COSINE):
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' uses {vectors.distance} distance; "
+                f"searches expect {Distance.COSINE} or {Distance.DOT}. Recreate the "
+                f"collection and re-ingest."
+            )
+
+        self.validate_partitioning(info)
+
+    def _validate_layout(self, vectors):
+        """
+        Named full/small vectors when a reducer is configured, a single
+        unnamed vector otherwise; returns the full vector's params.
+        """
+        two_stage = isinstance(vectors, dict)
+
+        if bool(self.reducer) != two_stage:
+            layout = "named full/small vectors" if two_stage else "a single vector"
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' stores {layout} but "
+                f"TWO_STAGE_ENABLED={bool(self.reducer)}. Set it back, or recreate the "
+                f"collection and re-ingest."
+            )
+
+        if not two_stage:
+            return vectors
+
+        small = vectors.get(SMALL_VECTOR)
+        if FULL_VECTOR not in vectors or small is None or small.size != self.reducer.dim:
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' has vectors {sorted(vectors)} but "
+                f"two-stage retrieval needs '{FULL_VECTOR}' and a {self.reducer.dim}-dim "
+                f"'{SMALL_VECTOR}'. Recreate the collection and re-ingest."
+            )
+
+        return vectors[FULL_VECTOR]
 
-    def create_collection(self):
-        collection_name = "patent_chunks"
+    def validate_partitioning(self, info):
+        """
+        The sharding method is fixed at creation, so a collection built
+        for another TOPIC_PARTITIONING mode has to be rebuilt.
+        """
+        if not self.partitioning.enabled:
+            return
+
+        wanted = self.partitioning.sharding_method()
+        if wanted and info.config.params.sharding_method != wanted:
+            raise CollectionConfigError(
+                f"Collection '{self.collection_name}' is not shard-key partitioned "
+                f"but TOPIC_PARTITIONING={self.partitioning.mode}. Recreate it and "
+                f"re-ingest (or export/import a snapshot)."
+            )
+
+        if self.partitioning.mode == "tenant" and info.config.hnsw_config.m != 0:
+            logger.warning(
+                f"Collection '{self.collection_name}' still builds a global HNSW graph; "
+                f"recreate it for per-topic graphs (TOPIC_PARTITIONING=tenant)"
+            )
+
+    def create_collection(self, model_info=None):
+        """
+        Create the collection sized for `model_info` (from
+        probe_embedding_model), or validate it if it already exists.
+        """
+        collection_name = self.collection_name
 
         collections = self.client.get_collections().collections
         existing = [c.name for c in collections]
 
         if collection_name in existing:
+            if model_info:
+                self.validate_collection(model_info)
+            # Rebuilding drops indexes under live traffic, so every
+            # worker starting up must not do it
+            outdated = self.outdated_payload_indexes()
+            if outdated:
+                logger.warning(
+                    f"Payload indexes on '{collection_name}' are missing or outdated: "
+                    f"{', '.join(outdated)}. Run `python -m scripts.migrate_indexes`."
+                )
             return
 
+        size = model_info.dimension if model_info else DEFAULT_VECTOR_SIZE
+
+        vectors_config = vector_postprocessor.vector_params(size, distance=self._distance_for(model_info))
+
+        if self.reducer:
+            # Full vectors are only read to rescore the shortlist,
+            # so they can live on disk
+            vectors_config.on_disk = True
+            vectors_config = {
+                FULL_VECTOR: vectors_config,
+                SMALL_VECTOR: VectorParams(
+                    size=self.reducer.dim,
+                    distance=Distance.DOT
+                )
+            }
+
         self.client.recreate_collection(
-            collection_name="patent_chunks",
-            vectors_config=VectorParams(
-                size=768,   # 🔴 MUST MATCH OLLAMA
-                distance=Distance.COSINE
-            )
+            collection_name=collection_name,
+            vectors_config=vectors_config,
+            quantization_config=vector_postprocessor.quantization_config(),
+            hnsw_config=self.partitioning.hnsw_config(),
+            sharding_method=self.partitioning.sharding_method()
         )
+        self._shard_keys = None
 
-        # Payload indexes (VERY IMPORTANT)
-        self.client.create_payload_index(
-            collection_name,
-            field_name="jurisdiction",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            self.client.create_payload_index(
+                collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
 
-        self.client.create_payload_index(
-            collection_name,
-            field_name="assignee",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
+    def outdated_payload_indexes(self) -> list:
+        """
+        Fields of PAYLOAD_INDEXES that are missing from the collection or
+        indexed with another type or params.
+        """
+        current = self.client.get_collection(self.collection_name).payload_schema or {}
+        outdated = []
 
-        self.client.create_payload_index(
-            collection_name,
-            field_name="filing_year",
-            field_schema=PayloadSchemaType.INTEGER
-        )
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            index = current.get(field_name)
+            if index is None or not _index_matches(index, field_schema):
+                outdated.append(field_name)
 
-        self.client.create_payload_index(
-            collection_name,
-            field_name="patent_class",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
+        return outdated
 
-        self.client.create_payload_index(
-            collection_name,
-            field_name="chunk_type",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
+    def migrate_payload_indexes(self, wait: bool = True):
+        """
+        Create missing payload indexes and rebuild ones whose type or
+        params differ from PAYLOAD_INDEXES (e.g. an old plain INTEGER
+        `filing_year` index). Returns the fields that were (re)built.
+        Only scripts/migrate_indexes.py calls this.
+        """
+        info = self.client.get_collection(self.collection_name)
+        current = info.payload_schema or {}
+        changed = []
+
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            index = current.get(field_name)
+            if index is not None and _index_matches(index, field_schema):
+                continue
+
+            if index is not None:
+                self.client.delete_payload_index(self.collection_name, field_name, wait=wait)
+
+            self.client.create_payload_index(
+                self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+                wait=wait
+            )
+            changed.append(field_name)
+
+        if changed:
+            logger.info(f"Payload indexes (re)built on '{self.collection_name}': {', '.join(changed)}")
+
+        return changed
 
-        self.client.create_payload_index(
-            collection_name,
-            field_name="topic",
-            field_schema=PayloadSchemaType.KEYWORD
-        )
-    
     def delete_collection(self):
-        collection_name = "patent_chunks"
+        collection_name = self.collection_name
         try:
             self.client.delete_collection(collection_name)
             print(f"Deleted collection: {collection_name}")
@@ -86,7 +341,11 @@ class QdrantStore:
     ):
         points = []
 
-        for chunk, vector in zip(chunks, embeddings):
+        small_vectors = None
+        if self.reducer and len(embeddings):
+            small_vectors = self.reducer.transform(embeddings)
+
+        for idx, (chunk, vector) in enumerate(zip(chunks, embeddings)):
             payload = {
                 **metadata,
                 "text": chunk.get("text"),
@@ -96,76 +355,334 @@ class QdrantStore:
                 "chunk_index": chunk.get("chunk_index"),
             }
 
-            points.append({
-                "id": str(uuid4()),
-                "vector": vector,
-                "payload": payload
-            })
+            vector = vector.tolist() if hasattr(vector, "tolist") else vector
 
-        self.client.upsert(
-            collection_name="patent_chunks",
-            points=points
-        )
-    
-    def search(self, query_vector, top_k, filters=None):
-        qdrant_filter = None
-
-        if filters:
-            conditions = []
-
-            if filters.jurisdiction:
-                conditions.append(
-                    FieldCondition(
-                        key="jurisdiction",
-                        match=MatchAny(any=filters.jurisdiction)
-                    )
-                )
+            if small_vectors is not None:
+                vector = {
+                    FULL_VECTOR: vector,
+                    SMALL_VECTOR: small_vectors[idx].tolist()
+                }
 
-            if filters.assignee:
-                conditions.append(
-                    FieldCondition(
-                        key="assignee",
-                        match=MatchAny(any=filters.assignee)
-                    )
-                )
+            # PointStruct rather than a dict so local/in-memory mode
+            # (used by the benchmarks) accepts the batch too
+            points.append(PointStruct(
+                id=str(uuid4()),
+                vector=vector,
+                payload=payload
+            ))
 
-            if filters.patent_class:
-                conditions.append(
-                    FieldCondition(
-                        key="patent_class",
-                        match=MatchAny(any=filters.patent_class)
-                    )
-                )
+        self.upsert_points(points)
+
+    def upsert_points(self, points: list):
+        """
+        Upsert prepared points. When partitioned by topic, points without
+        a topic get the default one, and in shard_key mode each topic's
+        points are written to its own shard.
+        """
+        if self.exact_engine:
+            # The snapshot no longer reflects the collection
+            self.exact_engine.invalidate()
+
+        if self.partitioning.enabled:
+            for point in points:
+                point.payload["topic"] = self.partitioning.topic_for(point.payload)
 
-            if filters.filing_year_from or filters.filing_year_to:
-                conditions.append(
-                    FieldCondition(
-                        key="filing_year",
-                        range={
-                            "gte": filters.filing_year_from or None,
-                            "lte": filters.filing_year_to or None,
-                        }
-                    )
+        if not self.partitioning.uses_shard_keys:
+            call_with_retries(
+                "upsert",
+                lambda: self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=points
                 )
+            )
+            return
 
-            if filters.topic:
-                conditions.append(
-                    FieldCondition(
-                        key="topic",
-                        match=MatchValue(value=filters.topic)
-                    )
+        by_topic = defaultdict(list)
+        for point in points:
+            by_topic[point.payload["topic"]].append(point)
+
+        for topic, topic_points in by_topic.items():
+            self.ensure_shard_key(topic)
+            call_with_retries(
+                "upsert",
+                lambda: self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=topic_points,
+                    shard_key_selector=topic
                 )
+            )
+    
+    def search(self, query_vector, top_k, filters=None, search_params=None, oversample=None):
+        """
+        `search_params` (qdrant SearchParams: hnsw_ef, exact, quantization
+        rescoring) and `oversample` (two-stage shortlist factor) default to
+        the collection/settings values; benchmarks/ann_eval.py sweeps them.
+
+        When an exact engine is configured and the filter matches at most
+        `exact_search_max_candidates` snapshot rows, those rows are scanned
+        directly instead of traversing the filtered HNSW graph, as long as
+        the snapshot is still fresh.
+        """
+        if self.exact_engine and filters and self._exact_ready():
+            response = self.exact_engine.search_selective(query_vector, top_k, filters)
+            if response is not None:
+                SEARCH_ENGINE.inc(engine="exact")
+                return response
+
+        shard = self.partitioning.search_kwargs(filters)
+        if shard and not self.has_shard_key(shard["shard_key_selector"]):
+            # Nothing was ever ingested under this topic
+            return QueryResponse(points=[])
+
+        SEARCH_ENGINE.inc(engine="qdrant")
+        kwargs = query_points_kwargs(
+            self.collection_name,
+            self.reducer,
+            query_vector,
+            top_k,
+            build_filter(filters),
+            search_params=search_params,
+            oversample=oversample
+        )
+        return call_with_retries("search", lambda: self.client.query_points(**kwargs, **shard))
+
+
+class AsyncQdrantStore:
+    """
+    Search-only store on `AsyncQdrantClient`, for `async def` routes.
+    Requests wait on the event loop instead of holding a threadpool
+    worker, so in-flight searches are bounded by the connection pool
+    rather than the thread limit.
+    """
+
+    def __init__(self, reducer=None, exact_engine=None, partitioning=None, client=None):
+        self.client = client or AsyncQdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port,
+            pool_size=settings.qdrant_async_pool_size
+        )
+        self.collection_name = collection_name_for()
+        self.reducer = reducer or None
+        self.exact_engine = exact_engine
+
+        self.partitioning = partitioning or topic_partitioning
+        self._shard_keys = None
+        self._shard_keys_at = None
+
+    async def close(self):
+        await self.client.close()
+
+    async def shard_keys(self, refresh: bool = False) -> set:
+        if self._shard_keys is None or refresh:
+            # Stamped before awaiting so concurrent misses refresh once
+            self._shard_keys_at = time.monotonic()
+            info = await self.client.collection_cluster_info(self.collection_name)
+            self._shard_keys = _shard_keys_from(info)
+        return self._shard_keys
+
+    async def has_shard_key(self, topic: str) -> bool:
+        if topic in await self.shard_keys():
+            return True
+        if not _shard_keys_expired(self._shard_keys_at):
+            return False
+        return topic in await self.shard_keys(refresh=True)
+
+    async def _exact_ready(self) -> bool:
+        engine = self.exact_engine
+        if engine.claim_check():
+            try:
+                count = (await self.client.count(self.collection_name, exact=True)).count
+            except Exception as e:
+                logger.warning(f"Could not count '{self.collection_name}' for the snapshot check: {e}")
+                count = None
+            # May reopen a re-exported file
+            await asyncio.to_thread(engine.record_count, count)
+        return engine.fresh
+
+    async def search(self, query_vector, top_k, filters=None, search_params=None, oversample=None):
+        if self.exact_engine and filters and await self._exact_ready():
+            # The filter mask is O(rows): build it off the event loop too
+            response = await asyncio.to_thread(
+                self.exact_engine.search_selective, query_vector, top_k, filters
+            )
+            if response is not None:
+                SEARCH_ENGINE.inc(engine="exact")
+                return response
+
+        shard = self.partitioning.search_kwargs(filters)
+        if shard and not await self.has_shard_key(shard["shard_key_selector"]):
+            return QueryResponse(points=[])
+
+        SEARCH_ENGINE.inc(engine="qdrant")
+        kwargs = query_points_kwargs(
+            self.collection_name,
+            self.reducer,
+            query_vector,
+            top_k,
+            build_filter(filters),
+            search_params=search_params,
+            oversample=oversample
+        )
+        return await acall_with_retries("search", lambda: self.client.query_points(**kwargs, **shard))
+
+
+def call_with_retries(operation, call):
+    """
+    Run a Qdrant call, retrying transport failures and counting
+    errors/retries per operation.
+    """
+    with tracer.start_span(f"qdrant.{operation}") as span:
+        for attempt in range(MAX_RETRIES + 1):
+            span.set_attribute("attempts", attempt + 1)
+            try:
+                return call()
+            except ResponseHandlingException as e:
+                if attempt == MAX_RETRIES:
+                    BACKEND_ERRORS.inc(backend="qdrant", operation=operation)
+                    raise
+                BACKEND_RETRIES.inc(backend="qdrant", operation=operation)
+                logger.warning(f"Qdrant {operation} failed ({e}), retrying")
+                time.sleep(RETRY_BACKOFF_S * (attempt + 1))
+            except Exception:
+                BACKEND_ERRORS.inc(backend="qdrant", operation=operation)
+                raise
+
 
-            if conditions:
-                qdrant_filter = Filter(must=conditions)
+async def acall_with_retries(operation, call):
+    with tracer.start_span(f"qdrant.{operation}") as span:
+        for attempt in range(MAX_RETRIES + 1):
+            span.set_attribute("attempts", attempt + 1)
+            try:
+                return await call()
+            except ResponseHandlingException as e:
+                if attempt == MAX_RETRIES:
+                    BACKEND_ERRORS.inc(backend="qdrant", operation=operation)
+                    raise
+                BACKEND_RETRIES.inc(backend="qdrant", operation=operation)
+                logger.warning(f"Qdrant {operation} failed ({e}), retrying")
+                await asyncio.sleep(RETRY_BACKOFF_S * (attempt + 1))
+            except Exception:
+                BACKEND_ERRORS.inc(backend="qdrant", operation=operation)
+                raise
 
-        results = self.client.query_points(
-            collection_name=self.collection_name,
+
+def _shard_keys_from(cluster_info) -> set:
+    shards = list(cluster_info.local_shards or []) + list(cluster_info.remote_shards or [])
+    return {shard.shard_key for shard in shards if shard.shard_key is not None}
+
+
+def _shard_keys_expired(read_at) -> bool:
+    return read_at is None or time.monotonic() - read_at >= SHARD_KEY_REFRESH_S
+
+
+def _index_matches(index, field_schema) -> bool:
+    """
+    Whether an existing PayloadIndexInfo has the wanted type and params.
+    """
+    if str(getattr(index.data_type, "value", index.data_type)) != field_schema.type.value:
+        return False
+
+    wanted = field_schema.model_dump(exclude_none=True, exclude={"type"})
+    return all(getattr(index.params, key, None) == value for key, value in wanted.items())
+
+
+def build_filter(filters):
+    if not filters:
+        return None
+
+    conditions = []
+
+    if filters.jurisdiction:
+        conditions.append(
+            FieldCondition(
+                key="jurisdiction",
+                match=MatchAny(any=filters.jurisdiction)
+            )
+        )
+
+    if filters.assignee:
+        conditions.append(
+            FieldCondition(
+                key="assignee",
+                match=MatchAny(any=filters.assignee)
+            )
+        )
+
+    if filters.patent_class:
+        conditions.append(
+            FieldCondition(
+                key="patent_class",
+                match=MatchAny(any=filters.patent_class)
+            )
+        )
+
+    if filters.filing_year_from or filters.filing_year_to:
+        conditions.append(
+            FieldCondition(
+                key="filing_year",
+                range={
+                    "gte": filters.filing_year_from or None,
+                    "lte": filters.filing_year_to or None,
+                }
+            )
+        )
+
+    if filters.topic:
+        conditions.append(
+            FieldCondition(
+                key="topic",
+                match=MatchValue(value=filters.topic)
+            )
+        )
+
+    if conditions:
+        return Filter(must=conditions)
+
+    return None
+
+
+def query_points_kwargs(
+    collection_name,
+    reducer,
+    query_vector,
+    top_k,
+    qdrant_filter,
+    search_params=None,
+    oversample=None
+):
+    """
+    Arguments for `query_points`, shared by the sync and async stores.
+
+    With a reducer this is two-stage: ANN search on the reduced vector
+    for an over-fetched shortlist, rescored server-side with the full
+    vector. `search_params` then applies to the ANN (prefetch) stage.
+    """
+    if not reducer:
+        return dict(
+            collection_name=collection_name,
             query=query_vector,
             limit=top_k,
             with_payload=True,
             score_threshold=0.0,
-            query_filter=qdrant_filter
+            query_filter=qdrant_filter,
+            search_params=search_params
         )
 
-        return results
\ No newline at end of file
+    small_query = reducer.transform(query_vector).tolist()
+
+    return dict(
+        collection_name=collection_name,
+        prefetch=Prefetch(
+            query=small_query,
+            using=SMALL_VECTOR,
+            limit=top_k * (oversample or settings.rescore_oversample),
+            filter=qdrant_filter,
+            params=search_params
+        ),
+        query=query_vector,
+        using=FULL_VECTOR,
+        limit=top_k,
+        with_payload=True,
+        score_threshold=0.0,
+        query_filter=qdrant_filter
+    )
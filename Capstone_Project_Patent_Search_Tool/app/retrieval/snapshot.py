@@ -0,0 +1,545 @@
+# app/retrieval/snapshot.py
+
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+from qdrant_client.models import PointStruct
+
+from app.ml.dim_reduction import FULL_VECTOR, SMALL_VECTOR
+from app.ml.model_info import ModelInfo
+
+# File layout (little-endian):
+#
+#   MAGIC | section | section | ... | index JSON | uint64 index length | MAGIC
+#
+# Every section is a raw array aligned to ALIGN bytes, so each one can
+# be memory-mapped in place. The index lists the sections and columns.
+MAGIC = b"PCSNAP01"
+ALIGN = 64
+FORMAT_VERSION = 1
+
+# How each known payload field is stored. Unknown fields are kept as
+# JSON text so nothing is lost.
+PAYLOAD_SCHEMA = {
+    "jurisdiction": "category",
+    "assignee": "category",
+    "chunk_type": "category",
+    "topic": "category",
+    "patent_class": "category_list",
+    "filing_year": "int",
+    "claim_number": "int",
+    "chunk_index": "int",
+    "section_priority": "float",
+    "text": "text",
+    "patent_id": "text",
+    "title": "text",
+}
+
+INT_MISSING = np.iinfo(np.int64).min
+ID_COLUMN = "__id"
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+# ---------- Column writers ----------
+
+class _IntColumn:
+    kind = "int"
+
+    def __init__(self):
+        self.values = array("q")
+
+    def append(self, value):
+        self.values.append(INT_MISSING if value is None else int(value))
+
+    def sections(self, name):
+        return {f"{name}.values": np.frombuffer(self.values, dtype=np.int64)}
+
+    def meta(self):
+        return {}
+
+
+class _FloatColumn:
+    kind = "float"
+
+    def __init__(self):
+        self.values = array("d")
+
+    def append(self, value):
+        self.values.append(math.nan if value is None else float(value))
+
+    def sections(self, name):
+        return {f"{name}.values": np.frombuffer(self.values, dtype=np.float64)}
+
+    def meta(self):
+        return {}
+
+
+class _CategoryColumn:
+    """Dictionary-encoded strings; -1 marks a missing value."""
+
+    kind = "category"
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories: Dict[str, int] = {}
+
+    def _code(self, value) -> int:
+        value = str(value)
+        code = self.categories.get(value)
+        if code is None:
+            code = self.categories[value] = len(self.categories)
+        return code
+
+    def append(self, value):
+        self.codes.append(-1 if value is None else self._code(value))
+
+    def sections(self, name):
+        return {f"{name}.codes": np.frombuffer(self.codes, dtype=np.int32)}
+
+    def meta(self):
+        return {"categories": list(self.categories)}
+
+
+class _CategoryListColumn(_CategoryColumn):
+    """Lists of dictionary-encoded strings, CSR style (offsets + codes)."""
+
+    kind = "category_list"
+
+    def __init__(self):
+        super().__init__()
+        self.offsets = array("q", [0])
+        self.nulls = array("b")
+
+    def append(self, value):
+        self.nulls.append(value is None)
+        if isinstance(value, str):
+            value = [value]
+        for item in value or ():
+            self.codes.append(self._code(item))
+        self.offsets.append(len(self.codes))
+
+    def sections(self, name):
+        return {
+            f"{name}.offsets": np.frombuffer(self.offsets, dtype=np.int64),
+            f"{name}.codes": np.frombuffer(self.codes, dtype=np.int32),
+            f"{name}.nulls": np.frombuffer(self.nulls, dtype=np.int8),
+        }
+
+
+class _TextColumn:
+    """
+    UTF-8 strings as offsets + one byte blob. The blob is spilled to a
+    temporary file while exporting so large `text` payloads never sit
+    in memory.
+    """
+
+    kind = "text"
+
+    def __init__(self, spill_path: str, as_json: bool = False):
+        self.as_json = as_json
+        self.offsets = array("q", [0])
+        self.nulls = array("b")
+        self.spill_path = spill_path
+        self._spill = open(spill_path, "wb")
+        self._size = 0
+
+    def append(self, value):
+        self.nulls.append(value is None)
+        if value is not None:
+            data = (json.dumps(value) if self.as_json else str(value)).encode("utf-8")
+            self._spill.write(data)
+            self._size += len(data)
+        self.offsets.append(self._size)
+
+    def sections(self, name):
+        self._spill.close()
+        return {
+            f"{name}.offsets": np.frombuffer(self.offsets, dtype=np.int64),
+            f"{name}.nulls": np.frombuffer(self.nulls, dtype=np.int8),
+            f"{name}.data": self.spill_path,
+        }
+
+    def meta(self):
+        return {"json": True} if self.as_json else {}
+
+
+# ---------- Writer ----------
+
+class SnapshotWriter:
+    """
+    Streams points into a snapshot file: vectors go straight to their
+    final position, payload columns are assembled when the writer is
+    closed. The file only appears under `path` once it is complete.
+    """
+
+    def __init__(self, path: str, dim: int, distance: str, collection: str = None):
+        self.path = path
+        self.dim = dim
+        self.distance = distance
+        self.collection = collection
+        self.count = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._tmp_dir = tempfile.mkdtemp(prefix="snapshot-", dir=os.path.dirname(path) or ".")
+        self._file = open(f"{path}.tmp", "wb")
+        self._file.write(MAGIC)
+        self._pad()
+        self._vectors_offset = self._file.tell()
+
+        self._columns = {ID_COLUMN: self._new_column("text")}
+        for name, kind in PAYLOAD_SCHEMA.items():
+            self._columns[name] = self._new_column(kind)
+
+    def _new_column(self, kind: str, as_json: bool = False):
+        if kind == "int":
+            return _IntColumn()
+        if kind == "float":
+            return _FloatColumn()
+        if kind == "category":
+            return _CategoryColumn()
+        if kind == "category_list":
+            return _CategoryListColumn()
+        spill = os.path.join(self._tmp_dir, f"{len(os.listdir(self._tmp_dir))}.bin")
+        return _TextColumn(spill, as_json=as_json)
+
+    def _pad(self):
+        position = self._file.tell()
+        self._file.write(b"\0" * (-position % ALIGN))
+
+    def add(self, ids: List, vectors, payloads: List[dict]):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+
+        self._file.write(vectors.tobytes())
+
+        for point_id, payload in zip(ids, payloads):
+            payload = payload or {}
+
+            for key in payload.keys() - self._columns.keys():
+                # First sighting of an unknown field: backfill earlier rows
+                column = self._new_column("text", as_json=True)
+                for _ in range(self.count):
+                    column.append(None)
+                self._columns[key] = column
+
+            self._columns[ID_COLUMN].append(point_id)
+            for name, column in self._columns.items():
+                if name != ID_COLUMN:
+                    column.append(payload.get(name))
+
+            self.count += 1
+
+    def _write_section(self, source) -> dict:
+        self._pad()
+        offset = self._file.tell()
+
+        if isinstance(source, str):
+            with open(source, "rb") as spill:
+                shutil.copyfileobj(spill, self._file, 1 << 20)
+            return {"offset": offset, "dtype": "uint8", "shape": [self._file.tell() - offset]}
+
+        self._file.write(source.tobytes())
+        return {"offset": offset, "dtype": source.dtype.name, "shape": list(source.shape)}
+
+    def close(self):
+        try:
+            sections = {
+                "vectors": {
+                    "offset": self._vectors_offset,
+                    "dtype": "float32",
+                    "shape": [self.count, self.dim],
+                }
+            }
+            columns = {}
+
+            for name, column in self._columns.items():
+                for section_name, source in column.sections(name).items():
+                    sections[section_name] = self._write_section(source)
+                columns[name] = {"kind": column.kind, **column.meta()}
+
+            index = json.dumps({
+                "version": FORMAT_VERSION,
+                "collection": self.collection,
+                "count": self.count,
+                "dim": self.dim,
+                "distance": self.distance,
+                "sections": sections,
+                "columns": columns,
+            }).encode("utf-8")
+
+            self._file.write(index)
+            self._file.write(struct.pack("<Q", len(index)))
+            self._file.write(MAGIC)
+            self._file.close()
+            os.replace(f"{self.path}.tmp", self.path)
+        finally:
+            if not self._file.closed:
+                self._file.close()
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            if os.path.exists(f"{self.path}.tmp"):
+                os.remove(f"{self.path}.tmp")
+
+
+# ---------- Reader ----------
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file. Vectors and columns are
+    memory-mapped, so opening is cheap and pages load on demand.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise SnapshotFormatError(f"{path} is not a snapshot file")
+            f.seek(-(len(MAGIC) + 8), os.SEEK_END)
+            (index_length,) = struct.unpack("<Q", f.read(8))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise SnapshotFormatError(f"{path} is truncated")
+            f.seek(-(len(MAGIC) + 8 + index_length), os.SEEK_END)
+            self.index = json.loads(f.read(index_length))
+
+        if self.index["version"] != FORMAT_VERSION:
+            raise SnapshotFormatError(f"Unsupported snapshot version {self.index['version']}")
+
+        self.count = self.index["count"]
+        self.dim = self.index["dim"]
+        self.distance = self.index["distance"]
+        self.columns = self.index["columns"]
+        self._arrays = {}
+        self._stats = {}
+
+    def section(self, name: str) -> np.ndarray:
+        array_ = self._arrays.get(name)
+        if array_ is None:
+            spec = self.index["sections"][name]
+            shape = tuple(spec["shape"])
+            if 0 in shape:
+                array_ = np.empty(shape, dtype=spec["dtype"])
+            else:
+                array_ = np.memmap(self.path, dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=shape)
+            self._arrays[name] = array_
+        return array_
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.section("vectors")
+
+    def categories(self, name: str) -> List[str]:
+        return self.columns[name].get("categories", [])
+
+    # Per-value statistics, computed on first use and cached. Each is one
+    # pass over a column; filtered searches use them to estimate how
+    # many rows a filter keeps without scanning.
+
+    def category_codes(self, name: str) -> Dict[str, int]:
+        key = ("codes", name)
+        if key not in self._stats:
+            self._stats[key] = {value: code for code, value in enumerate(self.categories(name))}
+        return self._stats[key]
+
+    def code_counts(self, name: str) -> np.ndarray:
+        """
+        Occurrences of each category code; for list columns a row counts
+        once per value it holds.
+        """
+        key = ("code_counts", name)
+        if key not in self._stats:
+            codes = self.section(f"{name}.codes")
+            self._stats[key] = np.bincount(codes[codes >= 0], minlength=len(self.categories(name)))
+        return self._stats[key]
+
+    def int_counts(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted distinct values of an int column and their row counts
+        (missing values excluded).
+        """
+        key = ("int_counts", name)
+        if key not in self._stats:
+            values = self.section(f"{name}.values")
+            self._stats[key] = np.unique(values[values != INT_MISSING], return_counts=True)
+        return self._stats[key]
+
+    def column_values(self, name: str, start: int, end: int) -> list:
+        """
+        Decoded values of one column for rows [start, end); each section
+        is sliced once per call rather than once per row.
+        """
+        kind = self.columns[name]["kind"]
+
+        if kind == "int":
+            return [None if v == INT_MISSING else v for v in self.section(f"{name}.values")[start:end].tolist()]
+
+        if kind == "float":
+            return [None if math.isnan(v) else v for v in self.section(f"{name}.values")[start:end].tolist()]
+
+        if kind == "category":
+            names = self.categories(name)
+            return [None if code < 0 else names[code] for code in self.section(f"{name}.codes")[start:end].tolist()]
+
+        nulls = self.section(f"{name}.nulls")[start:end].tolist()
+        offsets = self.section(f"{name}.offsets")[start:end + 1].tolist()
+        base = offsets[0]
+
+        if kind == "category_list":
+            names = self.categories(name)
+            codes = self.section(f"{name}.codes")[base:offsets[-1]].tolist()
+            return [
+                None if null else [names[code] for code in codes[lo - base:hi - base]]
+                for null, lo, hi in zip(nulls, offsets, offsets[1:])
+            ]
+
+        data = bytes(self.section(f"{name}.data")[base:offsets[-1]])
+        as_json = self.columns[name].get("json")
+        values = []
+        for null, lo, hi in zip(nulls, offsets, offsets[1:]):
+            if null:
+                values.append(None)
+                continue
+            text = data[lo - base:hi - base].decode("utf-8")
+            values.append(json.loads(text) if as_json else text)
+        return values
+
+    def point_ids(self, start: int, end: int) -> list:
+        return [
+            int(point_id) if point_id.isdigit() else point_id
+            for point_id in self.column_values(ID_COLUMN, start, end)
+        ]
+
+    def payloads(self, start: int, end: int) -> List[dict]:
+        # Fields a point did not have read back as None
+        names = [name for name in self.columns if name != ID_COLUMN]
+        columns = [self.column_values(name, start, end) for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def point_id(self, row: int):
+        return self.point_ids(row, row + 1)[0]
+
+    def payload(self, row: int) -> dict:
+        return self.payloads(row, row + 1)[0]
+
+
+# ---------- Export ----------
+
+def export_collection(store, path: str, batch_size: int = 1024) -> int:
+    """
+    Stream every point of `store`'s collection into a snapshot file.
+    Returns the number of points written.
+    """
+    info = store.client.get_collection(store.collection_name)
+    vectors_config = info.config.params.vectors
+    named = isinstance(vectors_config, dict)
+    if named:
+        vectors_config = vectors_config[FULL_VECTOR]
+
+    writer = SnapshotWriter(
+        path,
+        dim=vectors_config.size,
+        distance=str(vectors_config.distance.value),
+        collection=store.collection_name
+    )
+
+    with writer:
+        offset = None
+        while True:
+            points, offset = store.client.scroll(
+                collection_name=store.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=[FULL_VECTOR] if named else True
+            )
+
+            if points:
+                writer.add(
+                    [str(p.id) for p in points],
+                    [p.vector[FULL_VECTOR] if named else p.vector for p in points],
+                    [p.payload for p in points]
+                )
+
+            if offset is None:
+                break
+
+    return writer.count
+
+
+# ---------- Import ----------
+
+def _snapshot_points(snapshot: Snapshot, start: int, end: int, reducer) -> List[PointStruct]:
+    vectors = np.asarray(snapshot.vectors[start:end])
+    small_vectors = reducer.transform(vectors) if reducer else None
+
+    points = []
+    rows = zip(snapshot.point_ids(start, end), snapshot.payloads(start, end))
+    for i, (point_id, payload) in enumerate(rows):
+        vector = vectors[i].tolist()
+        if small_vectors is not None:
+            vector = {FULL_VECTOR: vector, SMALL_VECTOR: small_vectors[i].tolist()}
+
+        # Absent and null fields are not told apart; leave both out
+        payload = {k: v for k, v in payload.items() if v is not None}
+        points.append(PointStruct(id=point_id, vector=vector, payload=payload))
+
+    return points
+
+
+def import_snapshot(store, path: str, batch_size: int = 256, workers: int = 4, progress=None) -> int:
+    """
+    Load a snapshot into `store`'s collection, creating it (with the
+    current layout and topic partitioning settings) if needed. Batches are upserted by
+    `workers` threads; point ids are kept, so re-running an import
+    overwrites rather than duplicates. Returns the number of points.
+    """
+    snapshot = Snapshot(path)
+
+    # Dot collections hold unit-length model output; anything else
+    # gets the configured default distance
+    store.create_collection(ModelInfo(
+        name=f"snapshot:{snapshot.index['collection'] or path}",
+        dimension=snapshot.dim,
+        norm=1.0 if snapshot.distance == "Dot" else 0.0
+    ))
+
+    def upsert(start: int) -> int:
+        end = min(start + batch_size, snapshot.count)
+        # upsert_points routes by topic when the collection is partitioned
+        store.upsert_points(_snapshot_points(snapshot, start, end, store.reducer))
+        return end - start
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="snapshot-import") as executor:
+        # map() keeps every batch in flight at once; submit in windows
+        # so memory stays at a few batches per worker
+        starts = list(range(0, snapshot.count, batch_size))
+        window = workers * 2
+        for i in range(0, len(starts), window):
+            for count in executor.map(upsert, starts[i:i + window]):
+                done += count
+                if progress:
+                    progress(done, snapshot.count)
+
+    return done
@@ -1,13 +1,41 @@
 from app.ml.chunking import split_into_sections, create_chunks
 from app.ml.embeddings import embedding_model
+from app.ml.vector_postprocess import vector_postprocessor
 from app.retrieval.qdrant_store import QdrantStore
 from app.core.exceptions import IngestionError
+from app.core.metrics import STAGE_LATENCY, INGEST_CHUNKS, INGEST_POINTS, INGEST_TOKENS
+from app.core.tracing import tracer, current_span
 
 
 class IngestService:
 
-    def __init__(self):
-        self.vector_store = QdrantStore()
+    def __init__(self, vector_store=None, embedder=None):
+        self.vector_store = vector_store or QdrantStore()
+        self.embedder = embedder or embedding_model
+
+    def _embed_and_store(self, chunks: list, metadata: dict):
+        texts = [c["text"] for c in chunks]
+
+        span = current_span()
+        if span:
+            span.set_attribute("chunks", len(chunks))
+
+        INGEST_CHUNKS.inc(len(chunks))
+        INGEST_TOKENS.inc(sum(len(t.split()) for t in texts))
+
+        with STAGE_LATENCY.time(operation="ingest", stage="embed"):
+            embeddings = vector_postprocessor.process(
+                self.embedder.embed_documents(texts)
+            )
+
+        with STAGE_LATENCY.time(operation="ingest", stage="upsert"):
+            self.vector_store.upsert_chunks(
+                chunks=chunks,
+                embeddings=embeddings,
+                metadata=metadata
+            )
+
+        INGEST_POINTS.inc(len(chunks))
 
     def ingest_patent(
         self,
@@ -15,110 +43,86 @@ class IngestService:
         metadata: dict,
         topic: str = None
     ) -> dict:
-        try:
-            # 1. Extract text
-            text = extract_text_from_pdf(pdf_path)
-
-            # 2. Split into sections
-            sections = split_into_sections(text)
+        with tracer.start_span("IngestService.ingest_patent", patent_id=metadata.get("patent_id")):
+            try:
+                # 1. Extract text
+                text = extract_text_from_pdf(pdf_path)
 
-            # 3. Create chunks
-            chunks = create_chunks(sections, text)
+                # 2. Split into sections
+                sections = split_into_sections(text)
 
-            if not chunks:
-                raise IngestionError(
-                    "PDF text could not be extracted. Possibly scanned or empty."
-                )
+                # 3. Create chunks
+                chunks = create_chunks(sections, text)
 
-            # 4. Generate embeddings
-            texts = [c["text"] for c in chunks]
-            embeddings = embedding_model.embed_documents(texts)
+                if not chunks:
+                    raise IngestionError(
+                        "PDF text could not be extracted. Possibly scanned or empty."
+                    )
 
-            # 5. Store in Qdrant
-            metadata["topic"] = topic
-            self.vector_store.upsert_chunks(
-                chunks=chunks,
-                embeddings=embeddings,
-                metadata=metadata
-            )
+                # 4. Generate embeddings and store in Qdrant
+                metadata["topic"] = topic
+                self._embed_and_store(chunks, metadata)
 
-            return {
-                "status": "success",
-                "patent_id": metadata.get("patent_id"),
-                "chunks_created": len(chunks)
-            }
+                return {
+                    "status": "success",
+                    "patent_id": metadata.get("patent_id"),
+                    "chunks_created": len(chunks)
+                }
 
-        except Exception as e:
-            raise IngestionError(str(e))
+            except Exception as e:
+                raise IngestionError(str(e))
 
 
     def ingest_from_api(self, patent_id: str, topic: str = None) -> dict:
         from app.utils.patent_api_client import fetch_patent_data  # Import here to avoid circular
-        try:
-            # 1. Fetch from API
-            patent_data = fetch_patent_data(patent_id)
-
-            if not patent_data['text']:
-                raise IngestionError("No text extracted from API.")
+        with tracer.start_span("IngestService.ingest_from_api", patent_id=patent_id):
+            try:
+                # 1. Fetch from API
+                patent_data = fetch_patent_data(patent_id)
 
-            # 2. Split into sections
-            sections = split_into_sections(patent_data['text'])
-            chunks = create_chunks(sections, patent_data['text'])
+                if not patent_data['text']:
+                    raise IngestionError("No text extracted from API.")
 
-            # 3. Generate embeddings
-            texts = [c["text"] for c in chunks]
-            embeddings = embedding_model.embed_documents(texts)
+                # 2. Split into sections
+                sections = split_into_sections(patent_data['text'])
+                chunks = create_chunks(sections, patent_data['text'])
 
-            # 4. Store in Qdrant
-            metadata = patent_data['metadata']
-            metadata["topic"] = topic
-            self.vector_store.upsert_chunks(
-                chunks=chunks,
-                embeddings=embeddings,
-                metadata=metadata
-            )
+                # 3. Generate embeddings and store in Qdrant
+                metadata = patent_data['metadata']
+                metadata["topic"] = topic
+                self._embed_and_store(chunks, metadata)
 
-            return {
-                "status": "success",
-                "patent_id": patent_id,
-                "chunks_created": len(chunks)
-            }
-        except Exception as e:
-            raise IngestionError(str(e))
+                return {
+                    "status": "success",
+                    "patent_id": patent_id,
+                    "chunks_created": len(chunks)
+                }
+            except Exception as e:
+                raise IngestionError(str(e))
 
 
     def ingest_from_text(self, text: str, metadata: dict, topic: str = None) -> dict:
-        try:
-            # 2. Split into sections
-            sections = split_into_sections(text)
-            chunks = create_chunks(sections, text)
+        with tracer.start_span("IngestService.ingest_from_text", patent_id=metadata.get("patent_id")):
+            try:
+                # 2. Split into sections
+                sections = split_into_sections(text)
+                chunks = create_chunks(sections, text)
+
+                if not chunks:
+                    return {
+                        "status": "skipped",
+                        "patent_id": metadata.get("patent_id"),
+                        "reason": "no chunks created"
+                    }
+
+                # 3. Generate embeddings and store in Qdrant
+                metadata["topic"] = topic
+                self._embed_and_store(chunks, metadata)
 
-            if not chunks:
                 return {
-                    "status": "skipped",
+                    "status": "success",
                     "patent_id": metadata.get("patent_id"),
-                    "reason": "no chunks created"
+                    "chunks_created": len(chunks)
                 }
-
-            # 3. Generate embeddings
-            texts = [c["text"] for c in chunks]
-            embeddings = embedding_model.embed_documents(texts)
-
-            # 4. Store in Qdrant
-            metadata["topic"] = topic
-            self.vector_store.upsert_chunks(
-                chunks=chunks,
-                embeddings=embeddings,
-                metadata=metadata
-            )
-
-            return {
-                "status": "success",
-                "patent_id": metadata.get("patent_id"),
-                "chunks_created": len(chunks)
-            }
-        except Exception as e:
-            raise IngestionError(str(e))
-
-
-ingest_service = IngestService()
+            except Exception as e:
+                raise IngestionError(str(e))
@@ -3,6 +3,8 @@ from app.ml.embeddings import embedding_model
 from app.retrieval.qdrant_store import QdrantStore
 from app.models.schemas.search import SearchRequest
 from app.core.exceptions import SearchError
+from app.core.metrics import STAGE_LATENCY
+from app.core.tracing import tracer
 from app.models.schemas.search import SearchFilters
 
 SECTION_WEIGHTS = {
@@ -13,41 +15,76 @@ SECTION_WEIGHTS = {
 
 class SearchService:
 
-    def __init__(self, vector_store, embedder):
+    def __init__(self, vector_store, embedder, postprocessor=None):
         self.vector_store = vector_store
         self.embedder = embedder
+        self.postprocessor = postprocessor
 
     def search(self, request):
-        try:
-            query_embedding = self.embedder.embed_query(request.query)
-
-            filters = None
-            if request.filters:
-                filters = request.filters
-
-            results = self.vector_store.search(
-                query_vector=query_embedding,
-                top_k=request.top_k,
-                filters=filters
-            )
-
-            return [
-                {
-                    "score": hit.score,
-                    "text": hit.payload.get("text"),
-                    "patent_id": hit.payload.get("patent_id"),
-                    "title": hit.payload.get("title"),
-                    "assignee": hit.payload.get("assignee"),
-                    "jurisdiction": hit.payload.get("jurisdiction"),
-                    "filing_year": hit.payload.get("filing_year"),
-                    "patent_class": hit.payload.get("patent_class"),
-                    "chunk_type": hit.payload.get("chunk_type"),
-                }
-                for hit in results.points
-            ]
-
-        except Exception as e:
-            raise SearchError(str(e))
+        with tracer.start_span("SearchService.search", top_k=request.top_k):
+            try:
+                with STAGE_LATENCY.time(operation="search", stage="embed"):
+                    query_embedding = self._prepare_query(
+                        self.embedder.embed_query(request.query)
+                    )
+
+                with STAGE_LATENCY.time(operation="search", stage="vector_search"):
+                    results = self.vector_store.search(
+                        query_vector=query_embedding,
+                        top_k=request.top_k,
+                        filters=request.filters or None
+                    )
+
+                with STAGE_LATENCY.time(operation="search", stage="serialize"):
+                    return self._format_results(results)
+
+            except Exception as e:
+                raise SearchError(str(e))
+
+    async def asearch(self, request):
+        """
+        Same as `search`, for an async embedder and AsyncQdrantStore.
+        """
+        with tracer.start_span("SearchService.search", top_k=request.top_k):
+            try:
+                with STAGE_LATENCY.time(operation="search", stage="embed"):
+                    query_embedding = self._prepare_query(
+                        await self.embedder.aembed_query(request.query)
+                    )
+
+                with STAGE_LATENCY.time(operation="search", stage="vector_search"):
+                    results = await self.vector_store.search(
+                        query_vector=query_embedding,
+                        top_k=request.top_k,
+                        filters=request.filters or None
+                    )
+
+                with STAGE_LATENCY.time(operation="search", stage="serialize"):
+                    return self._format_results(results)
+
+            except Exception as e:
+                raise SearchError(str(e))
+
+    def _prepare_query(self, query_embedding):
+        if self.postprocessor:
+            return self.postprocessor.process_query(query_embedding)
+        return query_embedding
+
+    def _format_results(self, results):
+        return [
+            {
+                "score": hit.score,
+                "text": hit.payload.get("text"),
+                "patent_id": hit.payload.get("patent_id"),
+                "title": hit.payload.get("title"),
+                "assignee": hit.payload.get("assignee"),
+                "jurisdiction": hit.payload.get("jurisdiction"),
+                "filing_year": hit.payload.get("filing_year"),
+                "patent_class": hit.payload.get("patent_class"),
+                "chunk_type": hit.payload.get("chunk_type"),
+            }
+            for hit in results.points
+        ]
 
     def _build_explanation(self, hit) -> str:
         """
@@ -0,0 +1,264 @@
+"""
+Recall@k vs latency for ANN search parameters.
+
+Vectors are exported from the collection, exact top-k neighbours are
+computed with brute-force NumPy, and a sample of stored vectors is
+replayed as queries (built like `QdrantStore.search` builds them) under
+each parameter setting:
+HNSW `ef`, quantization rescoring/oversampling (when the collection is
+quantized) and the two-stage over-fetch factor (when two-stage retrieval
+is enabled).
+
+Each query is a stored point, so its own id is left out of both the
+ground truth and the results. With `--limit` only the exported points
+have ground truth, so searches are restricted to them with a
+HasIdCondition filter.
+
+Run from the project root against a local Qdrant:
+    python -m benchmarks.ann_eval
+    python -m benchmarks.ann_eval --k 20 --ef 32,64,128 --output benchmarks/results/ann.json
+"""
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from qdrant_client.models import Distance, Filter, HasIdCondition, QuantizationSearchParams, SearchParams
+
+from app.core.container import container
+from app.ml.dim_reduction import FULL_VECTOR
+from app.retrieval.qdrant_store import QdrantStore, query_points_kwargs
+from benchmarks.report import build_results, latency_summary, write_results
+from benchmarks.run import make_qdrant_client
+
+SCROLL_BATCH = 1024
+QUERY_BLOCK = 256  # queries scored per matmul, bounds memory to QUERY_BLOCK x N
+
+
+def export_vectors(store: QdrantStore, limit: int = None) -> Tuple[List, np.ndarray]:
+    """
+    (ids, matrix) for up to `limit` points; the full vector is used for
+    two-stage collections.
+    """
+    ids, vectors = [], []
+    offset = None
+
+    while limit is None or len(ids) < limit:
+        batch = SCROLL_BATCH if limit is None else min(SCROLL_BATCH, limit - len(ids))
+        points, offset = store.client.scroll(
+            collection_name=store.collection_name,
+            limit=batch,
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+
+        for point in points:
+            vector = point.vector
+            if isinstance(vector, dict):
+                vector = vector[FULL_VECTOR]
+            ids.append(point.id)
+            vectors.append(vector)
+
+        if offset is None:
+            break
+
+    return ids, np.asarray(vectors, dtype=np.float32)
+
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int, distance: Distance) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (indices, scores) of the exact k nearest stored vectors for each
+    query, best first, using the collection's distance. For EUCLID the
+    scores are only comparable within a query.
+    """
+    if distance == Distance.COSINE:
+        matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    k = min(k, len(matrix))
+    squared_norms = (matrix ** 2).sum(axis=1) if distance == Distance.EUCLID else None
+    indices = np.empty((len(queries), k), dtype=np.int64)
+    best_scores = np.empty((len(queries), k), dtype=np.float32)
+
+    for start in range(0, len(queries), QUERY_BLOCK):
+        block = queries[start:start + QUERY_BLOCK]
+        scores = block @ matrix.T
+
+        if distance == Distance.EUCLID:
+            # Larger is better: -||x - q||^2 up to a per-query constant
+            scores = 2 * scores - squared_norms
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = top_scores.argsort(axis=1)[:, ::-1]
+        indices[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+        best_scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+
+    return indices, best_scores
+
+
+def recall_at_k(found: List, expected: List) -> float:
+    if not expected:
+        return 1.0
+    return len(set(found) & set(expected)) / len(expected)
+
+
+def collection_layout(store: QdrantStore) -> Dict:
+    config = store.client.get_collection(store.collection_name).config
+    vectors = config.params.vectors
+    if isinstance(vectors, dict):
+        vectors = vectors[FULL_VECTOR]
+
+    return {
+        "distance": vectors.distance,
+        "quantized": config.quantization_config is not None,
+    }
+
+
+def parameter_grid(ef_values, quantized: bool, oversampling_values, two_stage: bool, over_fetch_values) -> List[Tuple[str, dict]]:
+    """(label, search kwargs) pairs; the first is Qdrant's exact search."""
+    grid = [("exact", {"search_params": SearchParams(exact=True)})]
+
+    for ef in ef_values:
+        if quantized:
+            for oversampling in oversampling_values:
+                for rescore in (False, True):
+                    grid.append((
+                        f"ef={ef},oversampling={oversampling},rescore={rescore}",
+                        {"search_params": SearchParams(
+                            hnsw_ef=ef,
+                            quantization=QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+                        )}
+                    ))
+        else:
+            grid.append((f"ef={ef}", {"search_params": SearchParams(hnsw_ef=ef)}))
+
+    if two_stage:
+        grid = [
+            (f"{label},over_fetch={factor}", {**kwargs, "oversample": factor})
+            for label, kwargs in grid
+            for factor in over_fetch_values
+        ]
+
+    return grid
+
+
+def evaluate(store, query_vectors, query_ids, truth_ids, k: int, search_kwargs: dict, query_filter=None) -> Dict:
+    recalls, latencies = [], []
+
+    for vector, own_id, expected in zip(query_vectors, query_ids, truth_ids):
+        # One extra hit so dropping the query's own point still leaves k
+        kwargs = query_points_kwargs(
+            store.collection_name,
+            store.reducer,
+            vector.tolist(),
+            k + 1,
+            query_filter,
+            **search_kwargs
+        )
+
+        start = time.perf_counter()
+        response = store.client.query_points(**kwargs)
+        latencies.append(time.perf_counter() - start)
+
+        found = [p.id for p in response.points if p.id != own_id][:k]
+        recalls.append(recall_at_k(found, expected))
+
+    return {
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+        "qps": round(len(latencies) / sum(latencies), 2),
+        **latency_summary(latencies)
+    }
+
+
+def run(store: QdrantStore, queries: int, k: int, ef_values, oversampling_values, over_fetch_values, limit=None, seed: int = 0) -> Dict:
+    ids, matrix = export_vectors(store, limit)
+    if not ids:
+        raise SystemExit(f"Collection '{store.collection_name}' is empty")
+
+    layout = collection_layout(store)
+
+    # Ground truth only covers the exported points
+    query_filter = Filter(must=[HasIdCondition(has_id=ids)]) if limit else None
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(ids), size=min(queries, len(ids)), replace=False)
+    query_vectors = matrix[sample]
+    query_ids = [ids[i] for i in sample]
+
+    truth, truth_scores = exact_top_k(matrix, query_vectors, k + 1, layout["distance"])
+
+    # Searches drop hits scoring <= 0, so the ground truth must too
+    keep_positive = layout["distance"] in (Distance.DOT, Distance.COSINE)
+    truth_ids = [
+        [
+            ids[i] for i, score in zip(row, scores)
+            if i != own and (score > 0 or not keep_positive)
+        ][:k]
+        for own, row, scores in zip(sample, truth, truth_scores)
+    ]
+
+    grid = parameter_grid(
+        ef_values,
+        layout["quantized"],
+        oversampling_values,
+        bool(store.reducer),
+        over_fetch_values
+    )
+
+    curve = {}
+    for label, search_kwargs in grid:
+        curve[label] = evaluate(store, query_vectors, query_ids, truth_ids, k, search_kwargs, query_filter)
+        print(f"{label:<50} recall@{k}={curve[label]['recall_at_k']:.4f}  p50={curve[label]['p50_ms']:.2f}ms  p99={curve[label]['p99_ms']:.2f}ms")
+
+    return curve
+
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _floats(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ANN recall/latency evaluation")
+    parser.add_argument("--qdrant", default="server", help="server | path:<dir> | memory")
+    parser.add_argument("--collection", help="defaults to the configured collection")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--limit", type=int, help="export at most this many vectors and search only those")
+    parser.add_argument("--ef", default="16,32,64,128,256")
+    parser.add_argument("--oversampling", default="1,2,4", help="quantization oversampling factors")
+    parser.add_argument("--over-fetch", default="2,4,8", help="two-stage shortlist factors")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the curve as JSON here")
+    args = parser.parse_args(argv)
+
+    store = QdrantStore(client=make_qdrant_client(args.qdrant), reducer=container.reducer)
+    if args.collection:
+        store.collection_name = args.collection
+
+    curve = run(
+        store,
+        queries=args.queries,
+        k=args.k,
+        ef_values=_ints(args.ef),
+        oversampling_values=_floats(args.oversampling),
+        over_fetch_values=_ints(args.over_fetch),
+        limit=args.limit,
+        seed=args.seed
+    )
+
+    results = build_results(curve, config=vars(args))
+    if args.output:
+        write_results(results, args.output)
+    else:
+        print(json.dumps(results["scenarios"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Synthetic patent corpus: seeded, so every run sees the same documents.
+
+Documents follow the layout the chunker expects (abstract, claims,
+detailed description) and carry the metadata fields used by filters.
+"""
+import random
+from typing import Dict, List
+
+VOCABULARY = (
+    "battery cell electrode anode cathode electrolyte separator lithium "
+    "thermal management cooling plate module housing controller sensor "
+    "voltage current charge discharge circuit semiconductor substrate "
+    "layer wafer transistor gate signal antenna wireless receiver "
+    "transmitter frequency modulation vehicle motor inverter torque "
+    "assembly bracket fastener polymer composite coating surface "
+    "method system apparatus device configured arranged coupled "
+    "wherein comprising first second plurality portion member"
+).split()
+
+ASSIGNEES = ["Company A", "Company B", "Company C", "Company D", "Company E"]
+JURISDICTIONS = ["US", "EP", "CN", "JP", "KR"]
+PATENT_CLASSES = ["H01M", "B60L", "H01L", "H04B", "F28D", "G06F"]
+TOPICS = ["thermal_management", "battery_chemistry", "wireless", "power_electronics"]
+
+
+def _sentence(rng: random.Random, min_words: int = 8, max_words: int = 24) -> str:
+    words = rng.choices(VOCABULARY, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+
+def generate_patent(rng: random.Random, index: int, target_chars: int = 8000) -> Dict:
+    abstract = _paragraph(rng, 4)
+    claims = "\n".join(
+        f"{n}. A {rng.choice(VOCABULARY)} {_sentence(rng).lower()}"
+        for n in range(1, rng.randint(5, 15))
+    )
+
+    description = []
+    size = len(abstract) + len(claims)
+    while size < target_chars:
+        paragraph = _paragraph(rng, 6)
+        description.append(paragraph)
+        size += len(paragraph)
+
+    text = (
+        f"Abstract\n{abstract}\n\n"
+        f"Claims\n{claims}\n\n"
+        f"Detailed Description\n" + "\n\n".join(description)
+    )
+
+    return {
+        "text": text,
+        "metadata": {
+            "patent_id": f"US{10000000 + index}",
+            "title": _sentence(rng, 4, 8).rstrip("."),
+            "assignee": rng.choice(ASSIGNEES),
+            "jurisdiction": rng.choice(JURISDICTIONS),
+            "filing_year": rng.randint(2000, 2024),
+            "patent_class": rng.sample(PATENT_CLASSES, k=rng.randint(1, 2)),
+            "topic": rng.choice(TOPICS)
+        }
+    }
+
+
+def generate_corpus(count: int, target_chars: int = 8000, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    return [generate_patent(rng, i, target_chars) for i in range(count)]
+
+
+def generate_queries(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(VOCABULARY, k=rng.randint(3, 8))) for _ in range(count)]
+
@@ -0,0 +1,101 @@
+"""
+A stand-in for the Ollama embedding API, so benchmarks run offline.
+
+Vectors are derived from a hash of the input text, so the same text
+always gets the same unit-length vector. Each call sleeps for
+`latency_ms` (plus `per_item_ms` per input on /api/embed) to mimic
+model inference time.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+def deterministic_vector(text: str, dim: int) -> list:
+    seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+    return vector.tolist()
+
+
+class FakeOllamaServer:
+    def __init__(
+        self,
+        dim: int = 768,
+        latency_ms: float = 5.0,
+        per_item_ms: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.dim = dim
+        self.latency = latency_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                with server._calls_lock:
+                    server.calls += 1
+
+                if self.path == "/api/embeddings":
+                    time.sleep(server.latency)
+                    payload = {"embedding": deterministic_vector(body["prompt"], server.dim)}
+                elif self.path == "/api/embed":
+                    inputs = body["input"]
+                    inputs = [inputs] if isinstance(inputs, str) else inputs
+                    time.sleep(server.latency + server.per_item * len(inputs))
+                    payload = {"embeddings": [deterministic_vector(t, server.dim) for t in inputs]}
+                else:
+                    self.send_error(404)
+                    return
+
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-ollama",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
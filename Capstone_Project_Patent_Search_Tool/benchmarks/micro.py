@@ -0,0 +1,66 @@
+"""
+Micro-benchmarks for the chunking hot path over realistic patent sizes
+(1 KB to 5 MB), checked against stored baselines.
+
+For each function and document size it reports:
+- ns_per_char: best-of-N wall time divided by input length
+- peak_bytes: tracemalloc peak while the call runs
+- retained_allocations: memory blocks still alive from the call
+  (i.e. held by the result)
+
+Run from the project root:
+    python -m benchmarks.micro                       # compare to baseline
+    python -m benchmarks.micro --sizes 1KB,100KB
+    python -m benchmarks.micro --update-baseline     # after an intended change
+
+Timings vary between machines; refresh the baseline on the machine
+that runs the check. Measurement, tolerances and the command line are
+in the shared benchmark_harness module.
+"""
+import os
+import random
+from typing import Callable, Dict
+
+from app.ml.chunking import split_into_sections, create_chunks, sliding_window_chunk
+from benchmarks.corpus import generate_patent
+from benchmark_harness import measure, micro_main
+
+SIZES = {
+    "1KB": 1_000,
+    "10KB": 10_000,
+    "100KB": 100_000,
+    "1MB": 1_000_000,
+    "5MB": 5_000_000,
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+
+
+def _targets(text: str) -> Dict[str, Callable[[], object]]:
+    sections = split_into_sections(text)
+    return {
+        "split_into_sections": lambda: split_into_sections(text),
+        "create_chunks": lambda: create_chunks(sections, text),
+        "sliding_window_chunk": lambda: sliding_window_chunk(text),
+    }
+
+
+def run(sizes, seed: int = 42) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    scenarios = {}
+
+    for label in sizes:
+        text = generate_patent(rng, 0, target_chars=SIZES[label])["text"]
+
+        for name, fn in _targets(text).items():
+            scenarios[f"{name}[{label}]"] = measure(fn, len(text))
+
+    return scenarios
+
+
+def main(argv=None):
+    micro_main("Chunking micro-benchmarks", run, SIZES, DEFAULT_BASELINE, argv)
+
+
+if __name__ == "__main__":
+    main()
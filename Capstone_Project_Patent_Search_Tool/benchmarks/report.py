@@ -0,0 +1,20 @@
+"""
+Result files and baseline comparison (from the shared benchmark_harness),
+plus the latency summary reported by the load scenarios.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from benchmark_harness import build_results, compare, load_results, write_results
+
+
+def latency_summary(latencies_s: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies_s, dtype=np.float64) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(values.mean()), 3)
+    }
@@ -0,0 +1,205 @@
+"""
+Offline benchmark harness for ingest and search.
+
+Ollama is replaced by a local fake server (benchmarks/fake_ollama.py)
+and Qdrant runs in-memory by default, so no services are needed.
+
+Run from the project root:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios search --concurrency 64
+    python -m benchmarks.run --output benchmarks/results/latest.json \\
+        --baseline benchmarks/results/baseline.json
+
+With --baseline the run exits with status 1 if any metric regressed
+by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import warnings
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import PointStruct
+
+from app.core.config import settings
+from app.core.container import container
+from app.ml.embeddings import EmbeddingModel
+from app.ml.batching import MicroBatchingEmbedder
+from app.ml.model_info import ModelInfo
+from app.ml.vector_postprocess import vector_postprocessor
+from app.retrieval.qdrant_store import AsyncQdrantStore, QdrantStore
+from app.services.ingest_service import IngestService
+from app.services.search_service import SearchService
+from benchmarks import scenarios
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.report import build_results, compare, load_results, write_results
+
+ALL_SCENARIOS = ("chunking", "embed", "upsert", "search")
+BENCH_COLLECTION = "patent_chunks_bench"
+
+
+# Local mode ignores payload indexes and says so for every index created
+warnings.filterwarnings("ignore", message="Payload indexes have no effect")
+
+
+def make_qdrant_client(mode: str) -> QdrantClient:
+    """
+    memory        in-process, nothing persisted (default)
+    path:<dir>    in-process, persisted to <dir>
+    server        the Qdrant configured in settings
+    """
+    if mode == "memory":
+        return QdrantClient(location=":memory:")
+    if mode.startswith("path:"):
+        return QdrantClient(path=mode[len("path:"):])
+    if mode == "server":
+        return QdrantClient(host=settings.qdrant_host, port=settings.qdrant_port)
+    raise ValueError(f"Unknown Qdrant mode: {mode}")
+
+
+def make_store(mode: str, dim: int) -> QdrantStore:
+    store = QdrantStore(client=make_qdrant_client(mode), reducer=container.reducer)
+    # Never touch the real collection, even against a server
+    store.collection_name = BENCH_COLLECTION
+    store.delete_collection()
+    store.create_collection(ModelInfo(name="fake-ollama", dimension=dim, norm=1.0))
+    return store
+
+
+def make_async_store(mode: str, store: QdrantStore) -> AsyncQdrantStore:
+    """
+    The async store the search route uses, over `store`'s collection.
+    Local-mode clients cannot share a collection, so in memory/path mode
+    the points are copied into an in-memory async client.
+    """
+    if mode == "server":
+        client = AsyncQdrantClient(
+            host=settings.qdrant_host,
+            port=settings.qdrant_port,
+            pool_size=settings.qdrant_async_pool_size
+        )
+    else:
+        client = AsyncQdrantClient(location=":memory:")
+        asyncio.run(_copy_collection(store, client))
+
+    async_store = AsyncQdrantStore(reducer=store.reducer, client=client)
+    async_store.collection_name = store.collection_name
+    return async_store
+
+
+async def _copy_collection(store: QdrantStore, client: AsyncQdrantClient, batch_size: int = 1024):
+    info = store.client.get_collection(store.collection_name)
+    await client.create_collection(store.collection_name, vectors_config=info.config.params.vectors)
+
+    offset = None
+    while True:
+        points, offset = store.client.scroll(
+            store.collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        if points:
+            await client.upsert(
+                store.collection_name,
+                points=[PointStruct(id=p.id, vector=p.vector, payload=p.payload) for p in points]
+            )
+        if offset is None:
+            break
+
+
+def run(args) -> dict:
+    selected = args.scenarios.split(",") if args.scenarios != "all" else list(ALL_SCENARIOS)
+    results = {}
+
+    corpus = generate_corpus(args.docs, target_chars=args.doc_chars, seed=args.seed)
+    queries = generate_queries(args.queries, seed=args.seed)
+
+    if "chunking" in selected:
+        results["chunking"] = scenarios.chunking_throughput(corpus)
+
+    server = FakeOllamaServer(
+        dim=args.dim,
+        latency_ms=args.ollama_latency_ms,
+        per_item_ms=args.ollama_per_item_ms
+    ).start()
+
+    try:
+        embedder = EmbeddingModel(base_url=server.url, max_retries=0)
+
+        if "embed" in selected:
+            results["embed"] = scenarios.embed_batching(
+                embedder, server, queries, args.concurrency
+            )
+
+        if "upsert" in selected or "search" in selected:
+            store = make_store(args.qdrant, args.dim)
+
+            if "upsert" in selected:
+                results["upsert"] = scenarios.bulk_upsert(store, args.dim, args.points)
+
+            if "search" in selected:
+                ingest_service = IngestService(vector_store=store, embedder=embedder)
+                for doc in corpus:
+                    ingest_service.ingest_from_text(
+                        doc["text"], dict(doc["metadata"]), doc["metadata"]["topic"]
+                    )
+
+                # Wired like container.async_search_service: async store
+                # and the micro-batcher's asyncio path
+                search_service = SearchService(
+                    vector_store=make_async_store(args.qdrant, store),
+                    embedder=MicroBatchingEmbedder(embedder),
+                    postprocessor=vector_postprocessor
+                )
+                results["search"] = scenarios.search_under_load(
+                    search_service, queries, args.concurrency, top_k=args.top_k
+                )
+
+            if args.qdrant != "memory":
+                store.delete_collection()
+            store.close()
+    finally:
+        server.stop()
+
+    return build_results(results, config=vars(args))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ingest/search benchmarks")
+    parser.add_argument("--scenarios", default="all", help=f"comma-separated subset of {','.join(ALL_SCENARIOS)}")
+    parser.add_argument("--qdrant", default="memory", help="memory | path:<dir> | server")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--doc-chars", type=int, default=8000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--ollama-latency-ms", type=float, default=5.0)
+    parser.add_argument("--ollama-per-item-ms", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+
+    if args.output:
+        write_results(results, args.output)
+    print(json.dumps(results["scenarios"], indent=2))
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
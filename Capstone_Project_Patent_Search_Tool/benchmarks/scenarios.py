@@ -0,0 +1,139 @@
+"""
+Benchmark scenarios. Each returns a flat dict of metrics; see
+report.py for how names map to "higher/lower is better".
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from app.ml.chunking import split_into_sections, create_chunks
+from app.ml.batching import MicroBatchingEmbedder
+from app.models.schemas.search import SearchRequest
+from benchmarks.report import latency_summary
+
+
+def chunking_throughput(corpus: List[Dict]) -> Dict:
+    total_chars = sum(len(doc["text"]) for doc in corpus)
+    chunks = 0
+
+    start = time.perf_counter()
+    for doc in corpus:
+        chunks += len(create_chunks(split_into_sections(doc["text"]), doc["text"]))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(corpus),
+        "chunks": chunks,
+        "docs_per_s": round(len(corpus) / elapsed, 2),
+        "chunks_per_s": round(chunks / elapsed, 2),
+        "mb_per_s": round(total_chars / elapsed / 1e6, 3)
+    }
+
+
+def _concurrent(fn, items, concurrency: int):
+    """Run fn over items on `concurrency` threads; returns (latencies, elapsed)."""
+    def timed(item):
+        start = time.perf_counter()
+        fn(item)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, items))
+    return latencies, time.perf_counter() - start
+
+
+def embed_batching(embedder, server, queries: List[str], concurrency: int, batch_size: int = 32) -> Dict:
+    """
+    Query embedding three ways against the fake Ollama server: one call
+    per query, explicit batches, and the micro-batcher under concurrency.
+    """
+    results = {}
+
+    calls_before = server.calls
+    start = time.perf_counter()
+    for query in queries:
+        embedder.embed_query(query)
+    elapsed = time.perf_counter() - start
+    results["single_queries_per_s"] = round(len(queries) / elapsed, 2)
+    results["single_ollama_calls"] = server.calls - calls_before
+
+    calls_before = server.calls
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch_size):
+        embedder.embed_batch(queries[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    results["batch_queries_per_s"] = round(len(queries) / elapsed, 2)
+    results["batch_ollama_calls"] = server.calls - calls_before
+
+    batcher = MicroBatchingEmbedder(embedder, max_batch_size=batch_size)
+    calls_before = server.calls
+    latencies, elapsed = _concurrent(batcher.embed_query, queries, concurrency)
+    results["microbatch_queries_per_s"] = round(len(queries) / elapsed, 2)
+    results["microbatch_ollama_calls"] = server.calls - calls_before
+    results.update({f"microbatch_{k}": v for k, v in latency_summary(latencies).items()})
+
+    return results
+
+
+def bulk_upsert(store, dim: int, points: int, batch_size: int = 256, seed: int = 0) -> Dict:
+    rng = np.random.default_rng(seed)
+    chunks = [{"text": f"chunk {i}", "chunk_type": "description", "chunk_index": i} for i in range(batch_size)]
+    metadata = {"patent_id": "US0", "jurisdiction": "US", "assignee": "Company A", "filing_year": 2020}
+
+    written = 0
+    start = time.perf_counter()
+    while written < points:
+        n = min(batch_size, points - written)
+        vectors = rng.standard_normal((n, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.upsert_chunks(chunks[:n], vectors, metadata)
+        written += n
+    elapsed = time.perf_counter() - start
+
+    return {
+        "points": written,
+        "batch_size": batch_size,
+        "points_per_s": round(written / elapsed, 2)
+    }
+
+
+def search_under_load(search_service, queries: List[str], concurrency: int, top_k: int = 10) -> Dict:
+    """
+    `SearchService.asearch` as the /api/v1/search route runs it: requests
+    awaited on one event loop, at most `concurrency` in flight.
+    """
+    return asyncio.run(_asearch_under_load(search_service, queries, concurrency, top_k))
+
+
+async def _asearch_under_load(search_service, queries: List[str], concurrency: int, top_k: int) -> Dict:
+    requests = [SearchRequest(query=q, top_k=top_k) for q in queries]
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def timed(request):
+        async with in_flight:
+            start = time.perf_counter()
+            await search_service.asearch(request)
+            return time.perf_counter() - start
+
+    try:
+        # Warm up connections and caches outside the measurement
+        await search_service.asearch(requests[0])
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(timed(r) for r in requests))
+        elapsed = time.perf_counter() - start
+    finally:
+        # Clients are bound to this event loop
+        await search_service.embedder.aclose()
+        await search_service.vector_store.close()
+
+    return {
+        "requests": len(requests),
+        "concurrency": concurrency,
+        "qps": round(len(requests) / elapsed, 2),
+        **latency_summary(latencies)
+    }
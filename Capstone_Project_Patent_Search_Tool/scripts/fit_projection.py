@@ -0,0 +1,82 @@
+"""
+Fit the PCA projection used for two-stage retrieval from a sample of
+vectors already stored in Qdrant.
+
+Run from the project root:
+    python -m scripts.fit_projection
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.dim_reduction import DimensionReducer, FULL_VECTOR
+from app.retrieval.qdrant_store import QdrantStore
+
+SAMPLE_SIZE = 20000  # Vectors to sample from the collection
+SCROLL_BATCH = 512
+
+
+def sample_vectors(store: QdrantStore, limit: int = SAMPLE_SIZE) -> np.ndarray:
+    """
+    Scroll up to `limit` vectors from the collection. Works for both the
+    single-vector layout and the named two-stage layout.
+    """
+    vectors = []
+    offset = None
+
+    while len(vectors) < limit:
+        points, offset = store.client.scroll(
+            collection_name=store.collection_name,
+            limit=min(SCROLL_BATCH, limit - len(vectors)),
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+
+        for point in points:
+            vector = point.vector
+            if isinstance(vector, dict):
+                vector = vector[FULL_VECTOR]
+            vectors.append(vector)
+
+        if offset is None:
+            break
+
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def main():
+    dim = settings.reduced_dim
+    path = settings.projection_path
+
+    print(f"Sampling up to {SAMPLE_SIZE} vectors from Qdrant...")
+    sample = sample_vectors(QdrantStore())
+
+    if len(sample) < dim:
+        print(f"[ERROR] Need at least {dim} vectors to fit {dim} components, found {len(sample)}")
+        sys.exit(1)
+
+    print(f"Fitting PCA {sample.shape[1]} -> {dim} dims on {len(sample)} vectors...")
+    reducer = DimensionReducer.fit_pca(sample, dim)
+    reducer.save(path)
+
+    # Report how well the reduced space preserves the full-vector ranking
+    full = sample / np.linalg.norm(sample, axis=1, keepdims=True)
+    small = reducer.transform(sample)
+    queries = np.arange(min(100, len(sample)))
+    overlap = []
+    for q in queries:
+        top_full = set(np.argsort(-(full @ full[q]))[:10])
+        top_small = set(np.argsort(-(small @ small[q]))[:10 * settings.rescore_oversample])
+        overlap.append(len(top_full & top_small) / 10)
+
+    print(f"Saved projection to {path}")
+    print(f"Shortlist recall@10 (x{settings.rescore_oversample} over-fetch): {np.mean(overlap):.3f}")
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    main()
+    print(f"Total time: {time.time() - start_time:.2f} seconds")
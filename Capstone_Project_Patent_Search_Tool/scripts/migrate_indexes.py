@@ -0,0 +1,32 @@
+"""
+Bring the payload indexes of an existing collection up to date
+(see PAYLOAD_INDEXES in app/retrieval/qdrant_store.py): adds missing
+indexes such as `patent_id` and rebuilds outdated ones such as a plain
+INTEGER `filing_year` index. The API only warns about outdated indexes
+at startup; run this once per deployment. It waits for the indexes to
+finish building.
+
+Run from the project root:
+    python -m scripts.migrate_indexes
+"""
+import time
+
+from app.retrieval.qdrant_store import QdrantStore
+
+
+def main():
+    store = QdrantStore()
+    print(f"Checking payload indexes on '{store.collection_name}'...")
+
+    changed = store.migrate_payload_indexes(wait=True)
+
+    if changed:
+        print(f"Rebuilt: {', '.join(changed)}")
+    else:
+        print("All payload indexes are up to date")
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    main()
+    print(f"Total time: {time.time() - start_time:.2f} seconds")
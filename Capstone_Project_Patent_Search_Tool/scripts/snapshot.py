@@ -0,0 +1,76 @@
+"""
+Export the Qdrant collection to a snapshot file, or load a snapshot into
+a fresh collection. Snapshots serve exact search (EXACT_SEARCH_ENABLED=true),
+offline search (SEARCH_BACKEND=snapshot) and bootstrapping new environments
+without re-embedding the CSV.
+
+Run from the project root:
+    python -m scripts.snapshot export
+    python -m scripts.snapshot export --path data/patent_chunks.snap
+    python -m scripts.snapshot import --path data/patent_chunks.snap --workers 8
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.container import container
+from app.retrieval.qdrant_store import QdrantStore
+from app.retrieval.snapshot import export_collection, import_snapshot
+
+SCROLL_BATCH = 1024
+UPSERT_BATCH = 256
+IMPORT_WORKERS = 4
+
+
+def export(args):
+    store = QdrantStore()
+    print(f"Exporting '{store.collection_name}' to {args.path}...")
+    count = export_collection(store, args.path, batch_size=args.batch_size)
+    print(f"Exported {count} points")
+
+
+def _print_progress(done, total):
+    print(f"\r  {done}/{total} points", end="", flush=True)
+
+
+def import_(args):
+    # Reduced vectors are recomputed with the configured reducer
+    store = QdrantStore(reducer=container.reducer)
+    if args.collection:
+        store.collection_name = args.collection
+
+    print(f"Importing {args.path} into '{store.collection_name}'...")
+    count = import_snapshot(
+        store,
+        args.path,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        progress=_print_progress
+    )
+    print(f"\nImported {count} points")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collection snapshot tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="write the collection to a snapshot file")
+    export_parser.add_argument("--path", default=settings.snapshot_path)
+    export_parser.add_argument("--batch-size", type=int, default=SCROLL_BATCH)
+    export_parser.set_defaults(run=export)
+
+    import_parser = commands.add_parser("import", help="load a snapshot file into the collection")
+    import_parser.add_argument("--path", default=settings.snapshot_path)
+    import_parser.add_argument("--collection", help="defaults to the configured collection")
+    import_parser.add_argument("--batch-size", type=int, default=UPSERT_BATCH)
+    import_parser.add_argument("--workers", type=int, default=IMPORT_WORKERS)
+    import_parser.set_defaults(run=import_)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    main()
+    print(f"Total time: {time.time() - start_time:.2f} seconds")
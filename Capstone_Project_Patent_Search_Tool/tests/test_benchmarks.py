@@ -0,0 +1,179 @@
+"""
+Tests for the offline benchmark harness
+"""
+import json
+import numpy as np
+import requests
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.report import compare
+from benchmarks.run import main
+from app.ml.chunking import split_into_sections, create_chunks
+
+
+class TestFakeOllama:
+    """Tests for the fake Ollama server"""
+
+    def test_vectors_are_deterministic(self):
+        """Test the same text always maps to the same unit vector"""
+        with FakeOllamaServer(dim=16, latency_ms=0) as server:
+            first = requests.post(f"{server.url}/api/embeddings", json={"prompt": "battery"}).json()
+            second = requests.post(f"{server.url}/api/embed", json={"input": ["battery", "cell"]}).json()
+
+        assert len(first["embedding"]) == 16
+        assert second["embeddings"][0] == first["embedding"]
+        assert second["embeddings"][1] != first["embedding"]
+        assert server.calls == 2
+
+
+class TestCorpus:
+    """Tests for the synthetic corpus"""
+
+    def test_corpus_is_seeded(self):
+        """Test the corpus is reproducible and chunkable"""
+        corpus = generate_corpus(3, target_chars=2000)
+
+        assert corpus == generate_corpus(3, target_chars=2000)
+        assert generate_queries(5) == generate_queries(5)
+
+        sections = split_into_sections(corpus[0]["text"])
+        assert {"abstract", "claim", "description"} <= set(sections)
+        assert create_chunks(sections, corpus[0]["text"])
+
+
+class TestCompare:
+    """Tests for baseline comparison"""
+
+    def test_flags_regressions_by_direction(self):
+        """Test throughput drops and latency rises are flagged"""
+        baseline = {"scenarios": {"search": {"qps": 100.0, "p99_ms": 50.0, "requests": 10}}}
+        results = {"scenarios": {"search": {"qps": 80.0, "p99_ms": 52.0, "requests": 99}}}
+
+        regressions = compare(results, baseline, tolerance=0.1)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("search.qps")
+
+
+class TestRun:
+    """End-to-end run against the fake server and in-memory Qdrant"""
+
+    def test_small_run(self, tmp_path):
+        """Test every scenario produces metrics and a results file"""
+        output = tmp_path / "results.json"
+
+        main([
+            "--docs", "3", "--doc-chars", "1500", "--queries", "20",
+            "--points", "50", "--dim", "16", "--concurrency", "4",
+            "--ollama-latency-ms", "0", "--ollama-per-item-ms", "0",
+            "--output", str(output)
+        ])
+
+        scenarios = json.loads(output.read_text())["scenarios"]
+
+        assert set(scenarios) == {"chunking", "embed", "upsert", "search"}
+        assert scenarios["upsert"]["points"] == 50
+        assert scenarios["search"]["requests"] == 20
+        assert scenarios["search"]["p50_ms"] <= scenarios["search"]["p99_ms"]
+
+
+class TestMicroBenchmarks:
+    """Tests for the chunking micro-benchmarks"""
+
+    def test_measure_reports_time_and_memory(self):
+        """Test a measurement has all three metrics"""
+        from benchmarks.micro import measure
+
+        metrics = measure(lambda: "x" * 10000, chars=10000)
+
+        assert metrics["ns_per_char"] > 0
+        assert metrics["peak_bytes"] >= 10000
+        assert metrics["retained_allocations"] >= 0
+
+    def test_run_covers_each_function(self):
+        """Test every chunking function is measured per size"""
+        from benchmarks.micro import run
+
+        scenarios = run(["1KB"])
+
+        assert set(scenarios) == {
+            "split_into_sections[1KB]",
+            "create_chunks[1KB]",
+            "sliding_window_chunk[1KB]",
+        }
+
+    def test_min_delta_ignores_noise(self):
+        """Test small absolute changes are not regressions"""
+        baseline = {"scenarios": {"f[1KB]": {"retained_allocations": 10}}}
+        results = {"scenarios": {"f[1KB]": {"retained_allocations": 30}}}
+
+        assert compare(results, baseline, tolerance=0.1)
+        assert not compare(results, baseline, tolerance=0.1, min_delta={"retained_allocations": 64})
+
+
+class TestAnnEval:
+    """Tests for the recall/latency evaluation"""
+
+    def test_exact_top_k_matches_argsort(self):
+        """Test blocked brute force agrees with a full sort"""
+        from qdrant_client.models import Distance
+        from benchmarks.ann_eval import exact_top_k
+
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((300, 8)).astype(np.float32)
+        queries = matrix[:5]
+
+        indices, scores = exact_top_k(matrix, queries, k=4, distance=Distance.DOT)
+
+        for q, row in enumerate(indices):
+            assert list(row) == list(np.argsort(-(matrix @ queries[q]))[:4])
+        assert (np.diff(scores, axis=1) <= 0).all()
+
+    def test_recall_at_k(self):
+        """Test recall is the overlap fraction"""
+        from benchmarks.ann_eval import recall_at_k
+
+        assert recall_at_k(["a", "b", "c", "d"], ["a", "b", "x", "y"]) == 0.5
+        assert recall_at_k([], []) == 1.0
+
+    def test_run_against_in_memory_qdrant(self):
+        """Test the sweep reports recall and latency per setting"""
+        from qdrant_client import QdrantClient
+        from app.ml.model_info import ModelInfo
+        from app.retrieval.qdrant_store import QdrantStore
+        from benchmarks.ann_eval import run
+
+        store = QdrantStore(client=QdrantClient(location=":memory:"), reducer=False)
+        store.collection_name = "ann_eval_test"
+        store.create_collection(ModelInfo(name="test", dimension=8, norm=1.0))
+
+        rng = np.random.default_rng(1)
+        vectors = np.abs(rng.standard_normal((100, 8))).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.upsert_chunks([{"text": str(i)} for i in range(100)], vectors, {})
+
+        curve = run(store, queries=10, k=5, ef_values=[16, 64], oversampling_values=[2.0], over_fetch_values=[4])
+
+        assert list(curve) == ["exact", "ef=16", "ef=64"]
+        # Local mode is exact, so every setting finds the true neighbours
+        assert all(point["recall_at_k"] == 1.0 for point in curve.values())
+
+    def test_limit_restricts_search_to_exported_points(self):
+        """Test --limit searches only the points the ground truth was computed on"""
+        from qdrant_client import QdrantClient
+        from app.ml.model_info import ModelInfo
+        from app.retrieval.qdrant_store import QdrantStore
+        from benchmarks.ann_eval import run
+
+        store = QdrantStore(client=QdrantClient(location=":memory:"), reducer=False)
+        store.collection_name = "ann_eval_limit_test"
+        store.create_collection(ModelInfo(name="test", dimension=8, norm=1.0))
+
+        rng = np.random.default_rng(2)
+        vectors = np.abs(rng.standard_normal((200, 8))).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.upsert_chunks([{"text": str(i)} for i in range(200)], vectors, {})
+
+        curve = run(store, queries=10, k=5, ef_values=[16], oversampling_values=[2.0], over_fetch_values=[4], limit=30)
+
+        assert curve["exact"]["recall_at_k"] == 1.0
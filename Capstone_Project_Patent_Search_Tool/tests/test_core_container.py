@@ -0,0 +1,133 @@
+"""
+Tests for the lifespan-managed dependency container
+"""
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from app.core.container import Container
+
+
+class TestContainer:
+    """Tests for Container"""
+
+    @patch('app.retrieval.qdrant_store.QdrantStore')
+    def test_clients_are_built_lazily(self, mock_store_class):
+        """Test nothing is constructed until first access"""
+        container = Container()
+
+        mock_store_class.assert_not_called()
+
+        store = container.vector_store
+
+        assert store is mock_store_class.return_value
+        mock_store_class.assert_called_once()
+
+    @patch('app.retrieval.qdrant_store.QdrantStore')
+    def test_services_share_one_store(self, mock_store_class):
+        """Test search and ingest services reuse the same store"""
+        container = Container()
+
+        search_service = container.search_service
+        ingest_service = container.ingest_service
+
+        assert search_service.vector_store is ingest_service.vector_store
+        assert container.search_service is search_service
+        mock_store_class.assert_called_once()
+
+    def test_bootstrap_creates_collection(self):
+        """Test bootstrap probes the model and creates the collection"""
+        container = Container()
+        container._vector_store = Mock(collection_name="patent_chunks")
+        model_info = Mock()
+
+        with patch('app.ml.model_info.probe_embedding_model', return_value=model_info):
+            container.bootstrap(timeout=1.0)
+
+        container._vector_store.create_collection.assert_called_once_with(model_info)
+        assert container.model_info is model_info
+
+    def test_bootstrap_times_out(self):
+        """Test a hanging bootstrap fails startup instead of blocking"""
+        container = Container()
+        release = threading.Event()
+        container._bootstrap_collection = lambda: release.wait(5)
+
+        try:
+            with pytest.raises(RuntimeError, match="did not finish"):
+                container.bootstrap(timeout=0.05)
+        finally:
+            release.set()
+
+    def test_close_resets_clients(self):
+        """Test close releases the store so it is rebuilt on next use"""
+        container = Container()
+        store = Mock()
+        container._vector_store = store
+
+        container.close()
+
+        store.close.assert_called_once()
+        assert container._vector_store is None
+
+    @patch('app.core.container.settings')
+    def test_offline_mode_skips_qdrant(self, mock_settings):
+        """Test SEARCH_BACKEND=snapshot serves searches from the exact engine"""
+        mock_settings.search_backend = "snapshot"
+        container = Container()
+        container._exact_engine = Mock(dim=768)
+        container._exact_engine_loaded = True
+        container._vector_store = Mock()
+
+        with patch('app.ml.model_info.probe_embedding_model', return_value=Mock(dimension=768)):
+            container.bootstrap(timeout=1.0)
+
+        assert container.search_service.vector_store is container._exact_engine
+        container._vector_store.create_collection.assert_not_called()
+
+
+    @patch('app.ml.dim_reduction.settings')
+    def test_reducer_is_loaded_on_first_use(self, mock_settings, tmp_path):
+        """Test a missing PCA projection fails only when the reducer is needed"""
+        mock_settings.two_stage_enabled = True
+        mock_settings.reduction_method = "pca"
+        mock_settings.projection_path = str(tmp_path / "missing.npz")
+        container = Container()
+
+        with pytest.raises(FileNotFoundError, match="fit_projection"):
+            container.reducer
+
+        mock_settings.reduction_method = "truncate"
+        mock_settings.reduced_dim = 64
+
+        assert container.reducer.dim == 64
+        assert container.reducer is container.reducer
+
+
+    @patch('app.retrieval.exact_search.settings')
+    def test_exact_engine_is_built_on_first_use(self, mock_settings, tmp_path):
+        """Test the snapshot is opened by the container, not at import"""
+        mock_settings.exact_search_enabled = True
+        mock_settings.search_backend = "qdrant"
+        mock_settings.snapshot_path = str(tmp_path / "missing.snap")
+        container = Container()
+
+        assert container.exact_engine is None
+
+        mock_settings.search_backend = "snapshot"
+        with patch('app.core.container.settings', mock_settings):
+            with pytest.raises(RuntimeError, match="snapshot"):
+                container.offline_engine
+
+
+class TestAppImport:
+    """Tests for importing the app without backing services"""
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    def test_import_does_not_connect(self, mock_client_class):
+        """Test importing app.main opens no Qdrant connection"""
+        import importlib
+        import app.main
+
+        importlib.reload(app.main)
+
+        mock_client_class.assert_not_called()
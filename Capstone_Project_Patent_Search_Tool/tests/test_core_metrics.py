@@ -0,0 +1,129 @@
+"""
+Tests for the metrics registry and /metrics endpoint
+"""
+import pytest
+from unittest.mock import Mock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from qdrant_client.http.exceptions import ResponseHandlingException
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from app.core.metrics import MetricsRegistry, BACKEND_ERRORS, BACKEND_RETRIES, STAGE_LATENCY
+from app.api.v1.routes import metrics as metrics_route
+
+
+class TestMetricsRegistry:
+    """Tests for Counter, Histogram and text rendering"""
+
+    def test_counter_render(self):
+        """Test labelled counters render one sample per label set"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "Test counter", ["backend"])
+
+        counter.inc(backend="qdrant")
+        counter.inc(2, backend="qdrant")
+        counter.inc(backend="ollama")
+
+        text = registry.render()
+
+        assert "# TYPE test_total counter" in text
+        assert 'test_total{backend="qdrant"} 3' in text
+        assert 'test_total{backend="ollama"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets, sum and count"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_seconds", "Test histogram", ["stage"], buckets=(0.1, 1.0))
+
+        histogram.observe(0.05, stage="embed")
+        histogram.observe(0.5, stage="embed")
+        histogram.observe(5.0, stage="embed")
+
+        text = registry.render()
+
+        assert 'test_seconds_bucket{stage="embed",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{stage="embed",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{stage="embed",le="+Inf"} 3' in text
+        assert 'test_seconds_sum{stage="embed"} 5.55' in text
+        assert 'test_seconds_count{stage="embed"} 3' in text
+
+    def test_histogram_time(self):
+        """Test the timer records even when the block raises"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("test_seconds", "Test histogram", ["stage"])
+
+        with pytest.raises(ValueError):
+            with histogram.time(stage="embed"):
+                raise ValueError("boom")
+
+        assert histogram.count(stage="embed") == 1
+
+
+class TestBackendCounters:
+    """Tests for error and retry counting"""
+
+    @patch('app.retrieval.qdrant_store.time.sleep')
+    def test_qdrant_retries_transport_errors(self, mock_sleep):
+        """Test a transient Qdrant failure is retried and counted"""
+        from app.retrieval.qdrant_store import call_with_retries
+
+        retries_before = BACKEND_RETRIES.value(backend="qdrant", operation="search")
+        call = Mock(side_effect=[ResponseHandlingException(Exception("reset")), "ok"])
+
+        assert call_with_retries("search", call) == "ok"
+        assert BACKEND_RETRIES.value(backend="qdrant", operation="search") == retries_before + 1
+
+    @patch('app.ml.embeddings.time.sleep')
+    @patch('app.ml.embeddings.requests')
+    def test_ollama_errors_after_retries(self, mock_requests, mock_sleep):
+        """Test Ollama connection failures are retried, then counted as errors"""
+        from app.ml.embeddings import EmbeddingModel
+
+        errors_before = BACKEND_ERRORS.value(backend="ollama", operation="embed")
+        mock_requests.post.side_effect = RequestsConnectionError("refused")
+
+        model = EmbeddingModel(max_retries=2)
+
+        with pytest.raises(RequestsConnectionError):
+            model.embed_query("battery")
+
+        assert mock_requests.post.call_count == 3
+        assert BACKEND_ERRORS.value(backend="ollama", operation="embed") == errors_before + 1
+
+
+class TestSearchStages:
+    """Tests for per-stage search timing"""
+
+    def test_search_records_stages(self):
+        """Test each search stage is observed"""
+        from app.services.search_service import SearchService
+        from app.models.schemas.search import SearchRequest
+
+        before = {
+            stage: STAGE_LATENCY.count(operation="search", stage=stage)
+            for stage in ("embed", "vector_search", "serialize")
+        }
+
+        embedder = Mock()
+        embedder.embed_query.return_value = [0.1] * 8
+        vector_store = Mock()
+        vector_store.search.return_value = Mock(points=[])
+
+        SearchService(vector_store, embedder).search(SearchRequest(query="battery"))
+
+        for stage, count in before.items():
+            assert STAGE_LATENCY.count(operation="search", stage=stage) == count + 1
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics"""
+
+    def test_metrics_endpoint(self):
+        """Test the endpoint serves the Prometheus text format"""
+        app = FastAPI()
+        app.include_router(metrics_route.router)
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE patent_stage_duration_seconds histogram" in response.text
@@ -0,0 +1,109 @@
+"""
+Tests for the sampling profiler and admin profiling endpoint
+"""
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.profiling import SamplingProfiler
+from app.api.v1.routes import admin
+
+
+def busy_search_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler"""
+
+    def _profile(self, profiler, target):
+        stop = threading.Event()
+        worker = threading.Thread(target=target, args=(stop,))
+        worker.start()
+        profiler.start()
+        time.sleep(0.1)
+        profiler.stop()
+        stop.set()
+        worker.join()
+        return profiler
+
+    def test_collapsed_output(self):
+        """Test stacks are root-first, semicolon-joined, with counts"""
+        profiler = self._profile(SamplingProfiler(interval=0.002), busy_search_loop)
+
+        assert profiler.samples > 0
+        lines = profiler.collapsed().splitlines()
+        busy = [l for l in lines if "busy_search_loop (" in l]
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.index("busy_search_loop") > stack.index("_bootstrap")
+
+    def test_path_filter_drops_other_stacks(self):
+        """Test the search filter keeps only stacks through search code"""
+        profiler = self._profile(SamplingProfiler(interval=0.002, path="search"), busy_search_loop)
+
+        assert profiler.samples > 0
+        assert "busy_search_loop" not in profiler.collapsed()
+
+    def test_unknown_path(self):
+        """Test an unknown filter is rejected"""
+        with pytest.raises(ValueError):
+            SamplingProfiler(path="everything")
+
+
+class TestProfileEndpoint:
+    """Tests for GET /admin/profile"""
+
+    def _client(self):
+        app = FastAPI()
+        app.include_router(admin.router)
+        return TestClient(app)
+
+    @patch('app.api.v1.routes.admin.settings')
+    def test_profile(self, mock_settings):
+        """Test the endpoint returns collapsed stacks"""
+        mock_settings.admin_token = "secret"
+        mock_settings.profiling_max_seconds = 5
+
+        response = self._client().get(
+            "/admin/profile",
+            params={"seconds": 0.05},
+            headers={"X-Admin-Token": "secret"}
+        )
+
+        assert response.status_code == 200
+        assert int(response.headers["X-Profile-Samples"]) > 0
+
+    @patch('app.api.v1.routes.admin.settings')
+    def test_limits_and_token(self, mock_settings):
+        """Test the duration cap, path validation and admin token"""
+        mock_settings.admin_token = "secret"
+        mock_settings.profiling_max_seconds = 1
+
+        client = self._client()
+        headers = {"X-Admin-Token": "secret"}
+
+        assert client.get("/admin/profile", params={"seconds": 0.01}).status_code == 403
+        assert client.get("/admin/profile", params={"seconds": 5}, headers=headers).status_code == 400
+        assert client.get("/admin/profile", params={"path": "other"}, headers=headers).status_code == 422
+
+    @patch('app.api.v1.routes.admin.settings')
+    def test_closed_without_token(self, mock_settings):
+        """Test the endpoint refuses everyone when ADMIN_TOKEN is unset"""
+        mock_settings.admin_token = None
+        mock_settings.profiling_max_seconds = 5
+
+        response = self._client().get("/admin/profile", params={"seconds": 0.01})
+
+        assert response.status_code == 403
+
+    def test_disabled_by_default(self):
+        """Test the admin router is not mounted unless enabled"""
+        from app.main import app
+
+        assert "/api/v1/admin/profile" not in app.openapi()["paths"]
+        assert "/api/v1/search" in app.openapi()["paths"]
@@ -0,0 +1,189 @@
+"""
+Tests for request-scoped tracing
+"""
+import json
+import pytest
+from unittest.mock import Mock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core import tracing
+from app.core.tracing import (
+    Tracer, InMemoryExporter, FileExporter, NoopExporter,
+    parse_traceparent, trace_headers
+)
+
+
+@pytest.fixture
+def exporter():
+    """Route the global tracer to an in-memory collector"""
+    exporter = InMemoryExporter()
+    with patch.object(tracing.tracer, "exporter", exporter), \
+            patch.object(tracing.tracer, "sample_rate", 1.0):
+        yield exporter
+
+
+class TestTracer:
+    """Tests for Tracer and exporters"""
+
+    def test_child_spans_share_trace(self):
+        """Test nested spans form one trace with parent links"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(exporter=exporter)
+
+        with tracer.start_span("root") as root:
+            with tracer.start_span("child", top_k=5) as child:
+                pass
+
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+        assert child.attributes == {"top_k": 5}
+        assert [s.name for s in exporter.get_trace(root.trace_id)] == ["child", "root"]
+
+    def test_sampling_is_per_trace(self):
+        """Test an unsampled root drops the whole trace but keeps ids"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(exporter=exporter, sample_rate=0.0)
+
+        with tracer.start_span("root") as root:
+            with tracer.start_span("child") as child:
+                headers = trace_headers()
+
+        assert not exporter.spans
+        assert not child.sampled
+        assert headers["traceparent"] == f"00-{root.trace_id}-{child.span_id}-00"
+
+    def test_continues_incoming_traceparent(self):
+        """Test a root span adopts the caller's trace id"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(exporter=exporter)
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+        with tracer.start_span("root", traceparent=f"00-{trace_id}-00f067aa0ba902b7-01") as span:
+            pass
+
+        assert span.trace_id == trace_id
+        assert span.parent_id == "00f067aa0ba902b7"
+
+    def test_error_status(self):
+        """Test exceptions mark the span as failed"""
+        exporter = InMemoryExporter()
+        tracer = Tracer(exporter=exporter)
+
+        with pytest.raises(ValueError):
+            with tracer.start_span("root"):
+                raise ValueError("boom")
+
+        assert exporter.spans[0].status == "error"
+        assert "boom" in exporter.spans[0].attributes["error"]
+
+    def test_noop_exporter_disables_sampling(self):
+        """Test tracing is off with the default exporter"""
+        tracer = Tracer(exporter=NoopExporter())
+
+        with tracer.start_span("root") as span:
+            pass
+
+        assert not span.sampled
+
+    def test_file_exporter(self, tmp_path):
+        """Test spans are appended to the file as JSON lines"""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(exporter=FileExporter(str(path)))
+
+        with tracer.start_span("root") as span:
+            pass
+        tracer.shutdown()
+
+        record = json.loads(path.read_text().strip())
+        assert record["trace_id"] == span.trace_id
+        assert record["name"] == "root"
+
+    def test_parse_traceparent_rejects_garbage(self):
+        """Test malformed headers are ignored"""
+        assert parse_traceparent(None) is None
+        assert parse_traceparent("not-a-header") is None
+        assert parse_traceparent("00-xyz-00f067aa0ba902b7-01") is None
+
+
+class TestTracePropagation:
+    """Tests for spans across the request path"""
+
+    @patch('app.ml.embeddings.requests')
+    @patch('app.ml.embeddings.settings')
+    def test_ollama_receives_traceparent(self, mock_settings, mock_requests, exporter):
+        """Test the Ollama call carries the current trace id"""
+        from app.ml.embeddings import EmbeddingModel
+
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+        mock_response = Mock()
+        mock_response.json.return_value = {"embedding": [0.1] * 768}
+        mock_requests.post.return_value = mock_response
+
+        with tracing.tracer.start_span("root") as root:
+            EmbeddingModel().embed_query("battery")
+
+        headers = mock_requests.post.call_args[1]["headers"]
+        assert parse_traceparent(headers["traceparent"])[0] == root.trace_id
+        assert [s.name for s in exporter.get_trace(root.trace_id)] == ["ollama.embed", "root"]
+
+    def test_request_trace_through_route(self, exporter):
+        """Test middleware, route and service spans share one trace"""
+        from app.main import trace_requests
+        from app.services.search_service import SearchService
+
+        embedder = Mock()
+        embedder.embed_query.return_value = [0.1] * 8
+        vector_store = Mock()
+        vector_store.search.return_value = Mock(points=[])
+        service = SearchService(vector_store, embedder)
+
+        app = FastAPI()
+        app.middleware("http")(trace_requests)
+
+        @app.post("/search")
+        def search(request: dict):
+            from app.models.schemas.search import SearchRequest
+            return service.search(SearchRequest(**request))
+
+        response = TestClient(app).post("/search", json={"query": "battery"})
+
+        trace = exporter.get_trace(response.headers["X-Trace-Id"])
+        assert [s.name for s in trace] == ["SearchService.search", "POST /search"]
+        assert trace[0].parent_id == trace[1].span_id
+
+    @patch('app.services.ingest_service.extract_text_from_pdf', create=True)
+    def test_ingest_patent_and_api_are_traced(self, mock_extract, exporter):
+        """Test PDF and API ingests each open their own span"""
+        from app.services.ingest_service import IngestService
+
+        text = "ABSTRACT\nA battery cell with improved cooling. " * 20
+        mock_extract.return_value = text
+        embedder = Mock()
+        embedder.embed_documents.side_effect = lambda texts: [[0.1] * 8 for _ in texts]
+        service = IngestService(Mock(), embedder)
+
+        with patch('app.utils.patent_api_client.fetch_patent_data') as mock_fetch:
+            mock_fetch.return_value = {"text": text, "metadata": {"patent_id": "US2"}}
+            service.ingest_patent("a.pdf", {"patent_id": "US1"})
+            service.ingest_from_api("US2")
+
+        spans = {s.name: s for s in exporter.spans}
+        assert spans["IngestService.ingest_patent"].attributes["patent_id"] == "US1"
+        assert spans["IngestService.ingest_from_api"].attributes["patent_id"] == "US2"
+        assert spans["IngestService.ingest_patent"].attributes["chunks"] > 0
+
+    def test_batch_span_records_caller_traceparents(self, exporter):
+        """Test a query batch span names the requests it served"""
+        from app.ml.batching import MicroBatchingEmbedder
+
+        embedder = Mock()
+        embedder.embed_batch.side_effect = lambda texts: [[0.1]] * len(texts)
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=1)
+
+        with tracing.tracer.start_span("root") as root:
+            batcher.embed_query("battery")
+
+        batch = next(s for s in exporter.spans if s.name == "MicroBatchingEmbedder.batch")
+        assert batch.trace_id != root.trace_id
+        assert batch.attributes["caller_traceparents"] == [root.traceparent()]
@@ -0,0 +1,174 @@
+"""
+Tests for micro-batching of query embeddings
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.ml.batching import MicroBatchingEmbedder
+
+
+class TestMicroBatchingEmbedder:
+    """Tests for MicroBatchingEmbedder class"""
+
+    def _run_concurrently(self, batcher, queries):
+        results = {}
+        errors = {}
+        barrier = threading.Barrier(len(queries))
+
+        def worker(query):
+            barrier.wait()
+            try:
+                results[query] = batcher.embed_query(query)
+            except Exception as e:
+                errors[query] = e
+
+        threads = [threading.Thread(target=worker, args=(q,)) for q in queries]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        return results, errors
+
+    def test_concurrent_queries_are_batched(self):
+        """Test concurrent queries share embedding calls and get their own vectors"""
+        embedder = Mock()
+        embedder.embed_batch.side_effect = lambda texts: [[float(len(t))] for t in texts]
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=16, max_wait_ms=50)
+        queries = [f"query {'x' * i}" for i in range(8)]
+
+        results, errors = self._run_concurrently(batcher, queries)
+
+        assert not errors
+        assert all(results[q] == [float(len(q))] for q in queries)
+        assert embedder.embed_batch.call_count < len(queries)
+
+    def test_batch_size_limit(self):
+        """Test no batch exceeds max_batch_size"""
+        embedder = Mock()
+        embedder.embed_batch.side_effect = lambda texts: [[0.1]] * len(texts)
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=2, max_wait_ms=50)
+        self._run_concurrently(batcher, [f"q{i}" for i in range(6)])
+
+        assert all(len(c[0][0]) <= 2 for c in embedder.embed_batch.call_args_list)
+
+    def test_errors_fan_out_to_callers(self):
+        """Test a failed batch raises in every waiting caller"""
+        embedder = Mock()
+        embedder.embed_batch.side_effect = Exception("Ollama down")
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=20)
+        results, errors = self._run_concurrently(batcher, ["a", "b", "c"])
+
+        assert not results
+        assert len(errors) == 3
+
+    def test_short_batch_fails_every_caller(self):
+        """Test a batch with fewer vectors than queries fails all callers instead of hanging"""
+        embedder = Mock()
+        embedder.embed_batch.side_effect = lambda texts: [[0.1]] * (len(texts) - 1)
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=50)
+        results, errors = self._run_concurrently(batcher, ["a", "b", "c"])
+
+        assert not results
+        assert len(errors) == 3
+        assert all(isinstance(e, RuntimeError) for e in errors.values())
+
+    def test_caller_times_out(self):
+        """Test a caller stops waiting on a stuck backend after timeout_s"""
+        release = threading.Event()
+        embedder = Mock()
+        embedder.embed_batch.side_effect = lambda texts: release.wait(5) and [[0.1]] * len(texts)
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=1, timeout_s=0.05)
+
+        try:
+            with pytest.raises(TimeoutError):
+                batcher.embed_query("stuck")
+        finally:
+            release.set()
+
+    def test_single_query(self):
+        """Test a lone query is embedded after the wait window"""
+        embedder = Mock()
+        embedder.embed_batch.return_value = [[0.5] * 768]
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=1)
+
+        assert batcher.embed_query("battery") == [0.5] * 768
+        embedder.embed_batch.assert_called_once_with(["battery"])
+
+    def test_embed_documents_passthrough(self):
+        """Test document embedding is not batched through the queue"""
+        embedder = Mock()
+        embedder.embed_documents.return_value = [[0.1]]
+
+        batcher = MicroBatchingEmbedder(embedder)
+
+        assert batcher.embed_documents(["doc"]) == [[0.1]]
+        embedder.embed_documents.assert_called_once_with(["doc"])
+
+    def test_async_queries_share_batches(self):
+        """Test awaited queries are batched through aembed_batch without a worker thread"""
+        embedder = Mock()
+        embedder.aembed_batch = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=64, max_wait_ms=50)
+        queries = [f"q{'x' * i}" for i in range(200)]
+
+        async def run():
+            return await asyncio.gather(*(batcher.aembed_query(q) for q in queries))
+
+        results = asyncio.run(run())
+
+        assert results == [[float(len(q))] for q in queries]
+        assert embedder.aembed_batch.await_count < len(queries)
+        embedder.embed_batch.assert_not_called()
+        assert batcher._worker is None
+
+    def test_async_batches_run_concurrently(self):
+        """Test a slow batch does not hold back the next one"""
+        in_flight = 0
+        peak = 0
+
+        async def slow_batch(texts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return [[0.1]] * len(texts)
+
+        embedder = Mock()
+        embedder.aembed_batch = slow_batch
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=4, max_wait_ms=1)
+
+        async def run():
+            return await asyncio.gather(*(batcher.aembed_query(f"q{i}") for i in range(16)))
+
+        results = asyncio.run(run())
+
+        assert len(results) == 16
+        assert peak > 1
+
+    def test_async_short_batch_fails_every_caller(self):
+        """Test the async path also fails all callers on a short batch"""
+        embedder = Mock()
+        embedder.aembed_batch = AsyncMock(return_value=[[0.1]])
+
+        batcher = MicroBatchingEmbedder(embedder, max_batch_size=8, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.aembed_query(q) for q in ["a", "b", "c"]),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
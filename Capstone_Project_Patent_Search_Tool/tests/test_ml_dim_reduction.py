@@ -0,0 +1,122 @@
+"""
+Tests for dimensionality reduction used by two-stage retrieval
+"""
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+from app.ml.dim_reduction import DimensionReducer, FULL_VECTOR, SMALL_VECTOR
+from app.retrieval.qdrant_store import QdrantStore
+
+
+@pytest.fixture
+def corpus_sample():
+    """Low-rank sample so a few components explain the data"""
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(8, 64))
+    return rng.normal(size=(500, 8)) @ basis
+
+
+class TestDimensionReducer:
+    """Tests for DimensionReducer class"""
+
+    def test_truncation(self):
+        """Test Matryoshka truncation keeps the leading dims and renormalizes"""
+        reducer = DimensionReducer.truncation(2)
+
+        reduced = reducer.transform([[3.0, 4.0, 100.0]])
+
+        assert reduced.shape == (1, 2)
+        assert np.allclose(reduced[0], [0.6, 0.8])
+
+    def test_fit_pca_shapes(self, corpus_sample):
+        """Test PCA projection output shape and normalization"""
+        reducer = DimensionReducer.fit_pca(corpus_sample, 8)
+
+        reduced = reducer.transform(corpus_sample)
+
+        assert reducer.method == "pca"
+        assert reduced.shape == (500, 8)
+        assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0, atol=1e-5)
+
+    def test_pca_preserves_neighbours(self, corpus_sample):
+        """Test nearest neighbours survive projection of low-rank data"""
+        reducer = DimensionReducer.fit_pca(corpus_sample, 8)
+        centered = corpus_sample - corpus_sample.mean(axis=0)
+        full = centered / np.linalg.norm(centered, axis=1, keepdims=True)
+        small = reducer.transform(corpus_sample)
+
+        for q in range(5):
+            assert np.argsort(-(full @ full[q]))[1] == np.argsort(-(small @ small[q]))[1]
+
+    def test_save_and_load(self, corpus_sample, tmp_path):
+        """Test a fitted projection round-trips through disk"""
+        path = str(tmp_path / "projection.npz")
+        reducer = DimensionReducer.fit_pca(corpus_sample, 4)
+        reducer.save(path)
+
+        loaded = DimensionReducer.load(path)
+
+        assert loaded.dim == 4
+        assert np.allclose(loaded.transform(corpus_sample[:3]), reducer.transform(corpus_sample[:3]))
+
+    def test_fit_pca_rejects_too_many_dims(self, corpus_sample):
+        """Test asking for more components than dimensions"""
+        with pytest.raises(ValueError):
+            DimensionReducer.fit_pca(corpus_sample, 128)
+
+
+class TestTwoStageQdrantStore:
+    """Tests for QdrantStore with a dimension reducer"""
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_create_collection_named_vectors(self, mock_settings, mock_qdrant_client):
+        """Test the two-stage collection has full and small named vectors"""
+        mock_client_instance = Mock()
+        mock_client_instance.get_collections.return_value = Mock(collections=[])
+        mock_qdrant_client.return_value = mock_client_instance
+
+        store = QdrantStore(reducer=DimensionReducer.truncation(128))
+        store.create_collection()
+
+        vectors_config = mock_client_instance.recreate_collection.call_args[1]["vectors_config"]
+        assert vectors_config[FULL_VECTOR].size == 768
+        assert vectors_config[FULL_VECTOR].on_disk is True
+        assert vectors_config[SMALL_VECTOR].size == 128
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_upsert_writes_both_vectors(self, mock_settings, mock_qdrant_client):
+        """Test points carry the full and reduced vectors"""
+        mock_client_instance = Mock()
+        mock_qdrant_client.return_value = mock_client_instance
+
+        store = QdrantStore(reducer=DimensionReducer.truncation(2))
+        store.upsert_chunks(
+            [{"text": "chunk", "chunk_type": "claim"}],
+            np.array([[0.6, 0.8, 0.0]], dtype=np.float32),
+            {"patent_id": "US1"}
+        )
+
+        point = mock_client_instance.upsert.call_args[1]["points"][0]
+        assert len(point.vector[FULL_VECTOR]) == 3
+        assert len(point.vector[SMALL_VECTOR]) == 2
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_search_prefetches_on_small_vector(self, mock_settings, mock_qdrant_client):
+        """Test search over-fetches on the small vector and rescores with the full one"""
+        mock_settings.rescore_oversample = 4
+        mock_client_instance = Mock()
+        mock_client_instance.query_points.return_value = Mock(points=[])
+        mock_qdrant_client.return_value = mock_client_instance
+
+        store = QdrantStore(reducer=DimensionReducer.truncation(2))
+        store.search([0.6, 0.8, 0.0], top_k=5)
+
+        call_args = mock_client_instance.query_points.call_args[1]
+        assert call_args["using"] == FULL_VECTOR
+        assert call_args["limit"] == 5
+        assert call_args["prefetch"].using == SMALL_VECTOR
+        assert call_args["prefetch"].limit == 20
+        assert len(call_args["prefetch"].query) == 2
@@ -1,6 +1,8 @@
 """
 Tests for ML embeddings
 """
+import asyncio
+import httpx
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from app.ml.embeddings import EmbeddingModel
@@ -105,3 +107,140 @@ class TestEmbeddingModel:
         assert call_args[1]["json"]["model"] == "test-model"
         assert call_args[1]["json"]["prompt"] == "test text"
         assert call_args[1]["timeout"] == 60
+    
+    @patch('app.ml.embeddings.settings')
+    @patch('app.ml.embeddings.requests')
+    def test_embed_batch_single_request(self, mock_requests, mock_settings):
+        """Test batch embedding sends all texts in one request"""
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+        
+        mock_response = Mock()
+        mock_response.json.return_value = {"embeddings": [[0.1] * 768, [0.2] * 768]}
+        mock_response.raise_for_status.return_value = None
+        mock_requests.post.return_value = mock_response
+        
+        model = EmbeddingModel()
+        results = model.embed_batch(["query one", "query two"])
+        
+        assert len(results) == 2
+        mock_requests.post.assert_called_once()
+        call_args = mock_requests.post.call_args
+        assert call_args[0][0] == "http://localhost:11434/api/embed"
+        assert call_args[1]["json"]["input"] == ["query one", "query two"]
+
+    @patch('app.ml.embeddings.time.sleep')
+    @patch('app.ml.embeddings.settings')
+    @patch('app.ml.embeddings.requests.post')
+    def test_connection_errors_are_retried_but_timeouts_are_not(self, mock_post, mock_settings, mock_sleep):
+        """Test an unreachable Ollama is retried and a timed-out request fails at once"""
+        from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+
+        ok = Mock()
+        ok.json.return_value = {"embedding": [0.1] * 768}
+        mock_post.side_effect = [ConnectionError("refused"), ok]
+
+        model = EmbeddingModel()
+        assert model.embed_query("battery") == [0.1] * 768
+        assert mock_post.call_count == 2
+
+        for timeout in (ReadTimeout("slow"), ConnectTimeout("slow")):
+            mock_post.reset_mock()
+            mock_post.side_effect = timeout
+
+            with pytest.raises(type(timeout)):
+                model.embed_query("battery")
+            assert mock_post.call_count == 1
+
+    @patch('app.ml.embeddings.settings')
+    def test_async_timeouts_are_not_retried(self, mock_settings):
+        """Test the async client gives up on the first timeout"""
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadTimeout("slow", request=request)
+
+        model = EmbeddingModel()
+        model._async_client = httpx.AsyncClient(
+            base_url="http://localhost:11434",
+            transport=httpx.MockTransport(handler)
+        )
+
+        async def run():
+            try:
+                await model.aembed_query("battery")
+            finally:
+                await model.aclose()
+
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(run())
+        assert len(calls) == 1
+
+    @patch('app.ml.embeddings.settings')
+    def test_aembed_query(self, mock_settings):
+        """Test async query embedding goes through the async HTTP client"""
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+        mock_settings.ollama_max_connections = 10
+
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"embedding": [0.1] * 768})
+
+        model = EmbeddingModel()
+        model._async_client = httpx.AsyncClient(
+            base_url="http://localhost:11434",
+            transport=httpx.MockTransport(handler)
+        )
+
+        async def run():
+            try:
+                return await model.aembed_query("battery")
+            finally:
+                await model.aclose()
+
+        result = asyncio.run(run())
+
+        assert result == [0.1] * 768
+        assert requests_seen[0].url.path == "/api/embeddings"
+        assert model._async_client is None
+
+    @patch('app.ml.embeddings.settings')
+    def test_aembed_batch(self, mock_settings):
+        """Test async batch embedding sends all inputs in one /api/embed request"""
+        mock_settings.ollama_url = "http://localhost:11434"
+        mock_settings.ollama_model = "nomic-embed-text"
+        mock_settings.ollama_max_connections = 10
+
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"embeddings": [[0.1] * 768, [0.2] * 768]})
+
+        model = EmbeddingModel()
+        model._async_client = httpx.AsyncClient(
+            base_url="http://localhost:11434",
+            transport=httpx.MockTransport(handler)
+        )
+
+        async def run():
+            try:
+                return await model.aembed_batch(["query one", "query two"])
+            finally:
+                await model.aclose()
+
+        results = asyncio.run(run())
+
+        assert len(results) == 2
+        assert len(requests_seen) == 1
+        assert requests_seen[0].url.path == "/api/embed"
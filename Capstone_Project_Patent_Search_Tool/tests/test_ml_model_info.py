@@ -0,0 +1,183 @@
+"""
+Tests for embedding model introspection and per-model collections
+"""
+import pytest
+from unittest.mock import Mock, patch
+from qdrant_client.models import Distance
+from app.ml import model_info as model_info_module
+from app.ml.model_info import ModelInfo, probe_embedding_model, collection_name_for
+from app.ml.dim_reduction import FULL_VECTOR, SMALL_VECTOR
+from app.retrieval.qdrant_store import QdrantStore
+from app.core.exceptions import CollectionConfigError
+
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache():
+    model_info_module._model_info_cache.clear()
+    yield
+    model_info_module._model_info_cache.clear()
+
+
+class TestProbeEmbeddingModel:
+    """Tests for probe_embedding_model"""
+
+    def test_probe_reads_dimension_and_norm(self):
+        """Test the probe reports dimension and norm"""
+        embedder = Mock(model_name="test-model")
+        embedder.embed_query.return_value = [3.0, 4.0]
+
+        info = probe_embedding_model(embedder)
+
+        assert info.dimension == 2
+        assert info.norm == pytest.approx(5.0)
+        assert not info.normalized
+
+    def test_probe_is_cached_per_model(self):
+        """Test the model is only probed once"""
+        embedder = Mock(model_name="test-model")
+        embedder.embed_query.return_value = [0.6, 0.8]
+
+        probe_embedding_model(embedder)
+        info = probe_embedding_model(embedder)
+
+        assert info.normalized
+        embedder.embed_query.assert_called_once()
+
+    def test_probe_rejects_empty_vector(self):
+        """Test an empty probe vector fails fast"""
+        embedder = Mock(model_name="broken-model")
+        embedder.embed_query.return_value = []
+
+        with pytest.raises(ValueError):
+            probe_embedding_model(embedder)
+
+
+class TestCollectionNaming:
+    """Tests for collection_name_for"""
+
+    @patch('app.ml.model_info.settings')
+    def test_shared_collection_by_default(self, mock_settings):
+        """Test the default single collection name"""
+        mock_settings.collection_name = "patent_chunks"
+        mock_settings.collection_per_model = False
+
+        assert collection_name_for("nomic-embed-text") == "patent_chunks"
+
+    @patch('app.ml.model_info.settings')
+    def test_per_model_collection(self, mock_settings):
+        """Test per-model collection names are slugified"""
+        mock_settings.collection_name = "patent_chunks"
+        mock_settings.collection_per_model = True
+
+        assert collection_name_for("nomic-embed-text:v1.5") == "patent_chunks__nomic_embed_text_v1_5"
+
+
+class TestCollectionValidation:
+    """Tests for creating/validating the collection from model info"""
+
+    def _store(self, mock_qdrant_client, existing=None, size=768, distance=Distance.DOT, vectors=None, reducer=None):
+        client = Mock()
+        collection = Mock()
+        collection.name = "patent_chunks"
+        client.get_collections.return_value = Mock(
+            collections=[collection] if existing else []
+        )
+        client.get_collection.return_value.config.params.vectors = (
+            vectors if vectors is not None else Mock(size=size, distance=distance)
+        )
+        mock_qdrant_client.return_value = client
+        return QdrantStore(reducer=reducer), client
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_create_uses_probed_dimension(self, mock_settings, mock_qdrant_client):
+        """Test new collections are sized from the model"""
+        store, client = self._store(mock_qdrant_client)
+
+        store.create_collection(ModelInfo(name="small-model", dimension=384, norm=1.0))
+
+        vectors_config = client.recreate_collection.call_args[1]["vectors_config"]
+        assert vectors_config.size == 384
+        assert vectors_config.distance == Distance.DOT
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_existing_collection_mismatch_fails(self, mock_settings, mock_qdrant_client):
+        """Test a dimension mismatch raises at startup"""
+        store, client = self._store(mock_qdrant_client, existing=True, size=768)
+
+        with pytest.raises(CollectionConfigError):
+            store.create_collection(ModelInfo(name="small-model", dimension=384, norm=1.0))
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_existing_collection_match(self, mock_settings, mock_qdrant_client):
+        """Test a matching collection passes validation"""
+        store, client = self._store(mock_qdrant_client, existing=True, size=768)
+
+        store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=20.0))
+
+        client.recreate_collection.assert_not_called()
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_existing_cosine_collection_accepted(self, mock_settings, mock_qdrant_client):
+        """Test a COSINE collection keeps working with normalized vectors"""
+        store, client = self._store(mock_qdrant_client, existing=True, size=768, distance=Distance.COSINE)
+
+        store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=1.0))
+
+        client.recreate_collection.assert_not_called()
+
+    @patch('app.retrieval.qdrant_store.vector_postprocessor')
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_dot_collection_needs_unit_vectors(self, mock_settings, mock_qdrant_client, mock_postprocessor):
+        """Test a DOT collection raises when vectors are not unit-length"""
+        mock_postprocessor.normalize = False
+        store, client = self._store(mock_qdrant_client, existing=True, size=768, distance=Distance.DOT)
+
+        with pytest.raises(CollectionConfigError, match="unit-length"):
+            store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=20.0))
+
+        # Unit-length model output is fine without normalization
+        store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=1.0))
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_two_stage_over_single_vector_collection_fails(self, mock_settings, mock_qdrant_client):
+        """Test enabling two-stage retrieval over a single-vector collection raises at startup"""
+        store, client = self._store(mock_qdrant_client, existing=True, reducer=Mock(dim=64))
+
+        with pytest.raises(CollectionConfigError, match="TWO_STAGE_ENABLED=True"):
+            store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=1.0))
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_single_vector_over_two_stage_collection_fails(self, mock_settings, mock_qdrant_client):
+        """Test disabling two-stage retrieval over a named-vector collection raises at startup"""
+        named = {
+            FULL_VECTOR: Mock(size=768, distance=Distance.DOT),
+            SMALL_VECTOR: Mock(size=64, distance=Distance.DOT),
+        }
+        store, client = self._store(mock_qdrant_client, existing=True, vectors=named)
+
+        with pytest.raises(CollectionConfigError, match="TWO_STAGE_ENABLED=False"):
+            store.create_collection(ModelInfo(name="nomic-embed-text", dimension=768, norm=1.0))
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_two_stage_collection_checks_reduced_dim(self, mock_settings, mock_qdrant_client):
+        """Test a matching two-stage layout passes and a different REDUCED_DIM raises"""
+        named = {
+            FULL_VECTOR: Mock(size=768, distance=Distance.DOT),
+            SMALL_VECTOR: Mock(size=64, distance=Distance.DOT),
+        }
+        model_info = ModelInfo(name="nomic-embed-text", dimension=768, norm=1.0)
+
+        store, client = self._store(mock_qdrant_client, existing=True, vectors=named, reducer=Mock(dim=64))
+        store.create_collection(model_info)
+
+        store, client = self._store(mock_qdrant_client, existing=True, vectors=named, reducer=Mock(dim=128))
+        with pytest.raises(CollectionConfigError, match="128-dim"):
+            store.create_collection(model_info)
@@ -0,0 +1,122 @@
+"""
+Tests for the local ONNX embedding backend
+"""
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+from app.ml.embeddings import Embedder, EmbeddingModel, create_embedding_model
+from app.ml.onnx_embeddings import OnnxEmbeddingModel
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer that pads each batch to its longest text"""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        tokens = [t.split() for t in texts]
+        longest = max(len(t) for t in tokens)
+
+        encodings = []
+        for words in tokens:
+            ids = [len(w) for w in words] + [0] * (longest - len(words))
+            mask = [1] * len(words) + [0] * (longest - len(words))
+            encodings.append(Mock(ids=ids, attention_mask=mask))
+        return encodings
+
+
+def _input(name):
+    node = Mock()
+    node.name = name
+    return node
+
+
+class FakeSession:
+    """Returns each token id as a constant 4-dim token embedding"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_inputs(self):
+        return [_input(n) for n in ["input_ids", "attention_mask", "token_type_ids"]]
+
+    def run(self, output_names, inputs):
+        self.calls.append(inputs)
+        ids = inputs["input_ids"].astype(np.float32)
+        return [np.repeat(ids[..., None], 4, axis=2) + 1.0]
+
+
+@pytest.fixture
+def onnx_model():
+    return OnnxEmbeddingModel(
+        model_path="model.onnx",
+        batch_size=2,
+        max_length=16,
+        intra_op_threads=1,
+        session=FakeSession(),
+        tokenizer=FakeTokenizer()
+    )
+
+
+class TestOnnxEmbeddingModel:
+    """Tests for OnnxEmbeddingModel class"""
+
+    def test_is_embedder(self, onnx_model):
+        """Test the ONNX backend implements the embedder interface"""
+        assert isinstance(onnx_model, Embedder)
+
+    def test_embed_query_is_normalized(self, onnx_model):
+        """Test query embeddings are L2-normalized lists of floats"""
+        vector = onnx_model.embed_query("battery thermal management")
+
+        assert len(vector) == 4
+        assert all(isinstance(x, float) for x in vector)
+        assert np.isclose(np.linalg.norm(vector), 1.0)
+
+    def test_embed_documents_batches_by_length(self, onnx_model):
+        """Test documents are length-sorted into batches and returned in order"""
+        texts = ["a b c d e", "a", "a b c", "a b"]
+
+        vectors = onnx_model.embed_documents(texts)
+
+        assert len(vectors) == 4
+        assert onnx_model.tokenizer.batches == [["a", "a b"], ["a b c", "a b c d e"]]
+
+    def test_embed_documents_passes_token_type_ids(self, onnx_model):
+        """Test optional model inputs are provided when the model declares them"""
+        onnx_model.embed_documents(["a b"])
+
+        assert "token_type_ids" in onnx_model.session.calls[0]
+
+    def test_embed_documents_empty(self, onnx_model):
+        """Test embedding an empty list"""
+        assert onnx_model.embed_documents([]) == []
+
+
+class TestCreateEmbeddingModel:
+    """Tests for backend selection"""
+
+    @patch('app.ml.embeddings.settings')
+    def test_ollama_backend(self, mock_settings):
+        """Test the default Ollama backend"""
+        mock_settings.embedding_backend = "ollama"
+
+        assert isinstance(create_embedding_model(), EmbeddingModel)
+
+    @patch('app.ml.onnx_embeddings.OnnxEmbeddingModel.__init__', return_value=None)
+    @patch('app.ml.embeddings.settings')
+    def test_onnx_backend(self, mock_settings, mock_init):
+        """Test selecting the local ONNX backend"""
+        mock_settings.embedding_backend = "onnx"
+
+        assert isinstance(create_embedding_model(), OnnxEmbeddingModel)
+
+    @patch('app.ml.embeddings.settings')
+    def test_unknown_backend(self, mock_settings):
+        """Test an unknown backend name is rejected"""
+        mock_settings.embedding_backend = "unknown"
+
+        with pytest.raises(ValueError):
+            create_embedding_model()
@@ -0,0 +1,78 @@
+"""
+Tests for vector post-processing
+"""
+import numpy as np
+import pytest
+from qdrant_client.models import Datatype, Distance
+from app.ml.vector_postprocess import VectorPostprocessor, l2_normalize, to_matrix
+
+
+class TestVectorPostprocessor:
+    """Tests for VectorPostprocessor class"""
+
+    def test_process_normalizes_to_float32_matrix(self):
+        """Test embeddings become a normalized float32 matrix"""
+        processor = VectorPostprocessor(normalize=True, storage_dtype="float32")
+
+        matrix = processor.process([[3.0, 4.0], [1.0, 0.0]])
+
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (2, 2)
+        assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
+        assert np.allclose(matrix[0], [0.6, 0.8])
+
+    def test_process_without_normalization(self):
+        """Test vectors are left unscaled when normalization is off"""
+        processor = VectorPostprocessor(normalize=False)
+
+        matrix = processor.process([[3.0, 4.0]])
+
+        assert np.allclose(matrix[0], [3.0, 4.0])
+        assert processor.distance == Distance.COSINE
+
+    def test_float16_storage(self):
+        """Test float16 is a collection datatype; vectors are still sent as float32"""
+        processor = VectorPostprocessor(storage_dtype="float16")
+
+        matrix = processor.process([[0.1] * 768])
+
+        assert matrix.dtype == np.float32
+        assert processor.vector_params(768).datatype == Datatype.FLOAT16
+        assert processor.quantization_config() is None
+
+    def test_uint8_uses_scalar_quantization(self):
+        """Test uint8 storage configures int8 scalar quantization"""
+        processor = VectorPostprocessor(storage_dtype="uint8")
+
+        assert processor.quantization_config() is not None
+        assert processor.process([[0.1] * 4]).dtype == np.float32
+
+    def test_dot_distance_when_normalized(self):
+        """Test normalized vectors use dot-product distance"""
+        processor = VectorPostprocessor(normalize=True)
+
+        assert processor.vector_params(768).distance == Distance.DOT
+
+    def test_process_query(self):
+        """Test query vectors are normalized and returned as lists"""
+        processor = VectorPostprocessor(normalize=True)
+
+        query = processor.process_query([0.0, 2.0])
+
+        assert query == [0.0, 1.0]
+
+    def test_invalid_dtype(self):
+        """Test unknown storage dtypes are rejected"""
+        with pytest.raises(ValueError):
+            VectorPostprocessor(storage_dtype="int4")
+
+    def test_empty_batch(self):
+        """Test an empty batch passes through"""
+        assert VectorPostprocessor().process([]).size == 0
+
+
+def test_l2_normalize_handles_zero_vectors():
+    """Test zero vectors do not produce NaNs"""
+    matrix = l2_normalize(to_matrix([[0.0, 0.0], [1.0, 1.0]]))
+
+    assert not np.isnan(matrix).any()
@@ -0,0 +1,286 @@
+"""
+Tests for the snapshot file format and exact (brute-force) search
+"""
+import asyncio
+import os
+import threading
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointIdsList, SearchParams
+from app.models.schemas.search import SearchFilters
+from app.retrieval.exact_search import ExactSearchEngine
+from app.retrieval.qdrant_store import AsyncQdrantStore, QdrantStore
+from app.retrieval.snapshot import (
+    Snapshot, SnapshotFormatError, SnapshotWriter, export_collection, import_snapshot
+)
+
+DIM = 8
+
+
+def _populated_store(count=60):
+    store = QdrantStore(client=QdrantClient(location=":memory:"))
+    store.create_collection(Mock(dimension=DIM, normalized=True))
+
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        vectors = rng.normal(size=(1, DIM))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.upsert_chunks(
+            [{"text": f"chunk {i}", "chunk_type": "claim", "chunk_index": 0}],
+            vectors,
+            {
+                "patent_id": f"US{i:05d}",
+                "assignee": "Acme" if i % 3 else "Globex",
+                "jurisdiction": "US" if i % 2 else "EP",
+                "filing_year": 2000 + i % 20,
+                "patent_class": ["H01M", "B60L"] if i % 4 == 0 else ["G06N"],
+                "topic": "ml_healthcare" if i % 5 == 0 else "batteries",
+            }
+        )
+    return store
+
+
+@pytest.fixture
+def exported(tmp_path):
+    store = _populated_store()
+    path = str(tmp_path / "chunks.snap")
+    count = export_collection(store, path, batch_size=16)
+    return store, path, count
+
+
+class TestSnapshot:
+    """Tests for the snapshot writer/reader"""
+
+    def test_round_trip(self, exported):
+        """Test vectors, ids and payloads survive export"""
+        store, path, count = exported
+        snapshot = Snapshot(path)
+
+        assert count == snapshot.count == 60
+        assert snapshot.vectors.shape == (60, DIM)
+
+        points, _ = store.client.scroll(store.collection_name, limit=100, with_payload=True, with_vectors=True)
+        by_id = {str(p.id): p for p in points}
+
+        for row in range(snapshot.count):
+            point = by_id[snapshot.point_id(row)]
+            assert np.allclose(snapshot.vectors[row], point.vector, atol=1e-6)
+            # Absent fields read back as None
+            assert {k: v for k, v in snapshot.payload(row).items() if v is not None} == \
+                {k: v for k, v in point.payload.items() if v is not None}
+
+    def test_missing_and_unknown_fields(self, tmp_path):
+        """Test absent values read back as None and unknown keys are kept"""
+        path = str(tmp_path / "small.snap")
+        with SnapshotWriter(path, dim=2, distance="Dot") as writer:
+            writer.add(["a"], np.ones((1, 2)), [{"text": "x"}])
+            writer.add(["b"], np.ones((1, 2)), [{"extra": {"k": [1, 2]}, "filing_year": 2021}])
+
+        snapshot = Snapshot(path)
+
+        assert snapshot.payload(0)["filing_year"] is None
+        assert snapshot.payload(0)["extra"] is None
+        assert snapshot.payload(1)["extra"] == {"k": [1, 2]}
+        assert snapshot.payload(1)["filing_year"] == 2021
+        assert snapshot.payload(1)["patent_class"] is None
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a non-snapshot file is refused"""
+        path = tmp_path / "bogus.snap"
+        path.write_bytes(b"not a snapshot at all")
+
+        with pytest.raises(SnapshotFormatError):
+            Snapshot(str(path))
+
+    def test_import_restores_collection(self, exported):
+        """Test a parallel import reproduces points and search results"""
+        store, path, _ = exported
+        target = QdrantStore(client=QdrantClient(location=":memory:"))
+        progress = []
+
+        count = import_snapshot(target, path, batch_size=7, workers=3, progress=lambda done, total: progress.append(done))
+
+        assert count == 60
+        assert progress[-1] == 60
+        assert target.client.count(target.collection_name).count == 60
+
+        query = np.random.default_rng(2).normal(size=DIM).tolist()
+        filters = SearchFilters(topic="ml_healthcare")
+        expected = store.search(query, top_k=5, filters=filters)
+        actual = target.search(query, top_k=5, filters=filters)
+
+        assert [p.id for p in actual.points] == [p.id for p in expected.points]
+        assert actual.points[0].payload["patent_id"] == expected.points[0].payload["patent_id"]
+
+    def test_import_is_idempotent(self, exported):
+        """Test re-importing keeps point ids and does not duplicate"""
+        _, path, _ = exported
+        target = QdrantStore(client=QdrantClient(location=":memory:"))
+
+        import_snapshot(target, path, workers=2)
+        import_snapshot(target, path, workers=2)
+
+        assert target.client.count(target.collection_name).count == 60
+
+
+class TestExactSearchEngine:
+    """Tests for ExactSearchEngine"""
+
+    @pytest.mark.parametrize("filters", [
+        None,
+        SearchFilters(topic="ml_healthcare", filing_year_from=2005, filing_year_to=2015),
+        SearchFilters(patent_class=["B60L"], jurisdiction=["EP"]),
+        SearchFilters(assignee=["Globex", "Nobody"], filing_year_to=2010),
+    ])
+    def test_matches_qdrant_exact_search(self, exported, filters):
+        """Test results equal Qdrant's own exact search"""
+        store, path, _ = exported
+        engine = ExactSearchEngine.open(path, max_candidates=10)
+        query = np.random.default_rng(1).normal(size=DIM).tolist()
+
+        expected = store.search(query, top_k=5, filters=filters, search_params=SearchParams(exact=True))
+        actual = engine.search(query, top_k=5, filters=filters)
+
+        assert [p.id for p in actual.points] == [str(p.id) for p in expected.points]
+        assert np.allclose([p.score for p in actual.points], [p.score for p in expected.points], atol=1e-5)
+        assert actual.points[0].payload["patent_id"] == expected.points[0].payload["patent_id"]
+
+    def test_select_respects_max_candidates(self, exported):
+        """Test only small filtered subsets are selected for a scan"""
+        _, path, _ = exported
+        engine = ExactSearchEngine.open(path, max_candidates=15)
+
+        assert engine.select(None) is None
+        assert engine.select(SearchFilters(jurisdiction=["US"])) is None  # 30 rows
+        assert len(engine.select(SearchFilters(topic="ml_healthcare"))) == 12
+        assert len(engine.select(SearchFilters(topic="unknown"))) == 0
+
+    def test_estimate_bounds_matching_rows(self, exported):
+        """Test the estimate is the narrowest condition's row count"""
+        _, path, _ = exported
+        engine = ExactSearchEngine.open(path)
+
+        assert engine.estimate(SearchFilters(jurisdiction=["US"])) == 30
+        assert engine.estimate(SearchFilters(patent_class=["B60L"])) == 15
+        assert engine.estimate(SearchFilters(assignee=["Globex", "Nobody"])) == 20
+        assert engine.estimate(SearchFilters(filing_year_from=2005, filing_year_to=2015)) == 33
+        assert engine.estimate(SearchFilters(topic="ml_healthcare", filing_year_from=2005)) == 12
+
+    def test_broad_filter_skips_the_mask(self, exported):
+        """Test no O(rows) mask is built when the estimate is too large"""
+        _, path, _ = exported
+        engine = ExactSearchEngine.open(path, max_candidates=15)
+        engine.filter_mask = Mock(wraps=engine.filter_mask)
+
+        assert engine.select(SearchFilters(jurisdiction=["US"])) is None
+        engine.filter_mask.assert_not_called()
+
+        # Estimated under the threshold, but the conjunction is checked exactly
+        assert len(engine.select(SearchFilters(topic="ml_healthcare", jurisdiction=["EP"]))) == 6
+        engine.filter_mask.assert_called_once()
+
+
+class TestAutomaticSelection:
+    """Tests for QdrantStore routing small filters to the exact engine"""
+
+    def test_small_filter_uses_exact_engine(self):
+        """Test a selective filter skips Qdrant"""
+        engine = Mock()
+        client = Mock()
+        store = QdrantStore(client=client, exact_engine=engine)
+
+        result = store.search([0.1] * DIM, top_k=5, filters=SearchFilters(topic="ml_healthcare"))
+
+        assert result is engine.search_selective.return_value
+        client.query_points.assert_not_called()
+
+    def test_broad_filter_uses_qdrant(self):
+        """Test a filter matching many points still goes to Qdrant"""
+        engine = Mock()
+        engine.search_selective.return_value = None
+        client = Mock()
+        store = QdrantStore(client=client, exact_engine=engine)
+
+        store.search([0.1] * DIM, top_k=5, filters=SearchFilters(jurisdiction=["US"]))
+
+        client.query_points.assert_called_once()
+
+    def test_async_selection_runs_off_the_event_loop(self):
+        """Test the async store builds the filter mask in a worker thread"""
+        threads = []
+        engine = Mock()
+        engine.claim_check.return_value = False
+        engine.search_selective.side_effect = lambda *args: threads.append(threading.current_thread()) or "hits"
+        store = AsyncQdrantStore(reducer=False, exact_engine=engine)
+
+        result = asyncio.run(store.search([0.1] * DIM, top_k=5, filters=SearchFilters(topic="ml_healthcare")))
+
+        assert result == "hits"
+        assert threads and threads[0] is not threading.main_thread()
+
+
+class TestFreshness:
+    """Tests for falling back to Qdrant when the snapshot is out of date"""
+
+    def _engine(self, path, check_interval=0):
+        return ExactSearchEngine(Snapshot(path), max_candidates=100, check_interval=check_interval)
+
+    def test_checks_are_rate_limited(self, exported):
+        """Test only one caller per interval re-reads the point count"""
+        _, path, _ = exported
+        engine = self._engine(path, check_interval=60)
+
+        assert engine.claim_check()
+        assert not engine.claim_check()
+
+    def test_unchecked_snapshot_is_not_used(self, exported):
+        """Test searches go to Qdrant until the first count check"""
+        _, path, _ = exported
+
+        assert not self._engine(path).fresh
+
+    def test_count_mismatch_falls_back_to_qdrant(self, exported):
+        """Test points deleted by another process do not come back from the snapshot"""
+        store, path, _ = exported
+        engine = self._engine(path)
+        searcher = QdrantStore(client=store.client, exact_engine=engine)
+        filters = SearchFilters(topic="ml_healthcare")
+        query = [0.1] * DIM
+
+        first = searcher.search(query, top_k=3, filters=filters)
+        assert engine.fresh
+
+        deleted = first.points[0].id
+        store.client.delete(store.collection_name, points_selector=PointIdsList(points=[deleted]))
+
+        second = searcher.search(query, top_k=3, filters=filters)
+        assert not engine.fresh
+        assert str(deleted) not in [str(p.id) for p in second.points]
+
+    def test_write_invalidates_until_reexport(self, exported):
+        """Test an upsert stops exact search until the file is re-exported"""
+        store, path, _ = exported
+        engine = self._engine(path)
+        store.exact_engine = engine
+        filters = SearchFilters(topic="ml_healthcare")
+
+        store.search([0.1] * DIM, top_k=3, filters=filters)
+        assert engine.fresh
+
+        store.upsert_chunks(
+            [{"text": "new", "chunk_type": "claim", "chunk_index": 0}],
+            np.ones((1, DIM)) / np.sqrt(DIM),
+            {"patent_id": "US99999", "topic": "ml_healthcare"}
+        )
+        assert not engine.fresh
+
+        export_collection(store, path, batch_size=16)
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+
+        result = store.search([0.1] * DIM, top_k=3, filters=filters)
+        assert engine.fresh
+        assert engine.point_count == 61
+        assert result.points[0].payload["patent_id"] == "US99999"
@@ -0,0 +1,165 @@
+"""
+Tests for topic partitioning (tenant and shard-key modes)
+"""
+import asyncio
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from qdrant_client import QdrantClient
+from qdrant_client.models import ShardingMethod
+from app.models.schemas.search import SearchFilters
+from app.retrieval.partitioning import TopicPartitioning
+from app.retrieval.qdrant_store import AsyncQdrantStore, QdrantStore
+
+
+def _cluster_info(*topics):
+    return Mock(local_shards=[Mock(shard_key=t) for t in topics], remote_shards=[])
+
+
+class TestTopicPartitioning:
+    """Tests for TopicPartitioning"""
+
+    def test_modes(self):
+        """Test each mode's collection layout and routing"""
+        none, tenant, sharded = (TopicPartitioning(m) for m in ("none", "tenant", "shard_key"))
+        filters = SearchFilters(topic="ml_healthcare")
+
+        assert none.hnsw_config() is None and none.sharding_method() is None
+        assert tenant.hnsw_config().m == 0 and tenant.hnsw_config().payload_m > 0
+        assert sharded.sharding_method() == ShardingMethod.CUSTOM
+
+        assert none.search_kwargs(filters) == {}
+        assert tenant.search_kwargs(filters) == {}
+        assert sharded.search_kwargs(filters) == {"shard_key_selector": "ml_healthcare"}
+        assert sharded.search_kwargs(SearchFilters(jurisdiction=["US"])) == {}
+
+    def test_default_topic(self):
+        """Test points without a topic get the default only when partitioned"""
+        assert TopicPartitioning("none").topic_for({}) is None
+        assert TopicPartitioning("tenant", default_topic="misc").topic_for({}) == "misc"
+        assert TopicPartitioning("tenant").topic_for({"topic": "batteries"}) == "batteries"
+
+    def test_rejects_unknown_mode(self):
+        """Test a typo in TOPIC_PARTITIONING fails loudly"""
+        with pytest.raises(ValueError):
+            TopicPartitioning("tenants")
+
+
+class TestShardKeyRouting:
+    """Tests for QdrantStore in shard_key mode"""
+
+    def _store(self, *existing_topics):
+        client = Mock()
+        client.collection_cluster_info.return_value = _cluster_info(*existing_topics)
+        client.query_points.return_value = Mock(points=[])
+        return QdrantStore(client=client, reducer=False, partitioning=TopicPartitioning("shard_key")), client
+
+    def test_upsert_routes_by_topic(self, sample_chunks, sample_embeddings):
+        """Test each topic's points go to its shard, creating missing keys"""
+        store, client = self._store("batteries")
+
+        store.upsert_chunks(sample_chunks, sample_embeddings, {"topic": "batteries"})
+        store.upsert_chunks(sample_chunks[:1], sample_embeddings[:1], {})
+
+        selectors = [c[1]["shard_key_selector"] for c in client.upsert.call_args_list]
+        assert selectors == ["batteries", "unassigned"]
+        client.create_shard_key.assert_called_once_with(store.collection_name, shard_key="unassigned")
+        assert client.upsert.call_args_list[1][1]["points"][0].payload["topic"] == "unassigned"
+
+    def test_search_targets_topic_shard(self):
+        """Test a topic-scoped search only queries that shard"""
+        store, client = self._store("ml_healthcare")
+
+        store.search([0.1] * 8, top_k=5, filters=SearchFilters(topic="ml_healthcare"))
+        store.search([0.1] * 8, top_k=5, filters=None)
+
+        assert client.query_points.call_args_list[0][1]["shard_key_selector"] == "ml_healthcare"
+        assert "shard_key_selector" not in client.query_points.call_args_list[1][1]
+
+    def test_unknown_topic_returns_nothing(self):
+        """Test a topic without a shard returns no hits instead of an error"""
+        store, client = self._store("batteries")
+
+        result = store.search([0.1] * 8, top_k=5, filters=SearchFilters(topic="unknown"))
+
+        assert result.points == []
+        client.query_points.assert_not_called()
+
+    def test_topic_ingested_elsewhere_is_found(self):
+        """Test a cache miss re-reads the shard keys, at most once per interval"""
+        store, client = self._store("batteries")
+        store.shard_keys()
+        client.collection_cluster_info.return_value = _cluster_info("batteries", "ml_healthcare")
+        filters = SearchFilters(topic="ml_healthcare")
+
+        # Within the interval the cached keys answer
+        assert store.search([0.1] * 8, top_k=5, filters=filters).points == []
+        client.query_points.assert_not_called()
+
+        with patch('app.retrieval.qdrant_store.SHARD_KEY_REFRESH_S', 0):
+            store.search([0.1] * 8, top_k=5, filters=filters)
+
+        assert client.query_points.call_args[1]["shard_key_selector"] == "ml_healthcare"
+        assert client.collection_cluster_info.call_count == 2
+
+    def test_rejects_unsharded_collection(self):
+        """Test an existing collection without custom sharding fails validation"""
+        from app.core.exceptions import CollectionConfigError
+
+        store, client = self._store()
+        client.get_collection.return_value = Mock(config=Mock(params=Mock(sharding_method=None)))
+
+        with pytest.raises(CollectionConfigError, match="shard-key"):
+            store.validate_partitioning(client.get_collection.return_value)
+
+    @patch('app.retrieval.qdrant_store.AsyncQdrantClient')
+    def test_async_search_targets_topic_shard(self, mock_async_client):
+        """Test the async store routes topic searches the same way"""
+        client = Mock()
+        client.collection_cluster_info = AsyncMock(return_value=_cluster_info("ml_healthcare"))
+        client.query_points = AsyncMock(return_value=Mock(points=[]))
+        mock_async_client.return_value = client
+
+        store = AsyncQdrantStore(reducer=False, partitioning=TopicPartitioning("shard_key"))
+        asyncio.run(store.search([0.1] * 8, top_k=5, filters=SearchFilters(topic="ml_healthcare")))
+
+        assert client.query_points.call_args[1]["shard_key_selector"] == "ml_healthcare"
+
+    @patch('app.retrieval.qdrant_store.SHARD_KEY_REFRESH_S', 0)
+    @patch('app.retrieval.qdrant_store.AsyncQdrantClient')
+    def test_async_topic_ingested_later_is_found(self, mock_async_client):
+        """Test the async store refreshes its shard keys on a miss too"""
+        client = Mock()
+        client.collection_cluster_info = AsyncMock(side_effect=[
+            _cluster_info("batteries"),
+            _cluster_info("batteries", "ml_healthcare"),
+        ])
+        client.query_points = AsyncMock(return_value=Mock(points=[]))
+        mock_async_client.return_value = client
+
+        store = AsyncQdrantStore(reducer=False, partitioning=TopicPartitioning("shard_key"))
+        asyncio.run(store.search([0.1] * 8, top_k=5, filters=SearchFilters(topic="ml_healthcare")))
+
+        assert client.query_points.call_args[1]["shard_key_selector"] == "ml_healthcare"
+
+
+class TestTenantMode:
+    """Tests for the payload-partitioned (tenant) layout"""
+
+    def test_tenant_collection_round_trip(self, sample_chunks):
+        """Test a tenant collection disables the global graph and tags every point"""
+        client = Mock(wraps=QdrantClient(location=":memory:"))
+        store = QdrantStore(client=client, reducer=False, partitioning=TopicPartitioning("tenant"))
+        store.create_collection(Mock(dimension=8, normalized=True))
+
+        assert client.recreate_collection.call_args[1]["hnsw_config"].m == 0
+
+        vectors = np.eye(3, 8)
+        store.upsert_chunks(sample_chunks, vectors, {"topic": "batteries"})
+        store.upsert_chunks(sample_chunks, vectors, {})
+
+        hits = store.search(vectors[0].tolist(), top_k=10, filters=SearchFilters(topic="batteries"))
+
+        assert len(hits.points) == 1
+        assert hits.points[0].payload["topic"] == "batteries"
+        assert client.count(store.collection_name).count == 6
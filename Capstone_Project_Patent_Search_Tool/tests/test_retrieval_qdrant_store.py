@@ -2,9 +2,10 @@
 Tests for QdrantStore
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from uuid import uuid4
-from app.retrieval.qdrant_store import QdrantStore
+from app.retrieval.qdrant_store import AsyncQdrantStore, QdrantStore
 
 
 class TestQdrantStore:
@@ -42,7 +43,7 @@ class TestQdrantStore:
         # Should call recreate_collection
         mock_client_instance.recreate_collection.assert_called_once()
         # Should create payload indexes
-        assert mock_client_instance.create_payload_index.call_count == 6
+        assert mock_client_instance.create_payload_index.call_count == 7
     
     @patch('app.retrieval.qdrant_store.QdrantClient')
     @patch('app.retrieval.qdrant_store.settings')
@@ -64,6 +65,59 @@ class TestQdrantStore:
         
         # Should not call recreate_collection
         mock_client_instance.recreate_collection.assert_not_called()
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_create_collection_exists_only_warns_about_indexes(self, mock_settings, mock_qdrant_client, caplog):
+        """Test outdated indexes are reported at startup, not rebuilt"""
+        from qdrant_client.models import PayloadIndexInfo, PayloadSchemaType
+
+        mock_client_instance = Mock()
+        existing_collection = Mock()
+        existing_collection.name = "patent_chunks"
+        mock_client_instance.get_collections.return_value = Mock(collections=[existing_collection])
+        mock_client_instance.get_collection.return_value = Mock(payload_schema={
+            "filing_year": PayloadIndexInfo(data_type=PayloadSchemaType.INTEGER, points=0)
+        })
+        mock_qdrant_client.return_value = mock_client_instance
+
+        store = QdrantStore()
+        with caplog.at_level("WARNING"):
+            store.create_collection()
+
+        mock_client_instance.delete_payload_index.assert_not_called()
+        mock_client_instance.create_payload_index.assert_not_called()
+        assert "filing_year" in caplog.text
+        assert "scripts.migrate_indexes" in caplog.text
+
+    @patch('app.retrieval.qdrant_store.QdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_migrate_payload_indexes(self, mock_settings, mock_qdrant_client):
+        """Test outdated and missing indexes are rebuilt, current ones kept"""
+        from qdrant_client.models import PayloadIndexInfo, PayloadSchemaType
+        from app.retrieval.qdrant_store import PAYLOAD_INDEXES
+
+        current = {
+            field: PayloadIndexInfo(data_type=schema.type.value, params=schema, points=0)
+            for field, schema in PAYLOAD_INDEXES.items()
+            if field not in ("filing_year", "patent_id")
+        }
+        # Plain INTEGER index from before range/principal params
+        current["filing_year"] = PayloadIndexInfo(data_type=PayloadSchemaType.INTEGER, points=0)
+
+        mock_client_instance = Mock()
+        mock_client_instance.get_collection.return_value = Mock(payload_schema=current)
+        mock_qdrant_client.return_value = mock_client_instance
+
+        store = QdrantStore()
+        changed = store.migrate_payload_indexes()
+
+        assert changed == ["filing_year", "patent_id"]
+        mock_client_instance.delete_payload_index.assert_called_once_with(
+            "patent_chunks", "filing_year", wait=True
+        )
+        rebuilt = mock_client_instance.create_payload_index.call_args_list[0][1]["field_schema"]
+        assert rebuilt.range is True and rebuilt.lookup is False
     
     @patch('app.retrieval.qdrant_store.QdrantClient')
     @patch('app.retrieval.qdrant_store.settings')
@@ -130,11 +184,11 @@ class TestQdrantStore:
         
         # Verify point structure
         for point in points:
-            assert "id" in point
-            assert "vector" in point
-            assert "payload" in point
-            assert "text" in point["payload"]
-            assert "chunk_type" in point["payload"]
+            assert point.id
+            assert point.vector is not None
+            assert point.payload is not None
+            assert "text" in point.payload
+            assert "chunk_type" in point.payload
     
     @patch('app.retrieval.qdrant_store.QdrantClient')
     @patch('app.retrieval.qdrant_store.settings')
@@ -194,3 +248,27 @@ class TestQdrantStore:
         # Verify filter was created
         call_args = mock_client_instance.query_points.call_args
         assert call_args[1]["query_filter"] is not None
+
+
+class TestAsyncQdrantStore:
+    """Tests for AsyncQdrantStore class"""
+
+    @patch('app.retrieval.qdrant_store.AsyncQdrantClient')
+    @patch('app.retrieval.qdrant_store.settings')
+    def test_search_awaits_query_points(self, mock_settings, mock_async_client):
+        """Test the async store builds the same query as the sync one"""
+        from app.models.schemas.search import SearchFilters
+
+        mock_client_instance = Mock()
+        mock_client_instance.query_points = AsyncMock(return_value=Mock(points=[]))
+        mock_async_client.return_value = mock_client_instance
+
+        store = AsyncQdrantStore(reducer=False)
+        filters = SearchFilters(jurisdiction=["US"])
+
+        result = asyncio.run(store.search([0.1] * 768, top_k=5, filters=filters))
+
+        assert result.points == []
+        call_args = mock_client_instance.query_points.call_args
+        assert call_args[1]["limit"] == 5
+        assert call_args[1]["query_filter"] is not None
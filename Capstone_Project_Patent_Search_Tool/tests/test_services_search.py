@@ -1,8 +1,9 @@
 """
 Tests for SearchService
 """
+import asyncio
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import AsyncMock, Mock, MagicMock
 from app.services.search_service import SearchService
 from app.models.schemas.search import SearchRequest, SearchFilters
 from app.core.exceptions import SearchError
@@ -177,3 +178,47 @@ class TestSearchService:
         explanation = service._build_explanation(mock_hit)
         
         assert "description" in explanation.lower()
+    
+    def test_search_applies_postprocessor(self):
+        """Test the query vector goes through the post-processor"""
+        mock_vector_store = Mock()
+        mock_embedder = Mock()
+        mock_postprocessor = Mock()
+        
+        mock_embedder.embed_query.return_value = [3.0, 4.0]
+        mock_postprocessor.process_query.return_value = [0.6, 0.8]
+        mock_vector_store.search.return_value = Mock(points=[])
+        
+        service = SearchService(mock_vector_store, mock_embedder, mock_postprocessor)
+        service.search(SearchRequest(query="battery"))
+        
+        mock_postprocessor.process_query.assert_called_once_with([3.0, 4.0])
+        assert mock_vector_store.search.call_args[1]["query_vector"] == [0.6, 0.8]
+
+    def test_asearch(self):
+        """Test the async path awaits the embedder and vector store"""
+        mock_vector_store = Mock()
+        mock_embedder = Mock()
+
+        mock_point = Mock()
+        mock_point.score = 0.9
+        mock_point.payload = {"patent_id": "US12345678", "text": "Sample text"}
+
+        mock_embedder.aembed_query = AsyncMock(return_value=[0.1] * 768)
+        mock_vector_store.search = AsyncMock(return_value=Mock(points=[mock_point]))
+
+        service = SearchService(mock_vector_store, mock_embedder)
+        results = asyncio.run(service.asearch(SearchRequest(query="battery")))
+
+        mock_embedder.aembed_query.assert_awaited_once_with("battery")
+        assert results[0]["patent_id"] == "US12345678"
+
+    def test_asearch_error(self):
+        """Test async search failures raise SearchError"""
+        mock_embedder = Mock()
+        mock_embedder.aembed_query = AsyncMock(side_effect=Exception("Ollama down"))
+
+        service = SearchService(Mock(), mock_embedder)
+
+        with pytest.raises(SearchError, match="Ollama down"):
+            asyncio.run(service.asearch(SearchRequest(query="battery")))
@@ -0,0 +1,209 @@
+"""
+Benchmark harness shared by the projects in this repository: result
+files, baseline comparison and the time/memory measurements behind the
+text-processing micro-benchmarks.
+
+Each project's `benchmarks` package puts the repository root on
+sys.path, so this module is imported as `benchmark_harness`.
+
+Results are JSON: {"meta": {...}, "scenarios": {name: {metric: value}}}.
+Whether a metric should go up or down is read from its name.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+HIGHER_IS_BETTER = ("_per_s", "qps")
+LOWER_IS_BETTER = ("_ms", "ns_per_char", "_bytes", "_allocations")
+
+# Wall time of string-heavy code swings by ~50% between runs, so only a
+# 2x slowdown fails; memory is close to deterministic
+TIME_TOLERANCE = 1.0
+MEMORY_TOLERANCE = 0.10
+
+# Changes smaller than this are noise (regex caches, interned strings)
+MIN_DELTA = {"peak_bytes": 64 * 1024, "retained_allocations": 64}
+
+MIN_MEASURE_S = 0.2
+MAX_REPEAT = 1000
+
+
+# ---------- Results ----------
+
+def build_results(scenarios: Dict[str, dict], config: dict = None) -> dict:
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": config or {}
+        },
+        "scenarios": scenarios
+    }
+
+
+def write_results(results: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _direction(metric: str) -> int:
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    tolerance: float = 0.15,
+    tolerance_for=None,
+    min_delta: Dict[str, float] = None
+) -> List[str]:
+    """
+    Returns one message per metric that is worse than the baseline by
+    more than `tolerance` (a fraction), or `tolerance_for(metric)` when
+    given. Absolute changes below `min_delta[metric]` are treated as
+    noise. Metrics missing on either side or without a known direction
+    are ignored.
+    """
+    min_delta = min_delta or {}
+    regressions = []
+
+    for scenario, metrics in results.get("scenarios", {}).items():
+        base_metrics = baseline.get("scenarios", {}).get(scenario, {})
+
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            direction = _direction(metric)
+            if not direction or not isinstance(value, (int, float)) or not base:
+                continue
+
+            allowed = tolerance_for(metric) if tolerance_for else tolerance
+            change = (value - base) / base
+            if change * direction < -allowed and abs(value - base) > min_delta.get(metric, 0):
+                regressions.append(
+                    f"{scenario}.{metric}: {value:g} vs baseline {base:g} "
+                    f"({change:+.1%}, tolerance {allowed:.0%})"
+                )
+
+    return regressions
+
+
+# ---------- Micro-benchmarks ----------
+
+def time_call(fn: Callable[[], object]) -> float:
+    """
+    Best per-call time in seconds. Repeats until MIN_MEASURE_S has
+    elapsed so small inputs are not dominated by timer resolution.
+    """
+    best = float("inf")
+    spent = 0.0
+    repeat = 0
+
+    gc.disable()
+    try:
+        while (spent < MIN_MEASURE_S or repeat < 3) and repeat < MAX_REPEAT:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            spent += elapsed
+            repeat += 1
+    finally:
+        gc.enable()
+
+    return best
+
+
+def memory_call(fn: Callable[[], object]) -> Dict[str, int]:
+    """
+    tracemalloc peak while `fn` runs, and the memory blocks still held
+    by its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    retained = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "lineno")
+        if stat.count_diff > 0
+    )
+    del result
+
+    return {"peak_bytes": peak, "retained_allocations": retained}
+
+
+def measure(fn: Callable[[], object], chars: int) -> Dict[str, float]:
+    seconds = time_call(fn)
+    return {
+        "ns_per_char": round(seconds * 1e9 / chars, 3),
+        **memory_call(fn)
+    }
+
+
+def tolerance_for(metric: str) -> float:
+    return TIME_TOLERANCE if metric == "ns_per_char" else MEMORY_TOLERANCE
+
+
+def micro_main(description: str, run, sizes, default_baseline: str, argv=None):
+    """
+    Command line for a micro-benchmark module: `run(sizes, seed)` returns
+    the scenarios, which are printed and checked against (or written to)
+    the baseline. Exits with status 1 on a regression.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sizes", default=",".join(sizes), help=f"comma-separated subset of {','.join(sizes)}")
+    parser.add_argument("--baseline", default=default_baseline)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write results JSON here")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = build_results(
+        run(args.sizes.split(","), seed=args.seed),
+        config={"sizes": args.sizes, "seed": args.seed}
+    )
+    print(json.dumps(results["scenarios"], indent=2))
+
+    if args.output:
+        write_results(results, args.output)
+
+    if args.update_baseline:
+        write_results(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        regressions = compare(
+            results,
+            load_results(args.baseline),
+            tolerance_for=tolerance_for,
+            min_delta=MIN_DELTA
+        )
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)